@@ -0,0 +1,164 @@
+# File: api/articles.py
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+
+# Where each Article field is found in a raw provider article; the first
+# non-empty path wins. Providers override single fields in their spec.
+DEFAULT_ARTICLE_FIELDS = {
+    "url": ("url", "link"),
+    "title": ("title",),
+    "source": ("source.name", "source", "source_id"),
+    "published_at": ("publishedAt", "published_at", "pubDate", "published"),
+    "snippet": ("description", "snippet"),
+}
+
+SNIPPET_LENGTH = 300
+
+# Title near-duplicates: character shingle size, MinHash length and the
+# estimated Jaccard similarity above which two titles are the same story
+SHINGLE_SIZE = 5
+MINHASH_PERMUTATIONS = 64
+TITLE_SIMILARITY = 0.6
+
+# Multiply-shift hash family: h(x) = (a * x + b mod 2**64) >> 32 with odd a
+_rng = np.random.RandomState(42)
+_HASH_A = _rng.randint(0, 1 << 63, size=MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_HASH_B = _rng.randint(0, 1 << 63, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|ref|ref_src|cmpid|ocid|mc_\w+)$")
+# " - Reuters" / " | BBC News" suffixes added by aggregators
+_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,40}$")
+_NON_WORD = re.compile(r"[^\w]+")
+
+class Article:
+    """Compact, provider-independent news article"""
+
+    __slots__ = ("url", "title", "source", "published_at", "snippet", "provider")
+
+    def __init__(self, url="", title="", source="", published_at="", snippet="", provider=""):
+        self.url = url
+        self.title = title
+        self.source = source
+        self.published_at = published_at
+        self.snippet = snippet
+        self.provider = provider
+
+    def to_list(self):
+        """Fields in slot order (used to store articles as JSON)"""
+        return [getattr(self, field) for field in self.__slots__]
+
+    @classmethod
+    def from_list(cls, values):
+        return cls(*values)
+
+    def __eq__(self, other):
+        return isinstance(other, Article) and self.to_list() == other.to_list()
+
+    def __repr__(self):
+        return f"Article({self.provider}: {self.title[:60]!r})"
+
+def _lookup(raw, path):
+    value = raw
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def to_article(raw, provider="", fields=None):
+    """Normalise one raw provider article (dicts are mapped, Articles pass through)"""
+    if isinstance(raw, Article):
+        return raw
+    fields = {**DEFAULT_ARTICLE_FIELDS, **(fields or {})}
+    values = {}
+    for field, paths in fields.items():
+        if isinstance(paths, str):
+            paths = (paths,)
+        value = next((v for v in (_lookup(raw, path) for path in paths) if v and isinstance(v, str)), "")
+        values[field] = value.strip()
+    values["snippet"] = values["snippet"][:SNIPPET_LENGTH]
+    return Article(provider=provider, **values)
+
+def to_articles(items, provider="", fields=None):
+    """Normalise a provider's result list"""
+    return [to_article(item, provider, fields) for item in items]
+
+def canonical_url(url):
+    """URL with scheme, "www.", fragment, tracking parameters and trailing slash removed"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k.lower())))
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+def title_shingles(title):
+    """Character shingles of a title with any " - Source" suffix dropped"""
+    title = _SOURCE_SUFFIX.sub("", title)
+    text = _NON_WORD.sub(" ", title.lower()).strip()
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def minhash_signatures(shingle_sets):
+    """(n, MINHASH_PERMUTATIONS) MinHash signatures of non-empty shingle sets"""
+    lengths = [len(shingles) for shingles in shingle_sets]
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for shingles in shingle_sets for s in shingles),
+                         dtype=np.uint64, count=sum(lengths))
+    # One universal hash per permutation for every shingle of every title at once
+    permuted = np.multiply(hashes[:, None], _HASH_A[None, :])
+    permuted += _HASH_B
+    permuted >>= _SHIFT
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.minimum.reduceat(permuted, starts, axis=0)
+
+def group_stories(articles):
+    """Group articles reporting the same story; returns a list of article lists, first-seen order.
+
+    Two articles are the same story when their canonical URLs match or their
+    titles' MinHash signatures estimate a Jaccard similarity of at least
+    TITLE_SIMILARITY.
+    """
+    n = len(articles)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        i, j = find(i), find(j)
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+
+    first_by_url = {}
+    for i, article in enumerate(articles):
+        url = canonical_url(article.url)
+        if url:
+            union(i, first_by_url.setdefault(url, i))
+
+    shingle_sets = [title_shingles(article.title) for article in articles]
+    with_title = [i for i, shingles in enumerate(shingle_sets) if shingles]
+    if len(with_title) > 1:
+        signatures = minhash_signatures([shingle_sets[i] for i in with_title])
+        similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+        for a, b in zip(*np.nonzero(np.triu(similarity >= TITLE_SIMILARITY, k=1))):
+            union(with_title[a], with_title[b])
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(articles[i])
+    return list(groups.values())
+
+def count_stories(articles):
+    """Number of distinct stories among a list of articles"""
+    return len(group_stories(articles)) if len(articles) > 1 else len(articles)
@@ -0,0 +1,139 @@
+# File: api/batch.py
+"""Score large dumps of articles offline.
+
+    python -m api.batch articles.jsonl -o scored.jsonl
+    python -m api.batch articles.csv --text-field body --id-field guid > scored.jsonl
+
+Input is read and scored in batches, and results are streamed out as JSONL
+in input order, so memory stays flat no matter how big the input is. With
+--workers the batches are scored in parallel worker processes (api/workers.py).
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+from api.model_utils import get_pipeline, real_probability
+from api.patterns import run_pattern_checks, suspicious_count
+from api.workers import WORKER_PROCESSES, worker_pool
+
+DEFAULT_BATCH_SIZE = 2000
+
+def read_records(stream, fmt="jsonl"):
+    """Yield input records (dicts) one at a time from a JSONL or CSV stream"""
+    if fmt == "csv":
+        # News bodies can easily exceed the default 128 KB csv field limit
+        csv.field_size_limit(2 ** 31 - 1)
+        yield from csv.DictReader(stream)
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Skipping line {line_number}: invalid JSON ({e})", file=sys.stderr)
+            continue
+        if not isinstance(record, dict):
+            print(f"Skipping line {line_number}: expected a JSON object, got {type(record).__name__}", file=sys.stderr)
+            continue
+        yield record
+
+def score_texts(texts):
+    """Score a batch of texts with one sparse vectorize + predict call"""
+    p_real = real_probability(texts)
+    results = []
+    for text, probability in zip(texts, p_real):
+        checks = run_pattern_checks(text)
+        results.append({
+            "label": "REAL" if probability >= 0.5 else "FAKE",
+            "p_real": round(float(probability), 6),
+            "pattern_checks": checks,
+            "suspicious_patterns": suspicious_count(checks),
+        })
+    return results
+
+def classify_records(records, text_field="text", id_field="id", batch_size=DEFAULT_BATCH_SIZE, pool=None):
+    """Yield one scored result per input record, in input order.
+
+    Records are pulled from `records` lazily, `batch_size` at a time, so the
+    input can be an unbounded iterator. With a WorkerPool each batch is scored
+    in a worker process.
+    """
+    records = iter(records)
+    row = 0
+    if pool is not None:
+        # Records whose batch is out at a worker, matched back up as results return in order
+        pending = deque()
+
+        def texts():
+            for record in records:
+                pending.append(record)
+                yield str(record.get(text_field) or "")
+
+        for result in pool.map_chunks(score_texts, texts(), batch_size):
+            record = pending.popleft()
+            row += 1
+            yield {"id": record.get(id_field, row), **result}
+        return
+
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        texts = [str(record.get(text_field) or "") for record in batch]
+        for record, result in zip(batch, score_texts(texts)):
+            row += 1
+            yield {"id": record.get(id_field, row), **result}
+
+def classify_file(input_stream, output_stream, fmt="jsonl", text_field="text", id_field="id", batch_size=DEFAULT_BATCH_SIZE,
+                  pool=None):
+    """Score every record in `input_stream` and write JSONL to `output_stream`; returns the record count"""
+    count = 0
+    for result in classify_records(read_records(input_stream, fmt), text_field, id_field, batch_size, pool):
+        output_stream.write(json.dumps(result) + "\n")
+        count += 1
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a JSONL/CSV dump of news articles with the fake news model")
+    parser.add_argument("input", help="input file (.jsonl or .csv), or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="input format (default: from the file extension)")
+    parser.add_argument("--text-field", default="text", help="field holding the article text (default: text)")
+    parser.add_argument("--id-field", default="id", help="field copied to the output as the record id (default: id)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="articles vectorized per batch")
+    parser.add_argument("--workers", type=int, default=WORKER_PROCESSES,
+                        help="worker processes scoring batches in parallel (-1 = one per CPU core, default: in-process)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+
+    get_pipeline()
+    pool = worker_pool(args.workers)
+
+    input_stream = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", newline="")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        start = time.perf_counter()
+        count = classify_file(input_stream, output_stream, fmt, args.text_field, args.id_field, args.batch_size, pool)
+        elapsed = time.perf_counter() - start
+    finally:
+        if pool is not None:
+            pool.close()
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Scored {count} articles in {elapsed:.2f}s ({rate:.0f} articles/s)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,449 @@
+# File: api/benchmark.py
+"""Offline benchmark of the verification pipeline against recorded provider responses.
+
+    python -m api.benchmark                                   # bundled fixtures, report to stdout
+    python -m api.benchmark --concurrency 1,8,32 --repeat 3 -o report.json
+    python -m api.benchmark --backend async --latency currents=lognormal:3:0.5 --rate-limit-rate 0.05
+    python -m api.benchmark --baseline old_report.json        # exit 1 on a regression
+    python -m api.benchmark --record benchmarks/provider_fixtures.json   # capture live responses
+
+Provider responses are replayed by a local stub server running in its own
+process, with per-provider latency, error (HTTP 500) and 429 rates. Every
+run points the provider specs at the stub and uses a fresh memory-only cache,
+no local quota, no claim reuse and reset circuit breakers, so nothing
+touches the real APIs or the app's cache, quota and claim index files.
+
+For each concurrency level the report holds end-to-end and per-stage
+latency percentiles, per-provider latency, throughput, verdicts, provider
+outcome counters (api/metrics.py) and memory use.
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from api.breaker import reset_breakers
+from api.cache import ProviderCache, use_cache
+from api.claim_index import use_index
+from api.http_client import close_async_client
+from api.metrics import metrics_snapshot, reset_metrics
+from api.model_utils import get_pipeline
+from api.providers import PROVIDER_SPECS, raw_search
+from api.quota import use_governor
+from api.verifier import DEFAULT_BUDGET, verify_claim, verify_claim_async
+
+DEFAULT_FIXTURES = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks", "provider_fixtures.json"))
+
+# Latency profile of each provider's stub: "fixed:<s>", "uniform:<low>:<high>" or
+# "lognormal:<median>:<sigma>", roughly matching what the live free tiers answer in
+DEFAULT_LATENCY = {
+    'newsapi': "lognormal:0.35:0.4",
+    'gnews': "lognormal:0.3:0.4",
+    'factcheck': "lognormal:0.25:0.3",
+    'mediastack': "lognormal:0.6:0.5",
+    'newsdata': "lognormal:0.5:0.5",
+    'currents': "lognormal:1.5:0.6",
+    'rapidapi': "lognormal:0.8:0.7",
+}
+
+STAGES = ("total", "patterns", "model", "providers", "scoring")
+PERCENTILES = (50, 90, 99)
+
+# Throughput drop or p50/p90 latency rise, as a fraction, reported as a regression
+DEFAULT_TOLERANCE = 0.2
+
+_WORD = re.compile(r"\w+")
+
+def load_fixtures(path=DEFAULT_FIXTURES):
+    """{"synthetic": bool, "claims": [...], "providers": {name: [{"query", "status", "body"}, ...]}}"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def parse_latency(spec):
+    """"lognormal:0.3:0.5" -> ("lognormal", 0.3, 0.5)"""
+    kind, *args = spec.split(":")
+    args = tuple(float(arg) for arg in args)
+    expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+    if kind not in expected or len(args) != expected[kind]:
+        raise ValueError(f"Bad latency {spec!r} (use fixed:<s>, uniform:<low>:<high> or lognormal:<median>:<sigma>)")
+    return (kind,) + args
+
+def sample_latency(latency, rng):
+    kind = latency[0]
+    if kind == "fixed":
+        return latency[1]
+    if kind == "uniform":
+        return rng.uniform(latency[1], latency[2])
+    return latency[1] * math.exp(rng.gauss(0, latency[2]))
+
+def _words(text):
+    return set(_WORD.findall(text.lower()))
+
+def pick_response(responses, query):
+    """The recorded response whose query shares the most words with `query`, or None if none does"""
+    words = _words(query)
+    best, best_overlap = None, 0
+    for entry in responses:
+        overlap = len(words & _words(entry["query"]))
+        if overlap > best_overlap:
+            best, best_overlap = entry, overlap
+    return best
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers GET /<provider>?<query params> from the fixtures in `server.profile`"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        provider = parts.path.strip("/")
+        profile = self.server.profile.get(provider)
+        if profile is None:
+            self._send(404, {"error": f"no fixtures for {provider}"})
+            return
+
+        rng = random.Random(zlib.crc32(self.path.encode("utf-8")) ^ self.server.seed ^ next(self.server.counter))
+        time.sleep(sample_latency(profile["latency"], rng))
+        roll = rng.random()
+        if roll < profile["rate_limit_rate"]:
+            self._send(429, {"message": "rate limited (stub)"})
+            return
+        if roll < profile["rate_limit_rate"] + profile["error_rate"]:
+            self._send(500, {"message": "internal error (stub)"})
+            return
+
+        query = dict(parse_qsl(parts.query)).get(profile["query_param"], "")
+        entry = pick_response(profile["responses"], query)
+        if entry is None:
+            self._send(200, {profile["response_items"]: []})
+        else:
+            self._send(entry.get("status", 200), entry.get("body") or {})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client cancelled a losing query variant
+
+    def log_message(self, format, *args):
+        pass
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many concurrent verifications open hundreds of connections at once
+    request_queue_size = 1024
+
+def _serve_stub(profile, seed, port_queue):
+    server = StubHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.profile = profile
+    server.seed = seed
+    server.counter = itertools.count()
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def build_profile(fixtures, latency=None, error_rate=None, rate_limit_rate=None, latency_scale=1.0):
+    """Per-provider stub settings; the option dicts map provider -> value, with "*" for every provider"""
+    latency, error_rate, rate_limit_rate = latency or {}, error_rate or {}, rate_limit_rate or {}
+    profile = {}
+    for name, responses in fixtures["providers"].items():
+        spec = PROVIDER_SPECS.get(name)
+        if spec is None:
+            continue
+        kind, *args = parse_latency(latency.get(name, latency.get("*", DEFAULT_LATENCY.get(name, "fixed:0.2"))))
+        if kind != "lognormal":
+            args = [arg * latency_scale for arg in args]
+        else:
+            args[0] *= latency_scale
+        profile[name] = {
+            "latency": (kind, *args),
+            "error_rate": error_rate.get(name, error_rate.get("*", 0.0)),
+            "rate_limit_rate": rate_limit_rate.get(name, rate_limit_rate.get("*", 0.0)),
+            "query_param": spec["query_param"],
+            "response_items": spec["response_items"],
+            "responses": responses,
+        }
+    return profile
+
+class StubServer:
+    """Stub provider server in a child process, so its threads don't compete with the benchmark for the GIL"""
+
+    def __init__(self, profile, seed=0):
+        self.profile = profile
+        self.seed = seed
+        self.process = None
+        self.port = None
+
+    def __enter__(self):
+        ports = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve_stub, args=(self.profile, self.seed, ports), daemon=True)
+        self.process.start()
+        self.port = ports.get(timeout=30)
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join(5)
+        return False
+
+    def point_providers(self):
+        """Aim every stubbed provider spec at this server; returns the original (url, key) pairs"""
+        original = {}
+        for name in self.profile:
+            spec = PROVIDER_SPECS[name]
+            original[name] = (spec["url"], spec.get("key"))
+            spec["url"] = f"http://127.0.0.1:{self.port}/{name}"
+            spec["key"] = spec.get("key") or "benchmark"
+        return original
+
+def restore_providers(original):
+    for name, (url, key) in original.items():
+        PROVIDER_SPECS[name]["url"] = url
+        PROVIDER_SPECS[name]["key"] = key
+
+def summarize(values):
+    """Mean, max and percentiles (ms) of a list of millisecond timings"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    summary = {f"p{q}": round(ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))], 2) for q in PERCENTILES}
+    summary["mean"] = round(statistics.fmean(ordered), 2)
+    summary["max"] = round(ordered[-1], 2)
+    return summary
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _run_sync(claims, concurrency, budget):
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+        return list(pool.map(lambda claim: verify_claim(claim, budget=budget), claims))
+
+async def _run_async(claims, concurrency, budget):
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(claim):
+        async with slots:
+            return await verify_claim_async(claim, budget=budget)
+
+    try:
+        return await asyncio.gather(*(one(claim) for claim in claims))
+    finally:
+        await close_async_client()
+
+def _wait_for_stragglers(timeout):
+    """Let searches left running after an early verdict finish, so they fill this run's cache and not the next one's"""
+    give_up = time.monotonic() + timeout
+    for thread in threading.enumerate():
+        if thread.name.startswith(("provider", "refresh-")):
+            thread.join(max(0.0, give_up - time.monotonic()))
+
+def run_benchmark(claims, concurrency, backend="sync", budget=DEFAULT_BUDGET, warm_cache=False, trace_memory=False):
+    """Verify every claim with `concurrency` in flight at once; returns one run's report dict"""
+    reset_breakers()
+    reset_metrics()
+    cache = ProviderCache(path="")
+    previous_cache = use_cache(cache)
+    previous_governor = use_governor(None)
+    previous_index = use_index(None)
+    try:
+        if warm_cache:
+            _run_sync(claims, concurrency, budget)
+            reset_metrics()
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        if backend == "async":
+            reports = asyncio.run(_run_async(claims, concurrency, budget))
+        else:
+            reports = _run_sync(claims, concurrency, budget)
+        wall = time.perf_counter() - start
+        heap_peak = None
+        if trace_memory:
+            heap_peak = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            tracemalloc.stop()
+    finally:
+        _wait_for_stragglers(budget)
+        use_cache(previous_cache)
+        use_governor(previous_governor)
+        use_index(previous_index)
+
+    provider_ms = {}
+    for report in reports:
+        for name, ms in report["timings"]["provider_ms"].items():
+            provider_ms.setdefault(name, []).append(ms)
+    verdicts = {}
+    for report in reports:
+        verdicts[report["verdict"]] = verdicts.get(report["verdict"], 0) + 1
+
+    return {
+        "backend": backend,
+        "concurrency": concurrency,
+        "warm_cache": warm_cache,
+        "verifications": len(reports),
+        "wall_seconds": round(wall, 3),
+        "throughput_per_second": round(len(reports) / wall, 2) if wall else None,
+        "latency_ms": {stage: summarize([report["timings"][f"{stage}_ms"] for report in reports]) for stage in STAGES},
+        "provider_latency_ms": {name: summarize(values) for name, values in sorted(provider_ms.items())},
+        "skipped_providers": sum(len(report["skipped_providers"]) for report in reports),
+        "verdicts": verdicts,
+        "metrics": metrics_snapshot()["counters"],
+        "memory": {"rss_peak_mb": _peak_rss_mb(), "heap_peak_mb": heap_peak},
+    }
+
+def compare_reports(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regressions of `report` against `baseline`, matching runs by backend and concurrency"""
+    previous = {(run["backend"], run["concurrency"], run["warm_cache"]): run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in report["runs"]:
+        old = previous.get((run["backend"], run["concurrency"], run["warm_cache"]))
+        if old is None:
+            continue
+        label = f"{run['backend']} x{run['concurrency']}"
+        if old["throughput_per_second"] and run["throughput_per_second"] < old["throughput_per_second"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {old['throughput_per_second']}/s -> {run['throughput_per_second']}/s")
+        for q in ("p50", "p90"):
+            before, after = old["latency_ms"]["total"].get(q), run["latency_ms"]["total"].get(q)
+            if before and after and after > before * (1 + tolerance):
+                regressions.append(f"{label}: total {q} {before} ms -> {after} ms")
+    return regressions
+
+def record_fixtures(claims, path, providers=None):
+    """Query the live APIs once per claim and provider and save the responses in the fixtures format"""
+    fixtures = {"description": "Provider responses recorded from the live APIs by api.benchmark --record",
+                "synthetic": False, "claims": list(claims), "providers": {}}
+    for name in providers or PROVIDER_SPECS:
+        spec = PROVIDER_SPECS[name]
+        if not spec.get("key"):
+            print(f"{spec['label']}: API key not configured - not recorded", file=sys.stderr)
+            continue
+        entries = fixtures["providers"][name] = []
+        for claim in claims:
+            search_query = spec["clean_query"](claim) if spec.get("clean_query") else claim
+            try:
+                status, body = raw_search(name, search_query)
+            except Exception as e:
+                print(f"{spec['label']}: '{claim[:40]}' failed ({e})", file=sys.stderr)
+                continue
+            entries.append({"query": claim, "status": status, "body": body})
+            print(f"{spec['label']}: '{claim[:40]}' -> {status}", file=sys.stderr)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, indent=1)
+    return fixtures
+
+def _provider_option(values, convert):
+    """["0.1", "currents=0.3"] -> {"*": 0.1, "currents": 0.3}"""
+    parsed = {}
+    for value in values or []:
+        name, _, setting = value.rpartition("=")
+        parsed[name or "*"] = convert(setting)
+    return parsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the verification pipeline against recorded provider responses")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="fixtures JSON (default: benchmarks/provider_fixtures.json)")
+    parser.add_argument("--concurrency", default="1,8", help="comma-separated verifications in flight (default: 1,8)")
+    parser.add_argument("--repeat", type=int, default=2, help="times each fixture claim is verified per run")
+    parser.add_argument("--backend", choices=["sync", "async", "both"], default="sync")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="verification budget in seconds")
+    parser.add_argument("--latency", action="append", metavar="[PROVIDER=]DIST",
+                        help="stub latency, e.g. fixed:0.1 or currents=lognormal:1.5:0.6 (repeatable)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiply every stub latency")
+    parser.add_argument("--error-rate", action="append", metavar="[PROVIDER=]RATE", help="share of HTTP 500 answers")
+    parser.add_argument("--rate-limit-rate", action="append", metavar="[PROVIDER=]RATE", help="share of HTTP 429 answers")
+    parser.add_argument("--warm-cache", action="store_true", help="verify every claim once before measuring")
+    parser.add_argument("--trace-memory", action="store_true", help="also measure the Python heap peak (slower)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="-", help="report JSON file (default: stdout)")
+    parser.add_argument("--baseline", help="earlier report to compare against; exit 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown as a fraction")
+    parser.add_argument("--record", metavar="PATH", help="record live responses for the fixture claims to PATH and exit")
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures(args.fixtures)
+    if args.record:
+        record_fixtures(fixtures["claims"], args.record)
+        return 0
+
+    profile = build_profile(
+        fixtures,
+        latency=_provider_option(args.latency, str),
+        error_rate=_provider_option(args.error_rate, float),
+        rate_limit_rate=_provider_option(args.rate_limit_rate, float),
+        latency_scale=args.latency_scale,
+    )
+    claims = fixtures["claims"] * args.repeat
+    backends = ["sync", "async"] if args.backend == "both" else [args.backend]
+
+    get_pipeline()
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"fixtures": os.path.basename(args.fixtures), "synthetic_fixtures": fixtures.get("synthetic", False),
+                   "claims": len(claims), "budget": args.budget,
+                   "seed": args.seed, "stub": {name: {key: value for key, value in entry.items() if key != "responses"}
+                                               for name, entry in profile.items()}},
+        "runs": [],
+    }
+    # The pipeline's progress prints would otherwise end up inside a report written to stdout
+    quiet = contextlib.redirect_stdout(sys.stderr) if args.output == "-" else contextlib.nullcontext()
+    with StubServer(profile, args.seed) as stub, quiet:
+        original = stub.point_providers()
+        try:
+            for backend in backends:
+                for concurrency in (int(level) for level in args.concurrency.split(",")):
+                    run = run_benchmark(claims, concurrency, backend, args.budget, args.warm_cache, args.trace_memory)
+                    report["runs"].append(run)
+                    total = run["latency_ms"]["total"]
+                    print(f"{backend} x{concurrency}: {run['throughput_per_second']} verifications/s, "
+                          f"p50 {total['p50']} ms, p90 {total['p90']} ms", file=sys.stderr)
+        finally:
+            restore_providers(original)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_reports(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+
+    data = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(data)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# File: api/breaker.py
+import os
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"        # calls go through
+OPEN = "open"            # calls are short-circuited until the cooldown ends
+HALF_OPEN = "half_open"  # one probe call is let through to see if the provider recovered
+
+# Consecutive failures (timeouts, connection errors, 5xx answers) that open a breaker
+FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURES", "3"))
+# A breaker also opens when the p90 of recent latencies goes above this (seconds)
+SLOW_THRESHOLD = float(os.getenv("BREAKER_SLOW_SECONDS", "8"))
+# Seconds an open breaker waits before probing; doubles after each failed probe
+COOLDOWN = float(os.getenv("BREAKER_COOLDOWN", "30"))
+MAX_COOLDOWN = 300.0
+
+# Latencies remembered per provider, and how many are needed before they are trusted
+WINDOW_SIZE = 100
+MIN_SAMPLES = 20
+# Adaptive request timeout: this multiple of the p99 latency, but never below MIN_TIMEOUT
+TIMEOUT_MULTIPLIER = 2.0
+MIN_TIMEOUT = 1.5
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+
+PROVIDER_UNAVAILABLE_ERROR = "Provider unavailable - skipped after repeated failures"
+
+def percentile(samples, q):
+    """q-th percentile (0-100) of a list of numbers, nearest-rank"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+class CircuitBreaker:
+    """Health tracker for one provider.
+
+    Opens after FAILURE_THRESHOLD consecutive failures or when recent latency
+    gets too slow, short-circuits calls while open, and lets a single probe
+    through once the cooldown has passed. Successful calls feed a latency
+    window that the adaptive request timeout is derived from.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.cooldown = COOLDOWN
+        self.latencies = deque(maxlen=WINDOW_SIZE)
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.short_circuited = 0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go out now; in half-open state only one probe at a time"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            # A probe that never reported back (e.g. skipped for quota) is replaced after a cooldown
+            if self.state == HALF_OPEN and (not self._probing or now - self._probe_started >= self.cooldown):
+                self._probing = True
+                self._probe_started = now
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, latency):
+        """A call got a 2xx-4xx HTTP response after `latency` seconds"""
+        with self._lock:
+            self.latencies.append(latency)
+            self.histogram[sum(1 for bound in LATENCY_BUCKETS if latency > bound)] += 1
+            self.failures = 0
+            self._probing = False
+            recent = list(self.latencies)[-MIN_SAMPLES:]
+            if self.state == CLOSED and len(recent) >= MIN_SAMPLES and percentile(recent, 90) > SLOW_THRESHOLD:
+                # Start the window afresh so the slow spell doesn't keep the breaker open after recovery
+                self.latencies.clear()
+                self._open(f"p90 latency above {SLOW_THRESHOLD:.0f}s")
+            elif self.state != CLOSED:
+                self.state = CLOSED
+                self.cooldown = COOLDOWN
+                print(f"Circuit breaker for {self.provider} closed")
+
+    def record_failure(self):
+        """A call timed out, could not connect or got a 5xx response"""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.cooldown * 2, MAX_COOLDOWN)
+                self._open("probe failed")
+            elif self.state == CLOSED and self.failures >= FAILURE_THRESHOLD:
+                self._open(f"{self.failures} consecutive failures")
+
+    def _open(self, reason):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        print(f"Circuit breaker for {self.provider} opened ({reason}), next probe in {self.cooldown:.0f}s")
+
+    def timeout(self, cap):
+        """Request timeout for this provider: derived from its p99 latency once known, never above `cap`"""
+        with self._lock:
+            if len(self.latencies) < MIN_SAMPLES:
+                return cap
+            p99 = percentile(self.latencies, 99)
+        return min(cap, max(MIN_TIMEOUT, p99 * TIMEOUT_MULTIPLIER))
+
+    def status(self):
+        """State, counters and latency percentiles for health reporting"""
+        with self._lock:
+            samples = list(self.latencies)
+            status = {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "short_circuited": self.short_circuited,
+                # Responses per latency bucket, keyed by the bucket's upper bound in seconds
+                "histogram": dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ["inf"], self.histogram)),
+            }
+        if samples:
+            status["p50_seconds"] = round(percentile(samples, 50), 3)
+            status["p99_seconds"] = round(percentile(samples, 99), 3)
+        return status
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(provider):
+    """The circuit breaker of a provider, created on first use"""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+def breaker_status():
+    """Health of every provider that has been called in this process"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.status() for name, breaker in breakers.items()}
+
+def reset_breakers():
+    """Forget every provider's health (used between benchmark runs)"""
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,289 @@
+# File: api/cache.py
+import functools
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from api.articles import Article
+from api.metrics import count
+
+# Set PROVIDER_CACHE=off to always hit the network
+CACHE_ENABLED = os.getenv("PROVIDER_CACHE", "on").lower() not in ("off", "0", "false")
+# On-disk tier; set PROVIDER_CACHE_PATH to an empty value for a memory-only cache
+CACHE_PATH = os.getenv(
+    "PROVIDER_CACHE_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache", "provider_cache.sqlite3")),
+)
+MEMORY_CACHE_SIZE = int(os.getenv("PROVIDER_CACHE_SIZE", "512"))
+
+HOUR = 3600
+
+# provider -> (fresh seconds, extra seconds a stale entry may be served while it is refreshed)
+# Providers with the tightest free-tier quotas keep results longest
+PROVIDER_TTLS = {
+    'newsapi': (1 * HOUR, 6 * HOUR),
+    'gnews': (1 * HOUR, 6 * HOUR),
+    'factcheck': (6 * HOUR, 24 * HOUR),
+    'mediastack': (6 * HOUR, 48 * HOUR),     # 500 requests/month
+    'newsdata': (3 * HOUR, 24 * HOUR),       # 200 requests/day
+    'currents': (6 * HOUR, 48 * HOUR),       # 600 requests/month
+    'rapidapi': (1 * HOUR, 6 * HOUR),
+}
+DEFAULT_TTL = (1 * HOUR, 6 * HOUR)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_query(query):
+    """Normalise a claim so trivially different pastes (case, punctuation, spacing) share a cache entry"""
+    query = _PUNCTUATION.sub(" ", query.lower())
+    return _WHITESPACE.sub(" ", query).strip()
+
+def cache_key(provider, query):
+    """Cache key for one provider search"""
+    return f"{provider}:{normalize_query(query)}"
+
+def encode_article(value):
+    """JSON hook storing Article records as compact tagged lists"""
+    if isinstance(value, Article):
+        return {"__article__": value.to_list()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def decode_article(value):
+    return Article.from_list(value["__article__"]) if "__article__" in value else value
+
+def _copy_result(result):
+    """Copy a cached result so callers can't mutate the cached lists"""
+    return {k: list(v) if isinstance(v, list) else v for k, v in result.items()}
+
+class ProviderCache:
+    """Two-tier cache of provider results: an in-process LRU in front of a SQLite store"""
+
+    def __init__(self, path=CACHE_PATH, memory_size=MEMORY_CACHE_SIZE):
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0, "stores": 0, "refreshes": 0}
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS provider_cache ("
+                    "key TEXT PRIMARY KEY, provider TEXT, stored_at REAL, payload TEXT)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Provider cache: disk tier disabled ({e})")
+                self._db = None
+
+    def get(self, key):
+        """Return (stored_at, result, tier) or None, where tier is "memory" or "disk"."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry + ("memory",)
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    "SELECT stored_at, payload FROM provider_cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Provider cache read failed: {e}")
+                return None
+            if row is None:
+                return None
+            entry = (row[0], json.loads(row[1], object_hook=decode_article))
+            self._remember(key, entry)
+            return entry + ("disk",)
+
+    def set(self, key, provider, result):
+        """Store a result in both tiers"""
+        entry = (time.time(), result)
+        with self._lock:
+            self._remember(key, entry)
+            self.stats["stores"] += 1
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO provider_cache (key, provider, stored_at, payload) VALUES (?, ?, ?, ?)",
+                    (key, provider, entry[0], json.dumps(result, default=encode_article)),
+                )
+                self._db.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Provider cache write failed: {e}")
+
+    def count(self, name):
+        """Bump one of the hit/miss counters"""
+        with self._lock:
+            self.stats[name] += 1
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM provider_cache")
+                self._db.commit()
+
+_UNSET = object()
+# Opened on first use, so importing this module creates no files
+_cache = _UNSET
+_cache_lock = threading.Lock()
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _shared_cache():
+    """The shared ProviderCache (None when disabled), opened on first use"""
+    global _cache
+    if _cache is _UNSET:
+        with _cache_lock:
+            if _cache is _UNSET:
+                _cache = ProviderCache() if CACHE_ENABLED else None
+    return _cache
+
+def cache_stats():
+    """Hit/miss counters for the provider cache"""
+    cache = _shared_cache()
+    if cache is None:
+        return {"enabled": False}
+    with cache._lock:
+        stats = dict(cache.stats)
+    lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+    stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+    stats["enabled"] = True
+    return stats
+
+def clear_cache():
+    """Empty the provider cache"""
+    cache = _shared_cache()
+    if cache is not None:
+        cache.clear()
+
+def use_cache(cache):
+    """Swap in another ProviderCache (e.g. a memory-only one for benchmarks), or None to bypass caching.
+
+    Returns the previous one, to pass back to use_cache() later. Has no
+    effect when PROVIDER_CACHE=off, since searches were then never wrapped.
+    """
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
+
+def _refresh_in_background(provider, search, query, key):
+    """Re-run a search for a stale entry without making the caller wait"""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            result = search(query)
+            cache = _shared_cache()
+            if result.get("error") is None and cache is not None:
+                cache.set(key, provider, result)
+                cache.count("refreshes")
+        except Exception as e:
+            print(f"{provider} background refresh failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, name=f"refresh-{provider}", daemon=True).start()
+
+def _cached_result(cache, provider, query, key, refresh_search):
+    """Cached result for a lookup (counting the hit), or None on a miss.
+
+    Stale entries are returned too, while `refresh_search` fetches a new copy
+    in a background thread.
+    """
+    fresh_for, stale_for = PROVIDER_TTLS.get(provider, DEFAULT_TTL)
+    entry = cache.get(key)
+    if entry is not None:
+        stored_at, result, tier = entry
+        age = time.time() - stored_at
+        if age < fresh_for:
+            cache.count(f"{tier}_hits")
+            count("cache_lookups_total", provider=provider, result=f"{tier}_hit")
+            return _copy_result(result)
+        if age < fresh_for + stale_for:
+            cache.count(f"{tier}_hits")
+            cache.count("stale_hits")
+            count("cache_lookups_total", provider=provider, result="stale_hit")
+            _refresh_in_background(provider, refresh_search, query, key)
+            return _copy_result(result)
+
+    cache.count("misses")
+    count("cache_lookups_total", provider=provider, result="miss")
+    return None
+
+def cached_search(provider):
+    """Decorator adding the two-tier cache with stale-while-revalidate to a `search_*` function.
+
+    Fresh entries are returned straight away. Entries past their TTL but inside
+    the stale window are returned too, while a background thread fetches a new
+    copy. Only successful results (no error) are stored.
+    """
+    def decorator(search):
+        if not CACHE_ENABLED:
+            return search
+
+        @functools.wraps(search)
+        def wrapper(query, deadline=None):
+            cache = _shared_cache()
+            if cache is None:
+                return search(query, deadline)
+            key = cache_key(provider, query)
+            result = _cached_result(cache, provider, query, key, search)
+            if result is not None:
+                return result
+
+            result = search(query, deadline)
+            if result.get("error") is None:
+                cache.set(key, provider, _copy_result(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+def cached_search_async(provider, refresh_search):
+    """cached_search() for coroutine searches; stale entries are refreshed with the sync `refresh_search`"""
+    def decorator(search):
+        if not CACHE_ENABLED:
+            return search
+
+        @functools.wraps(search)
+        async def wrapper(query, deadline=None):
+            cache = _shared_cache()
+            if cache is None:
+                return await search(query, deadline)
+            key = cache_key(provider, query)
+            result = _cached_result(cache, provider, query, key, refresh_search)
+            if result is not None:
+                return result
+
+            result = await search(query, deadline)
+            if result.get("error") is None:
+                cache.set(key, provider, _copy_result(result))
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,249 @@
+# File: api/claim_index.py
+"""Index of recently verified claims, so a reworded repeat reuses their evidence.
+
+Each claim is fingerprinted with a MinHash signature of its character
+shingles (the same hashing as the article title dedup in api/articles.py).
+Signatures are split into LSH bands: two claims sharing any band are
+candidates, and a candidate whose estimated Jaccard similarity reaches
+CLAIM_REUSE_SIMILARITY is a match. Entries live in SQLite, so every app and
+service process on the machine shares them, and expire after
+CLAIM_REUSE_MAX_AGE seconds.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from api.articles import MINHASH_PERMUTATIONS, SHINGLE_SIZE, minhash_signatures
+from api.breaker import PROVIDER_UNAVAILABLE_ERROR
+from api.cache import decode_article, encode_article, normalize_query
+from api.deadline import TIMED_OUT_ERROR
+from api.ladder import CONNECTION_FAILED_ERROR, REQUEST_TIMEOUT_ERROR
+
+# Set CLAIM_REUSE=off to verify every claim from scratch
+REUSE_ENABLED = os.getenv("CLAIM_REUSE", "on").lower() not in ("off", "0", "false")
+# Set CLAIM_INDEX_PATH to an empty value for a per-process index
+INDEX_PATH = os.getenv(
+    "CLAIM_INDEX_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache", "claim_index.sqlite3")),
+)
+# Estimated Jaccard similarity of two claims' shingles above which they are the same claim
+REUSE_SIMILARITY = float(os.getenv("CLAIM_REUSE_SIMILARITY", "0.7"))
+# Evidence older than this (seconds) is searched for again
+REUSE_MAX_AGE = float(os.getenv("CLAIM_REUSE_MAX_AGE", "7200"))
+INDEX_SIZE = int(os.getenv("CLAIM_INDEX_SIZE", "5000"))
+
+# Failures that say nothing about the claim: a claim with one of them is not indexed
+TRANSIENT_ERRORS = (TIMED_OUT_ERROR, REQUEST_TIMEOUT_ERROR, CONNECTION_FAILED_ERROR, PROVIDER_UNAVAILABLE_ERROR)
+
+# 16 bands of 4 rows: claims at similarity 0.7 share a band ~98% of the time, at 0.4 ~34%
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+# Only the start of long articles is fingerprinted
+MAX_CHARS = 2000
+
+def claim_signature(text):
+    """MinHash signature of a claim's normalised character shingles, or None for an empty claim"""
+    text = normalize_query(text)[:MAX_CHARS]
+    if not text:
+        return None
+    if len(text) <= SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    return minhash_signatures([shingles])[0].astype(np.uint32)
+
+def _bands(signature):
+    return [(band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()) for band in range(LSH_BANDS)]
+
+class ClaimIndex:
+    """MinHash LSH index of verified claims over a SQLite store of their provider results"""
+
+    def __init__(self, path=INDEX_PATH, max_age=REUSE_MAX_AGE, similarity=REUSE_SIMILARITY, size=INDEX_SIZE):
+        self.max_age = max_age
+        self.similarity = similarity
+        self.size = size
+        self._lock = threading.Lock()
+        # id -> (stored_at, signature); band -> ids sharing it
+        self._entries = {}
+        self._buckets = {}
+        self._last_id = 0
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            except OSError as e:
+                print(f"Claim index: using a per-process store ({e})")
+                path = ""
+        self._db = sqlite3.connect(path or ":memory:", timeout=5, check_same_thread=False)
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS claim_index ("
+            "id INTEGER PRIMARY KEY, stored_at REAL, claim TEXT, verdict TEXT, signature BLOB, results TEXT)"
+        )
+        self._db.commit()
+
+    def _sync(self, now):
+        """Index rows added since the last call (also by other processes) and forget expired ones"""
+        rows = self._db.execute(
+            "SELECT id, stored_at, signature FROM claim_index WHERE id > ? AND stored_at > ? ORDER BY id",
+            (self._last_id, now - self.max_age),
+        ).fetchall()
+        for entry_id, stored_at, blob in rows:
+            signature = np.frombuffer(blob, dtype=np.uint32)
+            self._entries[entry_id] = (stored_at, signature)
+            for band in _bands(signature):
+                self._buckets.setdefault(band, []).append(entry_id)
+            self._last_id = entry_id
+        expired = [entry_id for entry_id, (stored_at, _) in self._entries.items() if stored_at <= now - self.max_age]
+        for entry_id in expired:
+            self._forget(entry_id)
+
+    def _forget(self, entry_id):
+        """Drop one entry from the in-memory LSH tables"""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for band in _bands(entry[1]):
+            ids = self._buckets.get(band)
+            if ids is not None and entry_id in ids:
+                ids.remove(entry_id)
+                if not ids:
+                    del self._buckets[band]
+
+    def find(self, text):
+        """The most similar recent claim as a dict (claim, verdict, results, similarity, stored_at, age_seconds), or None"""
+        signature = claim_signature(text)
+        if signature is None:
+            return None
+        now = time.time()
+        with self._lock:
+            try:
+                self._sync(now)
+            except sqlite3.Error as e:
+                print(f"Claim index read failed: {e}")
+                return None
+            candidates = {entry_id for band in _bands(signature) for entry_id in self._buckets.get(band, ())}
+            best_id, best = None, self.similarity
+            for entry_id in candidates:
+                similarity = float(np.mean(self._entries[entry_id][1] == signature))
+                if similarity >= best:
+                    best_id, best = entry_id, similarity
+            if best_id is None:
+                return None
+            try:
+                row = self._db.execute(
+                    "SELECT stored_at, claim, verdict, results FROM claim_index WHERE id = ?", (best_id,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Claim index read failed: {e}")
+                return None
+            if row is None:
+                # Trimmed by another process since it was indexed
+                self._forget(best_id)
+                return None
+        stored_at, claim, verdict, results = row
+        return {"claim": claim, "verdict": verdict, "results": json.loads(results, object_hook=decode_article),
+                "similarity": round(best, 3), "stored_at": stored_at, "age_seconds": round(now - stored_at, 1)}
+
+    def add(self, text, verdict, results):
+        """Store a verified claim's verdict and provider results"""
+        signature = claim_signature(text)
+        if signature is None:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT INTO claim_index (stored_at, claim, verdict, signature, results) VALUES (?, ?, ?, ?, ?)",
+                    (now, text[:MAX_CHARS], verdict, signature.tobytes(), json.dumps(results, default=encode_article)),
+                )
+                # Drop expired rows, then the oldest ones beyond the size limit
+                self._db.execute("DELETE FROM claim_index WHERE stored_at <= ?", (now - self.max_age,))
+                newest = self._db.execute("SELECT MAX(id) FROM claim_index").fetchone()[0]
+                self._db.execute("DELETE FROM claim_index WHERE id <= ?", (newest - self.size,))
+                self._db.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"Claim index write failed: {e}")
+                return
+            for entry_id in [entry_id for entry_id in self._entries if entry_id <= newest - self.size]:
+                self._forget(entry_id)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._db.execute("DELETE FROM claim_index")
+            self._db.commit()
+            self._entries.clear()
+            self._buckets.clear()
+
+_UNSET = object()
+# Opened on first use, so importing this module creates no files
+_index = _UNSET
+_index_lock = threading.Lock()
+
+def _shared_index():
+    """The shared ClaimIndex (None when reuse is off), opened on first use"""
+    global _index
+    if _index is _UNSET:
+        with _index_lock:
+            if _index is _UNSET:
+                _index = ClaimIndex() if REUSE_ENABLED else None
+    return _index
+
+def find_similar_claim(text):
+    """A recently verified near-duplicate of `text` (see ClaimIndex.find), or None"""
+    index = _shared_index()
+    return index.find(text) if index is not None else None
+
+def transient_failure(result):
+    """True for a provider that timed out, lost its connection or was behind an open breaker"""
+    return result.get("error") in TRANSIENT_ERRORS
+
+def stored_results(results):
+    """Provider results as they are indexed: every provider that did not answer is stored as skipped"""
+    return {name: {**result, "error": None, "skipped": True} if result.get("error") or result.get("skipped") else result
+            for name, result in results.items()}
+
+def remember_claim(text, verdict, results):
+    """Record a claim's verdict and provider results for reuse.
+
+    A claim with a transient failure is not kept, since that provider may
+    well answer next time. Providers skipped by the early verdict or unable
+    to answer (no key, local quota, 429) are stored as skipped; a
+    near-duplicate searches them again if they could change its own verdict.
+    """
+    index = _shared_index()
+    if index is None or not results or any(transient_failure(result) for result in results.values()):
+        return
+    index.add(text, verdict, stored_results(results))
+
+def reuse_info(match):
+    """What a reused verdict reports about where it came from"""
+    return {
+        "claim": match["claim"],
+        "verdict": match["verdict"],
+        "similarity": match["similarity"],
+        "verified_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(match["stored_at"])),
+        "age_seconds": match["age_seconds"],
+    }
+
+def format_age(seconds):
+    """"42 seconds", "5 minutes", "2 hours" """
+    for unit, length in (("hour", 3600), ("minute", 60)):
+        if seconds >= length:
+            amount = int(seconds // length)
+            return f"{amount} {unit}{'s' if amount != 1 else ''}"
+    return f"{int(seconds)} seconds"
+
+def use_index(index):
+    """Swap in another ClaimIndex (None disables reuse, e.g. for benchmarks).
+
+    Returns the previous one, to pass back to use_index() later.
+    """
+    global _index
+    previous, _index = _index, index
+    return previous
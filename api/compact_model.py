@@ -0,0 +1,280 @@
+# File: api/compact_model.py
+"""Pickle-free, memory-mapped form of the TF-IDF + logistic regression model.
+
+    python -m api.compact_model                  # export model/ from the pickle, float32
+    python -m api.compact_model --dtype float16  # half the size, decisions within the printed bound
+
+An artefact is two files: a small JSON header (classes, intercept, vectorizer
+settings, where each array starts) and one binary file of raw arrays:
+
+    coef           n_features x float32 | float16 | int8 (times header scale)
+    idf            n_features x float32
+    terms          sorted vocabulary terms up to TERM_WIDTH bytes, fixed width
+    term_columns   uint32 column of each of those terms
+
+Every array is opened with np.memmap, so loading takes milliseconds, worker
+processes share the same page-cache pages, and nothing is unpickled. Terms
+longer than TERM_WIDTH bytes (a few hundred, mostly base64 blobs and URL
+fragments) are kept in the header.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from collections.abc import Mapping
+
+import numpy as np
+
+FORMAT = "tfidf-logreg-compact"
+FORMAT_VERSION = 1
+TERM_WIDTH = 20
+# Arrays start on cache-line boundaries
+ALIGNMENT = 64
+
+COEF_DTYPES = ("float32", "float16", "int8")
+
+class TermIndex(Mapping):
+    """Read-only term -> column mapping over the memory-mapped sorted term array"""
+
+    def __init__(self, terms, columns, long_terms):
+        self._terms = terms
+        self._width = terms.dtype.itemsize
+        self._columns = columns
+        self._long_terms = long_terms
+
+    def columns(self, tokens):
+        """Column of each token, -1 for tokens not in the vocabulary"""
+        keys = [token.encode("utf-8") for token in tokens]
+        found = np.full(len(keys), -1, dtype=np.int64)
+        short = [i for i, key in enumerate(keys) if len(key) <= self._width]
+        if short:
+            wanted = np.array([keys[i] for i in short], dtype=self._terms.dtype)
+            positions = np.minimum(np.searchsorted(self._terms, wanted), len(self._terms) - 1)
+            hits = self._terms[positions] == wanted
+            found[np.asarray(short)[hits]] = self._columns[positions[hits]]
+        if len(short) < len(keys) and self._long_terms:
+            for i, token in enumerate(tokens):
+                if len(keys[i]) > self._width:
+                    found[i] = self._long_terms.get(token, -1)
+        return found
+
+    def __getitem__(self, term):
+        column = int(self.columns([term])[0])
+        if column < 0:
+            raise KeyError(term)
+        return column
+
+    def __iter__(self):
+        for term in self._terms:
+            yield term.decode("utf-8")
+        yield from self._long_terms
+
+    def __len__(self):
+        return len(self._terms) + len(self._long_terms)
+
+class CompactVectorizer:
+    """TF-IDF transform matching the exported TfidfVectorizer (word unigrams, l2 norm)"""
+
+    def __init__(self, header, vocabulary, idf):
+        settings = header["vectorizer"]
+        self.lowercase = settings["lowercase"]
+        self.sublinear_tf = settings["sublinear_tf"]
+        self.norm = settings["norm"]
+        self._token = re.compile(settings["token_pattern"])
+        self._stop_words = frozenset(header["stop_words"])
+        self.vocabulary_ = vocabulary
+        self.idf_ = idf
+
+    def get_stop_words(self):
+        return self._stop_words
+
+    def weights(self, texts):
+        """(row, column, tf-idf weight) arrays of the non-zero entries of texts' rows, one vocabulary lookup for all"""
+        rows, tokens, tf = [], [], []
+        for row, text in enumerate(texts):
+            counts = Counter(self._token.findall(text.lower() if self.lowercase else text))
+            rows.extend([row] * len(counts))
+            tokens.extend(counts)
+            tf.extend(counts.values())
+        # Each distinct token is looked up once per batch
+        distinct = list(dict.fromkeys(tokens))
+        lookup = dict(zip(distinct, self.vocabulary_.columns(distinct).tolist()))
+        columns = np.fromiter(map(lookup.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        known = columns >= 0
+        rows, columns = np.asarray(rows, dtype=np.int64)[known], columns[known]
+        tf = np.asarray(tf, dtype=np.float64)[known]
+        if self.sublinear_tf:
+            tf = np.log(tf) + 1
+        values = tf * self.idf_[columns]
+        if self.norm == "l2":
+            norms = np.sqrt(np.bincount(rows, values * values, minlength=len(texts)))
+            values /= norms[rows]
+        return rows, columns, values
+
+    def transform(self, texts):
+        """Sparse (len(texts), n_features) TF-IDF matrix"""
+        from scipy.sparse import csr_matrix
+
+        rows, columns, values = self.weights(texts)
+        return csr_matrix((values, (rows, columns)), shape=(len(texts), len(self.idf_)))
+
+class CompactClassifier:
+    """Binary logistic regression over memory-mapped coefficients"""
+
+    def __init__(self, header, coef):
+        self.classes_ = np.array(header["classes"])
+        self.intercept_ = np.array([header["intercept"]])
+        self.scale = header["coef"]["scale"]
+        self.coef = coef
+
+    def decisions(self, rows, columns, values, n_rows):
+        """Decision function of each row, from vectorizer weights()"""
+        products = values * self.coef[columns].astype(np.float64)
+        return np.bincount(rows, products, minlength=n_rows) * self.scale + self.intercept_[0]
+
+class CompactPipeline:
+    """The subset of the sklearn Pipeline interface the app uses, backed by a compact artefact"""
+
+    def __init__(self, vectorizer, classifier):
+        self.named_steps = {"tfidf": vectorizer, "clf": classifier}
+        self.classes_ = classifier.classes_
+
+    def predict_proba(self, texts):
+        """(len(texts), 2) class probabilities, columns ordered as classes_"""
+        vectorizer, classifier = self.named_steps["tfidf"], self.named_steps["clf"]
+        decisions = classifier.decisions(*vectorizer.weights(texts), len(texts))
+        positive = 1.0 / (1.0 + np.exp(-decisions))
+        return np.column_stack((1.0 - positive, positive))
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def file_sha256(path):
+    """SHA-256 of a file, read through a memory map"""
+    if os.path.getsize(path) == 0:
+        return hashlib.sha256().hexdigest()
+    return hashlib.sha256(np.memmap(path, dtype=np.uint8, mode="r")).hexdigest()
+
+def load_compact(model_dir, entry):
+    """CompactPipeline for a manifest's "compact" entry, after checking the data file's checksum"""
+    data_path = os.path.join(model_dir, entry["data"])
+    with open(os.path.join(model_dir, entry["header"]), "r", encoding="utf-8") as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT or header.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compact model format in {entry['header']}")
+    if file_sha256(data_path) != entry["sha256"]:
+        raise ValueError(f"Model artefact checksum mismatch for {entry['data']}")
+
+    n_features = header["n_features"]
+    array = lambda spec, dtype, shape: np.memmap(data_path, dtype=dtype, mode="r", offset=spec["offset"], shape=shape)
+    coef = array(header["coef"], header["coef"]["dtype"], (n_features,))
+    idf = array(header["idf"], np.float32, (n_features,))
+    terms = header["terms"]
+    vocabulary = TermIndex(array(terms, f"S{terms['width']}", (terms["count"],)),
+                           array(header["term_columns"], np.uint32, (terms["count"],)),
+                           header["long_terms"])
+    return CompactPipeline(CompactVectorizer(header, vocabulary, idf), CompactClassifier(header, coef))
+
+def _check_exportable(vectorizer, classifier):
+    params = vectorizer.get_params()
+    unsupported = {
+        "analyzer": params["analyzer"] != "word",
+        "ngram_range": tuple(params["ngram_range"]) != (1, 1),
+        "binary": params["binary"],
+        "use_idf": not params["use_idf"],
+        "norm": params["norm"] not in ("l2", None),
+        "strip_accents": params["strip_accents"] is not None,
+        "preprocessor": params["preprocessor"] is not None,
+        "tokenizer": params["tokenizer"] is not None,
+    }
+    problems = [name for name, bad in unsupported.items() if bad]
+    if len(classifier.classes_) != 2:
+        problems.append("more than two classes")
+    if problems:
+        raise ValueError(f"Model cannot be exported to the compact format: {', '.join(problems)}")
+
+def export_compact(pipeline, data_path, header_path, coef_dtype="float32"):
+    """Write a fitted TF-IDF + LogisticRegression pipeline as a compact artefact; returns its manifest entry"""
+    if coef_dtype not in COEF_DTYPES:
+        raise ValueError(f"coef dtype must be one of {', '.join(COEF_DTYPES)}")
+    vectorizer, classifier = pipeline.named_steps["tfidf"], pipeline.named_steps["clf"]
+    _check_exportable(vectorizer, classifier)
+
+    coef = np.asarray(classifier.coef_[0], dtype=np.float64)
+    scale = 1.0
+    if coef_dtype == "int8":
+        scale = float(np.abs(coef).max()) / 127 or 1.0
+        stored = np.round(coef / scale).astype(np.int8)
+    else:
+        stored = coef.astype(coef_dtype)
+    idf = np.asarray(vectorizer.idf_, dtype=np.float32)
+
+    short, long_terms = [], {}
+    for term, column in vectorizer.vocabulary_.items():
+        key = term.encode("utf-8")
+        if len(key) <= TERM_WIDTH:
+            short.append((key, column))
+        else:
+            long_terms[term] = int(column)
+    short.sort()
+    terms = np.array([key for key, _ in short], dtype=f"S{TERM_WIDTH}")
+    term_columns = np.array([column for _, column in short], dtype=np.uint32)
+
+    header = {
+        "format": FORMAT,
+        "format_version": FORMAT_VERSION,
+        "classes": [str(label) for label in classifier.classes_],
+        "intercept": float(classifier.intercept_[0]),
+        "n_features": len(idf),
+        "vectorizer": {
+            "lowercase": bool(vectorizer.lowercase),
+            "token_pattern": vectorizer.token_pattern,
+            "norm": vectorizer.norm,
+            "sublinear_tf": bool(vectorizer.sublinear_tf),
+        },
+        "stop_words": sorted(vectorizer.get_stop_words() or ()),
+        "long_terms": long_terms,
+    }
+    offset = 0
+    with open(data_path, "wb") as f:
+        for name, values, extra in (("coef", stored, {"dtype": coef_dtype, "scale": scale}),
+                                    ("idf", idf, {}), ("terms", terms, {"count": len(terms), "width": TERM_WIDTH}),
+                                    ("term_columns", term_columns, {})):
+            offset = _align(offset)
+            f.write(b"\0" * (offset - f.tell()))
+            header[name] = {"offset": offset, **extra}
+            f.write(values.tobytes())
+            offset += values.nbytes
+    with open(header_path, "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=1)
+
+    # Rows are non-negative and L2-normalised, so no decision moves by more than this
+    error = float(np.linalg.norm(stored.astype(np.float64) * scale - coef))
+    print(f"Wrote {data_path} ({os.path.getsize(data_path) / 1e6:.1f} MB, coef {coef_dtype}, "
+          f"decision error at most {error:.2e})")
+    return {"header": os.path.basename(header_path), "data": os.path.basename(data_path),
+            "sha256": file_sha256(data_path), "coef_dtype": coef_dtype}
+
+def main(argv=None):
+    from api.model_utils import MANIFEST_PATH, MODEL_DIR, load_manifest, load_pickled_pipeline
+
+    parser = argparse.ArgumentParser(description="Export the pickled model as a memory-mapped compact artefact")
+    parser.add_argument("--dtype", choices=COEF_DTYPES, default="float32", help="coefficient storage type")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest()
+    stem = os.path.splitext(manifest["artefact"])[0]
+    entry = export_compact(load_pickled_pipeline(manifest),
+                           os.path.join(MODEL_DIR, f"{stem}.bin"), os.path.join(MODEL_DIR, f"{stem}.json"), args.dtype)
+    manifest["compact"] = entry
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    print(f"Updated {MANIFEST_PATH}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
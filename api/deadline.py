@@ -0,0 +1,34 @@
+# File: api/deadline.py
+import time
+
+# Error reported by any provider that runs out of time budget
+TIMED_OUT_ERROR = "Request timed out - verification time budget exhausted"
+
+# Below this many seconds there is no point starting another HTTP request
+MIN_REQUEST_TIMEOUT = 0.5
+
+class Deadline:
+    """Overall time budget shared by every call made for one verification.
+
+    Providers ask the deadline for the timeout of each request, so retries only
+    ever use the time that is left rather than a fixed per-attempt allowance.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self):
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        """True once there is not enough time left for another request"""
+        return self.remaining() < MIN_REQUEST_TIMEOUT
+
+    def timeout(self, cap):
+        """Timeout for the next request: the per-request cap or the time left, whichever is smaller"""
+        return max(MIN_REQUEST_TIMEOUT, min(cap, self.remaining()))
+
+    def __repr__(self):
+        return f"Deadline(budget={self.budget}, remaining={self.remaining():.2f})"
@@ -0,0 +1,101 @@
+# File: api/http_client.py
+import asyncio
+import os
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # only the async provider backend needs it
+    httpx = None
+
+# Connection pool sizing - one pool per host, enough connections for every
+# query variant of every concurrent Analyze to keep a warm socket
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+USER_AGENT = "fake-news-detector/1.0"
+# The async client has one pool for every host, so it is sized for many
+# concurrent verifications rather than per host
+ASYNC_MAX_CONNECTIONS = int(os.getenv("HTTP_ASYNC_MAX_CONNECTIONS", "256"))
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+# Event loop -> its httpx.AsyncClient (a client can't be shared between loops)
+_async_clients = weakref.WeakKeyDictionary()
+
+def _new_session():
+    """Build a keep-alive session with a tuned connection pool"""
+    session = requests.Session()
+    # Retries are handled by the provider query ladder, not by urllib3
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Connection": "keep-alive"})
+    return session
+
+def get_session(url):
+    """Shared session for the host of `url`, created on first use.
+
+    Sessions live for the whole process, so every Streamlit session and worker
+    thread reuses the same warm TCP+TLS connections. The urllib3 pool behind
+    each session is thread-safe; creation is guarded so each host gets one.
+    """
+    host = urlsplit(url).netloc
+    session = _sessions.get(host)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = _new_session()
+                _sessions[host] = session
+    return session
+
+def http_get(url, **kwargs):
+    """Drop-in replacement for `requests.get` that goes through the pooled session for the host"""
+    return get_session(url).get(url, **kwargs)
+
+def close_sessions():
+    """Close every pooled connection (used on shutdown and by tests)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def get_async_client():
+    """Shared httpx.AsyncClient for the running event loop, created on first use"""
+    if httpx is None:
+        raise RuntimeError("httpx is not installed - pip install httpx to use the async provider backend")
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS, max_keepalive_connections=POOL_MAXSIZE),
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+        )
+        _async_clients[loop] = client
+    return client
+
+async def async_http_get(url, params=None, headers=None, timeout=None):
+    """Async counterpart of http_get().
+
+    httpx timeouts and transport errors are re-raised as the matching requests
+    exceptions, so callers handle both backends with the same except clauses.
+    """
+    # Without httpx the except clauses below could not even be evaluated
+    client = get_async_client()
+    try:
+        return await client.get(url, params=params, headers=headers, timeout=timeout)
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except httpx.TransportError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+async def close_async_client():
+    """Close the running loop's async client (call before the loop shuts down)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
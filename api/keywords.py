@@ -0,0 +1,144 @@
+# File: api/keywords.py
+"""Search keywords for a claim, ranked by how much they say about its story.
+
+Terms are weighted by the IDF of the model's own TF-IDF vectorizer (so words
+common in news like "people" or "government" rank low), by being a name, by
+how often they occur and by whether they appear in the lead; likely verbs rank
+lower and wire datelines are ignored. The top terms are returned in text order,
+with a multi-word name counting as one term. An article's first query only uses
+terms from its lead. Rankings are memoized per text, since every provider asks
+for the same claim's keywords once per query variant.
+"""
+import functools
+import math
+import re
+
+from api.model_utils import term_idf
+
+# Function words never worth searching for. The vectorizer's own stop list is
+# not used for this: it also drops words like "bill", "interest" and "fire".
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each either else ever every few for from further had has
+have having he her here hers herself him himself his how however i if in into is it its itself just may me
+might more most much must my myself neither no nor not now of off often on once only or other our ours
+ourselves out over own same shall she should so some such than that the their theirs them themselves then
+there these they this those though through thus to too under until up upon us very was we were what when
+where whether which while who whom whose why will with within without would yet you your yours yourself
+yourselves said says say according told reported
+""".split())
+
+# Texts up to this many words are headlines and searched as they are;
+# longer articles are searched with their keywords, at most LONG_TEXT_KEYWORDS
+HEADLINE_WORDS = 15
+LONG_TEXT_KEYWORDS = 6
+# Words of a multi-word name after its first take no keyword slot, up to this many per query
+NAME_EXTRA_WORDS = 2
+# Only the start of an article is ranked - that is where its story is told
+MAX_TOKENS = 250
+LEAD_TOKENS = 25
+LEAD_BOOST = 1.3
+PROPER_NOUN_BOOST = 1.5
+# Lowercase words ending in -ing/-ed are mostly verbs ("handing", "signaled"),
+# which say less about a story than the nouns around them
+VERB_FORM_PENALTY = 0.5
+# IDF above this adds nothing: very rare words (typos, unusual spellings) make
+# a query match fewer articles, not better ones
+IDF_CAP = 7.0
+
+_TOKEN = re.compile(r"\w+(?:-\w+)*")
+_SENTENCE_END = re.compile(r"[.!?]")
+_VERB_FORM = re.compile(r"[a-z]{3,}(?:ing|ed)$")
+# "WASHINGTON (Reuters) - " and similar wire datelines
+_DATELINE = re.compile(r"^[A-Z][A-Z .,'/-]*(?:\([^)]{1,30}\))?\s*[-\u2013\u2014]+\s+")
+
+@functools.lru_cache(maxsize=1)
+def _tables():
+    """(vocabulary, idf, common words, lowest idf), or None without a model"""
+    try:
+        vocabulary, idf, model_stop_words = term_idf()
+    except Exception as e:
+        print(f"Keyword IDF table unavailable, ranking by position: {e}")
+        return None
+    return vocabulary, idf, model_stop_words, float(idf.min())
+
+def _idf(key, tables):
+    """IDF of a term; words the vectorizer dropped as stop words count as the most common ones, unseen words as rare"""
+    vocabulary, idf, common_words, lowest = tables
+    column = vocabulary.get(key)
+    if column is None:
+        columns = [vocabulary[part] for part in key.split("-") if part in vocabulary]
+        if columns:
+            return min(IDF_CAP, float(max(idf[column] for column in columns)))
+        return lowest if key in common_words else IDF_CAP
+    return min(IDF_CAP, float(idf[column]))
+
+@functools.lru_cache(maxsize=1024)
+def ranked_terms(text):
+    """Distinct terms of `text` as (term, first position) pairs, most salient first"""
+    tables = _tables()
+    text = _DATELINE.sub("", text, count=1)
+    scores, first_seen, counts = {}, {}, {}
+    previous_end, previous = 0, ""
+    for position, match in enumerate(_TOKEN.finditer(text)):
+        if position >= MAX_TOKENS:
+            break
+        token = match.group()
+        key = token.lower()
+        # The full stop of an initial or abbreviation ("U.S. Senate") doesn't end a sentence
+        sentence_start = position == 0 or (_SENTENCE_END.search(text, previous_end, match.start()) is not None
+                                           and len(previous) > 1)
+        previous_end, previous = match.end(), token
+        # Short all-caps words are acronyms (US, WHO), not stop words; other
+        # two-character terms only count as numbers (5G)
+        acronym = token.isupper() and len(token) <= 4
+        if (key in STOP_WORDS and not acronym) or len(key) < 2 or (len(key) == 2 and not (acronym or key[0].isdigit())):
+            continue
+        counts[key] = counts.get(key, 0) + 1
+        if key in first_seen:
+            continue
+        proper = token[0].isupper() and (not sentence_start or token.isupper())
+        first_seen[key] = (token, position)
+        if tables:
+            score = _idf(key, tables) * (PROPER_NOUN_BOOST if proper else 1.0)
+        else:
+            # No IDF table: keep the old leading-words behaviour, preferring longer and capitalised words
+            score = (1.0 / (1 + position)) * (PROPER_NOUN_BOOST if proper else 1.0) * min(len(key), 8)
+        if _VERB_FORM.match(token):
+            score *= VERB_FORM_PENALTY
+        scores[key] = score * (LEAD_BOOST if position < LEAD_TOKENS else 1.0)
+
+    ranked = sorted(scores, key=lambda key: (-scores[key] * (1 + math.log(counts[key])), first_seen[key][1]))
+    return tuple(first_seen[key] for key in ranked)
+
+def _pick(terms, count):
+    """The first `count` ranked terms in text order; a multi-word name ("Joe Biden") takes one slot"""
+    chosen, slots, extra = [], 0, 0
+    for token, position in terms:
+        joins_name = extra < NAME_EXTRA_WORDS and token[0].isupper() and any(
+            abs(position - other) == 1 and other_token[0].isupper() for other_token, other in chosen)
+        if joins_name:
+            extra += 1
+        elif slots == count:
+            break
+        else:
+            slots += 1
+        chosen.append((token, position))
+    return " ".join(token for token, _ in sorted(chosen, key=lambda term: term[1]))
+
+def extract_keywords(text, max_words=8):
+    """The `max_words` most salient terms of the text (at most LONG_TEXT_KEYWORDS for articles), in text order"""
+    if len(text.split()) > HEADLINE_WORDS:
+        max_words = min(max_words, LONG_TEXT_KEYWORDS)
+    return _pick(ranked_terms(text), max_words)
+
+def first_query(text):
+    """First query for a claim: a headline as it is, an article as the keywords of its lead.
+
+    Only terms from the first LEAD_TOKENS words are used, where the article
+    states its story, so the query differs from the whole-text keyword variants.
+    """
+    text = text.strip()
+    if len(text.split()) <= HEADLINE_WORDS:
+        return text
+    return _pick([term for term in ranked_terms(text) if term[1] < LEAD_TOKENS], LONG_TEXT_KEYWORDS)
@@ -0,0 +1,304 @@
+# File: api/ladder.py
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+
+from api.breaker import HALF_OPEN, PROVIDER_UNAVAILABLE_ERROR, get_breaker
+from api.deadline import TIMED_OUT_ERROR
+from api.metrics import annotate, count, observe, span
+from api.quota import QUOTA_EXHAUSTED_ERROR, acquire, quota_low, report_rate_limited
+
+SEQUENTIAL = "sequential"  # try each query variant only after the previous one came back empty
+RACE = "race"              # send every variant at once and take the first useful answer
+HEDGE = "hedge"            # start the next variant if the current one is slow or comes back empty
+
+# How each provider walks its query variants. Every provider with a local
+# quota (api/quota.py) stays sequential so one claim spends a request on a
+# later variant only when the earlier ones came back empty; only providers
+# without a quota race or hedge. Override with e.g. LADDER_STRATEGY_NEWSDATA=race
+LADDER_STRATEGIES = {
+    'newsapi': SEQUENTIAL,      # 100 requests/day
+    'gnews': SEQUENTIAL,        # 100 requests/day
+    'factcheck': RACE,
+    'mediastack': SEQUENTIAL,   # 500 requests/month
+    'newsdata': SEQUENTIAL,     # 200 requests/day
+    'currents': SEQUENTIAL,     # 600 requests/month
+    'rapidapi': HEDGE,
+}
+
+# Errors for a single request that failed; the next search may well succeed
+REQUEST_TIMEOUT_ERROR = "Request timed out - API may be slow"
+CONNECTION_FAILED_ERROR = "Connection failed - API may be down"
+
+# Seconds a hedged variant gets before the next one is started alongside it
+HEDGE_DELAY = float(os.getenv("LADDER_HEDGE_DELAY", "1.0"))
+
+_ladder_pool = ThreadPoolExecutor(max_workers=int(os.getenv("LADDER_WORKERS", "64")), thread_name_prefix="ladder")
+
+def ladder_strategy(provider):
+    """Configured strategy for a provider"""
+    strategy = os.getenv(f"LADDER_STRATEGY_{provider.upper()}", LADDER_STRATEGIES.get(provider, SEQUENTIAL)).lower()
+    return strategy if strategy in (SEQUENTIAL, RACE, HEDGE) else SEQUENTIAL
+
+def _refuse_variant(provider, label, index, search_query, result_key):
+    """Spend a quota token for a variant; returns (False, None) to send it or (True, result) when refused"""
+    if acquire(provider, index):
+        return False, None
+    count("provider_requests_total", provider=provider, variant=index, outcome="quota_refused")
+    if index == 0:
+        return True, {"error": QUOTA_EXHAUSTED_ERROR, result_key: []}
+    print(f"{label} skipping query '{search_query}' - keeping the remaining quota for first queries")
+    return True, None
+
+def _variant_answered(provider, breaker, start, result, status, result_key):
+    if status is not None and status >= 500:
+        # A server error is a failure too, and its latency says nothing about a healthy answer
+        breaker.record_failure()
+    else:
+        breaker.record_success(time.perf_counter() - start)
+    if result is not None and (result.get("error") or "").startswith("Rate limit exceeded"):
+        report_rate_limited(provider)
+    if status == 429:
+        annotate(outcome="rate_limited")
+    elif result is not None and result.get(result_key):
+        annotate(outcome="found")
+    elif result is None and status == 200:
+        annotate(outcome="empty")
+    else:
+        annotate(outcome="http_error")
+    return result
+
+def _variant_failed(error, label, search_query, timeout, deadline, breaker, result_key, continue_on_timeout):
+    """Result for a variant that raised `error`, or None to move on to the next variant"""
+    if isinstance(error, requests.exceptions.Timeout):
+        if deadline.expired():
+            # Cut short by our own budget, which says nothing about the provider's health
+            annotate(outcome="deadline")
+            return {"error": TIMED_OUT_ERROR, result_key: []}
+        breaker.record_failure()
+        annotate(outcome="timeout")
+        if continue_on_timeout:
+            print(f"{label} timeout after {timeout:.1f}s with query '{search_query}'")
+            return None
+        return {"error": REQUEST_TIMEOUT_ERROR, result_key: []}
+    if isinstance(error, requests.exceptions.ConnectionError):
+        breaker.record_failure()
+        annotate(outcome="connection_error")
+        return {"error": CONNECTION_FAILED_ERROR, result_key: []}
+    annotate(outcome="error")
+    print(f"{label} Exception with query '{search_query}': {error}")
+    return None
+
+def _record_variant(provider, index, variant_span):
+    """Latency and outcome metrics for one variant that went out"""
+    observe("provider_request_seconds", variant_span.seconds, provider=provider, variant=index)
+    count("provider_requests_total", provider=provider, variant=index,
+          outcome=variant_span.fields.get("outcome", "error"))
+
+def _try_variant(provider, label, index, attempt, search_query, timeout, deadline, result_key, continue_on_timeout):
+    """Run one attempt; returns a final result dict, or None to move on to the next variant"""
+    refused, result = _refuse_variant(provider, label, index, search_query, result_key)
+    if refused:
+        return result
+    breaker = get_breaker(provider)
+    with span("provider_variant", provider=provider, variant=index, query=search_query,
+              timeout=round(timeout, 2)) as variant_span:
+        start = time.perf_counter()
+        try:
+            result = attempt(search_query, timeout)
+        except Exception as e:
+            result = _variant_failed(e, label, search_query, timeout, deadline, breaker, result_key,
+                                     continue_on_timeout)
+        else:
+            result = _variant_answered(provider, breaker, start, result, variant_span.fields.get("status"),
+                                       result_key)
+    _record_variant(provider, index, variant_span)
+    return result
+
+async def _try_variant_async(provider, label, index, attempt, search_query, timeout, deadline, result_key,
+                             continue_on_timeout):
+    """_try_variant() for a coroutine `attempt`"""
+    refused, result = _refuse_variant(provider, label, index, search_query, result_key)
+    if refused:
+        return result
+    breaker = get_breaker(provider)
+    with span("provider_variant", provider=provider, variant=index, query=search_query,
+              timeout=round(timeout, 2)) as variant_span:
+        start = time.perf_counter()
+        try:
+            result = await attempt(search_query, timeout)
+        except Exception as e:
+            result = _variant_failed(e, label, search_query, timeout, deadline, breaker, result_key,
+                                     continue_on_timeout)
+        else:
+            result = _variant_answered(provider, breaker, start, result, variant_span.fields.get("status"),
+                                       result_key)
+    _record_variant(provider, index, variant_span)
+    return result
+
+def _plan_ladder(provider, search_queries, strategy):
+    """(strategy, distinct queries) for a ladder run; strategy is None while the breaker is open"""
+    breaker = get_breaker(provider)
+    if not breaker.allow():
+        count("provider_requests_total", provider=provider, variant=0, outcome="breaker_open")
+        return None, []
+
+    strategy = strategy or ladder_strategy(provider)
+    if strategy != SEQUENTIAL and (quota_low(provider) or breaker.state == HALF_OPEN):
+        # Nearly out of quota, or probing a provider that was failing - send one request at a time
+        strategy = SEQUENTIAL
+
+    # Short claims often produce the same query more than once - only send it once
+    queries = []
+    for search_query in search_queries:
+        if search_query and search_query not in queries:
+            queries.append(search_query)
+    return strategy, queries
+
+def _timeout_cap(provider, timeouts, index):
+    return get_breaker(provider).timeout(timeouts[min(index, len(timeouts) - 1)])
+
+def run_ladder(provider, label, search_queries, attempt, deadline, result_key="articles",
+               timeouts=(20,), continue_on_timeout=False, strategy=None):
+    """Walk a provider's query variants and return the first final result.
+
+    `attempt(search_query, timeout)` performs one HTTP call and returns a final
+    result dict (articles found, or an error such as a 429) or None when the
+    next variant should be tried; requests exceptions are handled here.
+    `timeouts[i]` caps the request timeout of variant i (the last value repeats),
+    and every timeout is further capped by the shared deadline.
+
+    Variants are issued sequentially, all at once (race) or staggered by
+    HEDGE_DELAY (hedge) according to the provider's strategy. In the concurrent
+    modes the first final result wins and variants that have not started yet
+    are cancelled.
+
+    Every variant spends a token from the provider's local quota (api/quota.py)
+    before it is sent. Later variants are skipped when the quota runs low, and a
+    provider whose quota is low is walked sequentially whatever its strategy.
+
+    The provider's circuit breaker (api/breaker.py) is consulted first: while
+    it is open the ladder returns PROVIDER_UNAVAILABLE_ERROR without a request,
+    and once the provider's latency is known the `timeouts` caps shrink to fit it.
+    """
+    strategy, queries = _plan_ladder(provider, search_queries, strategy)
+    if strategy is None:
+        return {"error": PROVIDER_UNAVAILABLE_ERROR, result_key: []}
+
+    def cap(index):
+        return _timeout_cap(provider, timeouts, index)
+
+    if strategy == SEQUENTIAL:
+        for index, search_query in enumerate(queries):
+            if deadline.expired():
+                return {"error": TIMED_OUT_ERROR, result_key: []}
+            result = _try_variant(provider, label, index, attempt, search_query, deadline.timeout(cap(index)),
+                                  deadline, result_key, continue_on_timeout)
+            if result is not None:
+                return result
+    else:
+        delay = 0 if strategy == RACE else HEDGE_DELAY
+        futures = {}
+        next_index = 0
+        launch = True
+        try:
+            while True:
+                while launch and next_index < len(queries):
+                    if deadline.expired():
+                        return {"error": TIMED_OUT_ERROR, result_key: []}
+                    # Each variant runs in a copy of this context so its span joins the caller's trace
+                    future = _ladder_pool.submit(contextvars.copy_context().run, _try_variant, provider, label,
+                                                 next_index, attempt, queries[next_index],
+                                                 deadline.timeout(cap(next_index)), deadline, result_key,
+                                                 continue_on_timeout)
+                    futures[future] = next_index
+                    next_index += 1
+                    # Racing launches every variant now; hedging launches one per round
+                    launch = delay == 0
+                if not futures:
+                    break
+
+                wait_for = deadline.remaining()
+                if next_index < len(queries):
+                    wait_for = min(wait_for, delay)
+                done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del futures[future]
+                    result = future.result()
+                    if result is not None:
+                        return result
+
+                if deadline.expired():
+                    return {"error": TIMED_OUT_ERROR, result_key: []}
+                # Either something came back empty or the hedge delay passed - start the next variant
+                launch = True
+        finally:
+            for future in futures:
+                future.cancel()
+
+    if continue_on_timeout and deadline.expired():
+        return {"error": TIMED_OUT_ERROR, result_key: []}
+    return {"error": None, result_key: []}
+
+async def run_ladder_async(provider, label, search_queries, attempt, deadline, result_key="articles",
+                           timeouts=(20,), continue_on_timeout=False, strategy=None):
+    """run_ladder() for a coroutine `attempt(search_query, timeout)`.
+
+    Same strategies, quota and circuit breaker; concurrent variants are asyncio
+    tasks, and the losers of a race or hedge are cancelled mid-request.
+    """
+    strategy, queries = _plan_ladder(provider, search_queries, strategy)
+    if strategy is None:
+        return {"error": PROVIDER_UNAVAILABLE_ERROR, result_key: []}
+
+    def variant(index):
+        return _try_variant_async(provider, label, index, attempt, queries[index],
+                                  deadline.timeout(_timeout_cap(provider, timeouts, index)), deadline, result_key,
+                                  continue_on_timeout)
+
+    if strategy == SEQUENTIAL:
+        for index in range(len(queries)):
+            if deadline.expired():
+                return {"error": TIMED_OUT_ERROR, result_key: []}
+            result = await variant(index)
+            if result is not None:
+                return result
+    else:
+        delay = 0 if strategy == RACE else HEDGE_DELAY
+        tasks = set()
+        next_index = 0
+        launch = True
+        try:
+            while True:
+                while launch and next_index < len(queries):
+                    if deadline.expired():
+                        return {"error": TIMED_OUT_ERROR, result_key: []}
+                    tasks.add(asyncio.ensure_future(variant(next_index)))
+                    next_index += 1
+                    launch = delay == 0
+                if not tasks:
+                    break
+
+                wait_for = deadline.remaining()
+                if next_index < len(queries):
+                    wait_for = min(wait_for, delay)
+                done, tasks = await asyncio.wait(tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result is not None:
+                        return result
+
+                if deadline.expired():
+                    return {"error": TIMED_OUT_ERROR, result_key: []}
+                launch = True
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    if continue_on_timeout and deadline.expired():
+        return {"error": TIMED_OUT_ERROR, result_key: []}
+    return {"error": None, result_key: []}
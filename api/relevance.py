@@ -0,0 +1,45 @@
+# File: api/relevance.py
+import os
+import re
+
+import numpy as np
+
+from api.model_utils import vectorize
+
+# Cosine similarity below which an article is not about the claim at all,
+# and the similarity from which it counts as a full match
+RELEVANCE_THRESHOLD = float(os.getenv("RELEVANCE_THRESHOLD", "0.2"))
+FULL_RELEVANCE = float(os.getenv("FULL_RELEVANCE", "0.4"))
+
+# Providers are searched with the start of the claim, so long articles are
+# compared on their opening words (headline and lead) only
+CLAIM_WORDS = 60
+
+_WORD = re.compile(r"\S+")
+
+def article_text(article):
+    """Text an article is matched on: its title plus snippet"""
+    return f"{article.title} {article.snippet}"
+
+def relevance_scores(claim, articles):
+    """TF-IDF cosine similarity of each article to the claim, as a numpy array.
+
+    Uses the model's own vectorizer, so the vocabulary and IDF weights come
+    from the training corpus and nothing is fitted per request. Its rows are
+    L2-normalised, so the cosine is one sparse matrix-vector product. Returns
+    None when the model is unavailable.
+    """
+    if not articles:
+        return np.zeros(0)
+    claim = " ".join(_WORD.findall(claim)[:CLAIM_WORDS])
+    try:
+        matrix = vectorize([claim] + [article_text(article) for article in articles])
+    except Exception as e:
+        print(f"Relevance scoring unavailable: {e}")
+        return None
+    return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+def relevance_weights(scores):
+    """Per-article weight: 0 below RELEVANCE_THRESHOLD, rising to 1 at FULL_RELEVANCE"""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.where(scores >= RELEVANCE_THRESHOLD, np.minimum(1.0, scores / FULL_RELEVANCE), 0.0)
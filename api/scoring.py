@@ -0,0 +1,330 @@
+# File: api/scoring.py
+"""Credibility scoring engine.
+
+Pure functions only - nothing here renders a page or calls an API, so the
+same scoring runs in the Streamlit app, the batch tools and offline re-scoring.
+
+Scoring input schema (one claim):
+
+    {
+        "pattern_suspicious_count": int,          # 0-4 flagged pattern checks
+        "ml_p_real": float | None,                # model P(real), None if the model was unavailable
+        "providers": {                            # one entry per news provider in NEWS_PROVIDERS
+            "newsapi": {"status": "found" | "not_found" | "error", "count": float},  # relevance-weighted distinct stories
+            ...
+        },
+        "distinct_stories": int,                  # optional: distinct relevant stories across all providers
+        "irrelevant_articles": int,               # optional: returned articles ignored as unrelated to the claim
+        "factcheck": {
+            "status": "found" | "not_found" | "error",
+            "disputed_claims": int,               # claims whose first review is rated false/misleading
+            "disputed_reviews": int,              # reviews across all claims rated false/misleading (for reasons)
+        },
+    }
+"""
+import numpy as np
+
+from api.articles import count_stories, group_stories, to_articles
+from api.relevance import relevance_scores, relevance_weights
+
+NEWS_PROVIDERS = ['newsapi', 'gnews', 'mediastack', 'newsdata', 'currents', 'rapidapi']
+
+MAX_SCORE = 10
+
+# Status codes used by the vectorized path
+STATUS_NOT_FOUND = 0
+STATUS_FOUND = 1
+STATUS_ERROR = 2
+STATUS_CODES = {'not_found': STATUS_NOT_FOUND, 'found': STATUS_FOUND, 'error': STATUS_ERROR}
+
+# Verdict bands by minimum credibility percentage, best first
+VERDICTS = ["LIKELY REAL", "POSSIBLY REAL", "SUSPICIOUS", "LIKELY FAKE"]
+VERDICT_THRESHOLDS = [55, 35, 20, 0]
+
+# Rating words that mark a fact-check as disputing the claim
+DISPUTED_SCORE_WORDS = ['false', 'fake', 'misleading', 'disputed', 'pants on fire']
+DISPUTED_REASON_WORDS = ['false', 'fake', 'misleading', 'disputed']
+
+def count_disputed_claims(claims):
+    """Claims whose first review rating disputes them (used for the score)"""
+    disputed = 0
+    for claim in claims:
+        reviews = claim.get('claimReview', [])
+        if reviews:
+            rating = reviews[0].get('textualRating', '').lower()
+            if any(word in rating for word in DISPUTED_SCORE_WORDS):
+                disputed += 1
+    return disputed
+
+def count_disputed_reviews(claims):
+    """Reviews across all claims that dispute them (used for the explanation)"""
+    return sum(1 for claim in claims
+               for review in claim.get('claimReview', [])
+               if any(word in review.get('textualRating', '').lower() for word in DISPUTED_REASON_WORDS))
+
+def build_scoring_input(checks_suspicious_count, api_results, ml_p_real=None, claim=None):
+    """Build the scoring input from the app's `api_results` dict.
+
+    Articles are counted as distinct stories: copies of one wire story (same
+    canonical URL or near-identical title) count once per provider and once
+    in `distinct_stories`. With `claim`, every article is also scored for
+    relevance to it; unrelated ones are ignored, partly related ones count
+    fractionally, and a provider that only returned unrelated articles is
+    treated as having found nothing.
+    """
+    factcheck = api_results['factcheck']
+    claims = factcheck.get('claims', [])
+    articles = {name: to_articles(api_results[name]['articles'], name) for name in NEWS_PROVIDERS}
+    everything = [article for name in NEWS_PROVIDERS for article in articles[name]]
+
+    # One vectorize call for all providers' articles together
+    weights = relevance_scores(claim, everything) if claim is not None else None
+    if weights is not None:
+        weights = relevance_weights(weights)
+
+    providers = {}
+    relevant_articles = []
+    offset = 0
+    for name in NEWS_PROVIDERS:
+        provider_articles = articles[name]
+        status = api_results[name]['status']
+        if weights is None:
+            relevant = provider_articles
+            count = count_stories(relevant)
+        else:
+            provider_weights = weights[offset:offset + len(provider_articles)]
+            offset += len(provider_articles)
+            weight_of = {id(article): weight for article, weight in zip(provider_articles, provider_weights)}
+            relevant = [article for article, weight in zip(provider_articles, provider_weights) if weight > 0]
+            # A story counts with the weight of its most relevant copy
+            count = 0.0
+            if relevant:
+                count = float(sum(max(weight_of[id(article)] for article in story) for story in group_stories(relevant)))
+            if status == 'found' and not relevant:
+                status = 'not_found'
+        providers[name] = {"status": status, "count": count}
+        relevant_articles.extend(relevant)
+
+    return {
+        "pattern_suspicious_count": checks_suspicious_count,
+        "ml_p_real": ml_p_real,
+        "providers": providers,
+        "distinct_stories": count_stories(relevant_articles),
+        "irrelevant_articles": len(everything) - len(relevant_articles),
+        "factcheck": {
+            "status": factcheck['status'],
+            "disputed_claims": count_disputed_claims(claims) if factcheck['status'] == 'found' else 0,
+            "disputed_reviews": count_disputed_reviews(claims) if factcheck['status'] == 'found' else 0,
+        },
+    }
+
+def inputs_to_arrays(inputs_list):
+    """Pack a list of scoring inputs into the arrays taken by score_batch()"""
+    n = len(inputs_list)
+    news_status = np.zeros((n, len(NEWS_PROVIDERS)), dtype=np.int8)
+    news_counts = np.zeros((n, len(NEWS_PROVIDERS)), dtype=np.float64)
+    for i, inputs in enumerate(inputs_list):
+        for j, name in enumerate(NEWS_PROVIDERS):
+            provider = inputs["providers"].get(name, {})
+            news_status[i, j] = STATUS_CODES.get(provider.get("status"), STATUS_NOT_FOUND)
+            news_counts[i, j] = provider.get("count", 0)
+    return {
+        "pattern_suspicious_count": np.array([inputs["pattern_suspicious_count"] for inputs in inputs_list], dtype=np.int64),
+        "ml_p_real": np.array([np.nan if inputs.get("ml_p_real") is None else inputs["ml_p_real"] for inputs in inputs_list], dtype=np.float64),
+        "news_status": news_status,
+        "news_counts": news_counts,
+        "factcheck_status": np.array([STATUS_CODES.get(inputs["factcheck"]["status"], STATUS_NOT_FOUND) for inputs in inputs_list], dtype=np.int8),
+        "disputed_claims": np.array([inputs["factcheck"].get("disputed_claims", 0) for inputs in inputs_list], dtype=np.int64),
+        "distinct_stories": np.array([inputs.get("distinct_stories", -1) for inputs in inputs_list], dtype=np.float64),
+    }
+
+def verdict_for_percentage(percentage):
+    """Verdict band for a credibility percentage"""
+    for verdict, threshold in zip(VERDICTS, VERDICT_THRESHOLDS):
+        if percentage >= threshold:
+            return verdict
+    return VERDICTS[-1]
+
+def score_batch(pattern_suspicious_count, news_status, news_counts, factcheck_status, disputed_claims, ml_p_real=None,
+                distinct_stories=None):
+    """Score many claims at once.
+
+    Every argument is an array with one row per claim; `news_status` and
+    `news_counts` are (n, len(NEWS_PROVIDERS)) and use the STATUS_* codes.
+    `ml_p_real` may be None or hold NaN for claims scored without the model.
+    `distinct_stories` (negative where unknown) replaces the per-provider sum
+    in total_articles_found, so one story syndicated across providers counts once.
+    Returns a dict of arrays: score, percentage, verdict_index (into VERDICTS),
+    total_articles_found, api_success_count and api_error_count.
+    """
+    pattern_suspicious_count = np.asarray(pattern_suspicious_count)
+    news_status = np.asarray(news_status)
+    news_counts = np.asarray(news_counts, dtype=np.float64)
+    factcheck_status = np.asarray(factcheck_status)
+    disputed_claims = np.asarray(disputed_claims)
+
+    # 1. Pattern Analysis (max 2 points)
+    score = np.select([pattern_suspicious_count == 0, pattern_suspicious_count == 1], [2.0, 1.0], 0.0)
+
+    # 2. ML model (between -1 and +1 point)
+    if ml_p_real is not None:
+        ml_p_real = np.asarray(ml_p_real, dtype=np.float64)
+        score += np.where(np.isnan(ml_p_real), 0.0, (ml_p_real - 0.5) * 2)
+
+    # 3. News APIs - progressive points per API based on number of articles
+    found = news_status == STATUS_FOUND
+    per_api = np.where(news_counts >= 5, 1.5, np.where(news_counts >= 2, 1.2, 0.8))
+    score += np.where(found, per_api, 0.0).sum(axis=1)
+    total_articles_found = np.where(found, news_counts, 0.0).sum(axis=1)
+    if distinct_stories is not None:
+        distinct_stories = np.asarray(distinct_stories, dtype=np.float64)
+        total_articles_found = np.where(distinct_stories >= 0, np.minimum(distinct_stories, total_articles_found), total_articles_found)
+    api_success_count = found.sum(axis=1).astype(np.float64)
+    api_error_count = (news_status == STATUS_ERROR).sum(axis=1).astype(np.float64)
+
+    # Fact-check results (can add or subtract points); counts as half an API
+    factcheck_found = factcheck_status == STATUS_FOUND
+    factcheck_error = factcheck_status == STATUS_ERROR
+    api_success_count += np.where(factcheck_found, 0.5, 0.0)
+    api_error_count += np.where(factcheck_error, 0.5, 0.0)
+    score += np.where(factcheck_found, np.where(disputed_claims > 0, -1.5, 0.5), np.where(factcheck_error, 0.0, 0.3))
+
+    # Positive bias when any API verifies the claim, growing with cross-verification
+    score += np.where(api_success_count >= 1, 2.0, 0.0)
+    score += np.where(api_success_count >= 2, 1.0, 0.0)
+    score += np.where(api_success_count >= 3, 0.5, 0.0)
+
+    # APIs being down doesn't mean the news is fake
+    score += np.where(api_error_count >= 3, 1.0, 0.0)
+
+    score = np.clip(score, 0, MAX_SCORE)
+    percentage = score / MAX_SCORE * 100
+
+    # VERDICT_THRESHOLDS is descending, so count the thresholds the percentage fails to reach
+    verdict_index = (percentage[:, None] < np.array(VERDICT_THRESHOLDS[:-1])[None, :]).sum(axis=1)
+
+    return {
+        "score": score,
+        "percentage": percentage,
+        "verdict_index": verdict_index,
+        "total_articles_found": total_articles_found,
+        "api_success_count": api_success_count,
+        "api_error_count": api_error_count,
+    }
+
+def score_credibility(inputs):
+    """Score one claim from a scoring input dict (see module docstring)"""
+    batch = score_batch(**inputs_to_arrays([inputs]))
+    return {
+        "score": float(batch["score"][0]),
+        "max_score": MAX_SCORE,
+        "percentage": float(batch["percentage"][0]),
+        "verdict": VERDICTS[int(batch["verdict_index"][0])],
+        "total_articles_found": int(batch["total_articles_found"][0]),
+        "api_success_count": float(batch["api_success_count"][0]),
+        "api_error_count": float(batch["api_error_count"][0]),
+        "pattern_suspicious_count": inputs["pattern_suspicious_count"],
+    }
+
+def percentage_bounds(inputs, pending):
+    """Lowest and highest credibility percentage still reachable while `pending` providers are outstanding.
+
+    Every outcome a pending provider can still have is considered: nothing
+    found, an error, or a find counting anywhere from one article to five or
+    more (Fact Check: disputed or not). Only how many pending providers land
+    in each outcome matters, so this scores at most a few hundred candidate
+    rows in one score_batch() call.
+    """
+    pending_news = [name for name in NEWS_PROVIDERS if name in pending]
+    base = inputs_to_arrays([inputs])
+    rows = []
+    for found in range(len(pending_news) + 1):
+        for errors in range(len(pending_news) - found + 1):
+            for count in (1, 5):  # lowest and highest per-API points for a find
+                status = base["news_status"][0].copy()
+                counts = base["news_counts"][0].copy()
+                for i, name in enumerate(pending_news):
+                    j = NEWS_PROVIDERS.index(name)
+                    status[j] = STATUS_FOUND if i < found else STATUS_ERROR if i < found + errors else STATUS_NOT_FOUND
+                    counts[j] = count if i < found else 0
+                rows.append((status, counts))
+
+    if 'factcheck' in pending:
+        factcheck_outcomes = [(STATUS_NOT_FOUND, 0), (STATUS_ERROR, 0), (STATUS_FOUND, 0), (STATUS_FOUND, 1)]
+    else:
+        factcheck_outcomes = [(int(base["factcheck_status"][0]), int(base["disputed_claims"][0]))]
+
+    n = len(rows) * len(factcheck_outcomes)
+    batch = score_batch(
+        pattern_suspicious_count=np.repeat(base["pattern_suspicious_count"], n),
+        news_status=np.array([status for status, _ in rows] * len(factcheck_outcomes)),
+        news_counts=np.array([counts for _, counts in rows] * len(factcheck_outcomes)),
+        factcheck_status=np.repeat([outcome[0] for outcome in factcheck_outcomes], len(rows)),
+        disputed_claims=np.repeat([outcome[1] for outcome in factcheck_outcomes], len(rows)),
+        ml_p_real=np.repeat(base["ml_p_real"], n),
+    )
+    return float(batch["percentage"].min()), float(batch["percentage"].max())
+
+def decided_verdict(inputs, pending):
+    """The final verdict if no outcome of the `pending` providers can change its band, else None"""
+    if not pending:
+        return score_credibility(inputs)["verdict"]
+    low, high = percentage_bounds(inputs, pending)
+    verdict = verdict_for_percentage(low)
+    return verdict if verdict_for_percentage(high) == verdict else None
+
+def explain_verdict(inputs, result):
+    """Human-readable reasons behind a verdict"""
+    pattern_suspicious_count = inputs["pattern_suspicious_count"]
+    ml_p_real = inputs.get("ml_p_real")
+    factcheck = inputs["factcheck"]
+    total_articles_found = result["total_articles_found"]
+    api_success_count = result["api_success_count"]
+    api_error_count = result["api_error_count"]
+    reasons = []
+
+    if result["verdict"] in ("LIKELY FAKE", "SUSPICIOUS"):
+        if pattern_suspicious_count >= 2:
+            reasons.append("🚩 Multiple suspicious text patterns detected")
+        if ml_p_real is not None and ml_p_real < 0.3:
+            reasons.append(f"🤖 ML model finds the language {1 - ml_p_real:.0%} likely to be fake news")
+        if total_articles_found == 0 and api_error_count < 3:
+            reasons.append("🔍 No matching articles found in credible news sources")
+        elif total_articles_found < 3 and api_error_count < 3:
+            reasons.append("📰 Limited verification from news sources")
+        if inputs.get("irrelevant_articles", 0) > 0 and total_articles_found < 3:
+            reasons.append(f"🎯 {inputs['irrelevant_articles']} returned articles were unrelated to the claim and ignored")
+        if factcheck["status"] == 'found' and factcheck.get("disputed_reviews", 0) > 0:
+            reasons.append(f"⚠️ {factcheck['disputed_reviews']} disputed claims found in fact-checking databases")
+        if api_success_count == 0 and api_error_count < 3:
+            reasons.append("❌ No verification from any external sources")
+        if api_error_count >= 3:
+            reasons.append("⚠️ Multiple verification services were unavailable - results may be incomplete")
+
+        if not reasons:
+            reasons.append("🤔 Mixed signals from various verification checks")
+    else:  # LIKELY REAL or POSSIBLY REAL
+        if pattern_suspicious_count == 0:
+            reasons.append("✅ Text patterns consistent with legitimate journalism")
+        if ml_p_real is not None and ml_p_real > 0.7:
+            reasons.append(f"🤖 ML model finds the language {ml_p_real:.0%} consistent with real news")
+        if total_articles_found >= 10:
+            reasons.append(f"📰 Strong verification with {total_articles_found} matching articles from multiple credible sources")
+        elif total_articles_found >= 5:
+            reasons.append(f"🌐 Good verification with {total_articles_found} matching articles found")
+        elif total_articles_found >= 1:
+            reasons.append(f"📋 Found {total_articles_found} matching articles in credible news sources")
+        if api_success_count >= 3:
+            reasons.append("🔄 Cross-verified by multiple independent news APIs")
+        elif api_success_count >= 2:
+            reasons.append("✓ Verified by multiple news sources")
+        elif api_success_count >= 1:
+            reasons.append("✓ Confirmed by at least one credible news source")
+        if factcheck["status"] == 'not_found':
+            reasons.append("🔍 No disputed claims found in fact-checking databases")
+        elif factcheck["status"] == 'found' and factcheck.get("disputed_reviews", 0) == 0:
+            reasons.append("✅ Related claims in fact-check database show no disputes")
+        if api_error_count >= 2:
+            reasons.append("ℹ️ Some verification services were unavailable, but available sources support authenticity")
+
+    return reasons
@@ -0,0 +1,300 @@
+# File: api/service.py
+"""Headless HTTP verification service.
+
+    uvicorn api.service:app --workers 4          # ASGI, one process per worker
+    python -m api.service --port 8000 --workers 4  # same, or stdlib server if uvicorn is missing
+    WORKER_PROCESSES=4 python -m api.service --stdlib   # pattern checks and model in 4 worker processes
+
+Endpoints:
+    GET  /health                 -> {"status": "ok", "model": {...}, "quota": {...}, "providers": {...}}
+    GET  /metrics                -> counters and latency histograms in the Prometheus text format
+    POST /verify                 {"text": "...", "budget": 8, "reuse": true}
+    POST /verify/batch           {"items": [{"id": "a", "text": "..."}, ...], "budget": 8, "reuse": true}
+
+Both verify endpoints return the verify_claim() report, including per-stage
+timings. Near-duplicates of recently verified claims reuse their provider
+results (the report's `reused` field says so); send "reuse": false to search
+again. Pass `providers` to create_app() to run the service against stubs.
+
+The ASGI app searches providers with the async httpx backend on its event
+loop, so a claim in flight holds no thread; the stdlib server verifies on
+threads with the sync backend.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from api.breaker import breaker_status
+from api.metrics import prometheus_text
+from api.model_utils import get_pipeline, model_info
+from api.quota import quota_status
+from api.verifier import DEFAULT_BUDGET, PROVIDERS, check_claims, verify_claim, verify_claim_async
+from api.workers import WORKER_PROCESSES, worker_pool
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_ITEMS = int(os.getenv("SERVICE_MAX_BATCH_ITEMS", "100"))
+# Claims from one batch request verified at the same time
+BATCH_CONCURRENCY = int(os.getenv("SERVICE_BATCH_CONCURRENCY", "8"))
+
+class RequestError(Exception):
+    """Client error turned into a 4xx JSON response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _parse_budget(payload):
+    budget = payload.get("budget", DEFAULT_BUDGET)
+    if isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0:
+        raise RequestError(400, "budget must be a positive number of seconds")
+    return float(budget)
+
+def _parse_reuse(payload):
+    reuse = payload.get("reuse", True)
+    if not isinstance(reuse, bool):
+        raise RequestError(400, "reuse must be true or false")
+    return reuse
+
+def _parse_text(value):
+    if not isinstance(value, str) or not value.strip():
+        raise RequestError(400, "text must be a non-empty string")
+    return value
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def encode_payload(payload):
+    """(content type, body bytes) for a handler payload: text as is, anything else as JSON"""
+    if isinstance(payload, str):
+        return PROMETHEUS_CONTENT_TYPE, payload.encode("utf-8")
+    return "application/json", json.dumps(payload).encode("utf-8")
+
+def _route(method, path, body, providers=None):
+    """(status, payload) for the GET routes, or (None, job) for a verify request.
+
+    A job is a dict of the claim `texts`, their batch `ids` (None for /verify),
+    `budget` and `reuse`.
+    """
+    path = path.rstrip("/") or "/"
+    if path == "/health":
+        if method != "GET":
+            raise RequestError(405, "use GET")
+        return 200, {"status": "ok", "model": model_info(), "quota": quota_status(list(providers or PROVIDERS)),
+                     "providers": breaker_status()}
+    if path == "/metrics":
+        if method != "GET":
+            raise RequestError(405, "use GET")
+        return 200, prometheus_text()
+
+    if path not in ("/verify", "/verify/batch"):
+        raise RequestError(404, f"no route for {path}")
+    if method != "POST":
+        raise RequestError(405, "use POST")
+
+    try:
+        payload = json.loads(body or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise RequestError(400, "body must be JSON")
+    if not isinstance(payload, dict):
+        raise RequestError(400, "body must be a JSON object")
+    job = {"budget": _parse_budget(payload), "reuse": _parse_reuse(payload)}
+
+    if path == "/verify":
+        return None, {**job, "texts": [_parse_text(payload.get("text"))], "ids": None}
+
+    items = payload.get("items")
+    if not isinstance(items, list) or not items:
+        raise RequestError(400, "items must be a non-empty list")
+    if len(items) > MAX_BATCH_ITEMS:
+        raise RequestError(413, f"at most {MAX_BATCH_ITEMS} items per batch")
+    texts = [_parse_text(item.get("text") if isinstance(item, dict) else item) for item in items]
+    ids = [item.get("id", i) if isinstance(item, dict) else i for i, item in enumerate(items)]
+    return None, {**job, "texts": texts, "ids": ids}
+
+def _check(texts, workers=None):
+    """check_claims() for a request's claims, in the worker processes when there are any"""
+    if not workers:
+        return check_claims(texts)
+    if len(texts) == 1:
+        return workers.run(check_claims, texts)
+    # One chunk per worker process, so the whole batch is checked in a single round trip
+    return list(workers.map_chunks(check_claims, texts, -(-len(texts) // workers.processes)))
+
+def _response(job, reports):
+    if job["ids"] is None:
+        return 200, reports[0]
+    return 200, {"results": [{"id": item_id, **report} for item_id, report in zip(job["ids"], reports)]}
+
+def handle_request(method, path, body, providers=None, pool=None, workers=None):
+    """Route one request on the calling thread; returns (status, payload). Used by the stdlib server.
+
+    `pool` runs a batch's verifications on threads; `workers` is an optional
+    WorkerPool running the pattern checks and model in other processes.
+    """
+    status, job = _route(method, path, body, providers)
+    if status is not None:
+        return status, job
+
+    checked = _check(job["texts"], workers)
+    # Each claim already fans out to every provider, so only a few claims run at once
+    reports = list((pool.map if pool else map)(
+        lambda item: verify_claim(item[0], budget=job["budget"], providers=providers, reuse=job["reuse"],
+                                  checked=item[1]),
+        zip(job["texts"], checked)))
+    return _response(job, reports)
+
+async def handle_request_async(method, path, body, providers=None, workers=None):
+    """handle_request() for the ASGI app: provider searches run on the event loop with the async backend.
+
+    Parsing, the pattern checks and the model are CPU-bound and run in the
+    default executor (or `workers`); a batch's claims are verified with
+    asyncio.gather, BATCH_CONCURRENCY at a time.
+    """
+    loop = asyncio.get_running_loop()
+    status, job = await loop.run_in_executor(None, _route, method, path, body, providers)
+    if status is not None:
+        return status, job
+
+    checked = await loop.run_in_executor(None, _check, job["texts"], workers)
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def verify(text, claim_checked):
+        async with limit:
+            return await verify_claim_async(text, budget=job["budget"], providers=providers, reuse=job["reuse"],
+                                            checked=claim_checked)
+
+    reports = await asyncio.gather(*(verify(text, claim_checked) for text, claim_checked in zip(job["texts"], checked)))
+    return _response(job, reports)
+
+def create_app(providers=None, processes=WORKER_PROCESSES):
+    """ASGI application; `providers` overrides the provider table (e.g. with stubs).
+
+    Verifications run on the event loop with the async provider backend
+    (verify_claim_async). The `processes`-sized worker pool is started on
+    lifespan startup, so importing this module starts no processes.
+    """
+    state = {"workers": None}
+
+    async def send_json(send, status, payload):
+        content_type, body = encode_payload(payload)
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    # Load the model before taking traffic so the first request isn't slow
+                    await asyncio.get_running_loop().run_in_executor(None, get_pipeline)
+                    state["workers"] = worker_pool(processes)
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    if state["workers"]:
+                        state["workers"].close()
+                        state["workers"] = None
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY_BYTES:
+                await send_json(send, 413, {"error": "request body too large"})
+                return
+            if not message.get("more_body"):
+                break
+
+        try:
+            status, payload = await handle_request_async(scope["method"], scope["path"], body, providers,
+                                                         state["workers"])
+        except RequestError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:
+            print(f"Service error on {scope['path']}: {e}", file=sys.stderr)
+            status, payload = 500, {"error": "internal error"}
+        await send_json(send, status, payload)
+
+    return app
+
+app = create_app()
+
+def make_stdlib_server(host="127.0.0.1", port=8000, providers=None, workers=None):
+    """Threaded stdlib HTTP server exposing the same routes (no uvicorn needed)"""
+    pool = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix="verify")
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, method):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                if length > MAX_BODY_BYTES:
+                    raise RequestError(413, "request body too large")
+                body = self.rfile.read(length) if length else b""
+                status, payload = handle_request(method, self.path, body, providers, pool, workers)
+            except RequestError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                print(f"Service error on {self.path}: {e}", file=sys.stderr)
+                status, payload = 500, {"error": "internal error"}
+            content_type, data = encode_payload(payload)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond("GET")
+
+        def do_POST(self):
+            self._respond("POST")
+
+        def log_message(self, format, *args):
+            print(f"{self.address_string()} - {format % args}", file=sys.stderr)
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the fake news verification HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (uvicorn only)")
+    parser.add_argument("--stdlib", action="store_true", help="use the stdlib threaded server instead of uvicorn")
+    args = parser.parse_args(argv)
+
+    if not args.stdlib:
+        try:
+            import uvicorn
+        except ImportError:
+            print("uvicorn not installed - falling back to the stdlib server", file=sys.stderr)
+        else:
+            uvicorn.run("api.service:app", host=args.host, port=args.port, workers=args.workers)
+            return 0
+
+    get_pipeline()
+    workers = worker_pool(WORKER_PROCESSES)
+    server = make_stdlib_server(args.host, args.port, workers=workers)
+    print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if workers:
+            workers.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+# File: api/verifier.py
+import asyncio
+import contextvars
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+
+from api.claim_index import find_similar_claim, remember_claim, reuse_info, transient_failure
+from api.deadline import Deadline, TIMED_OUT_ERROR
+from api.metrics import count, span
+from api.model_utils import classify, classify_many
+from api.patterns import pattern_report, suspicious_count
+from api.providers import PROVIDER_SEARCHES, PROVIDER_SEARCHES_ASYNC, normalize_result, spec_result_key
+from api.scoring import build_scoring_input, score_credibility, explain_verdict, decided_verdict
+
+# Overall time budget for one verification across all providers (seconds)
+DEFAULT_BUDGET = float(os.getenv("VERIFY_BUDGET_SECONDS", "8"))
+
+# Stop waiting for slow providers once they can no longer change the verdict band
+EARLY_VERDICT = os.getenv("EARLY_VERDICT", "on").lower() not in ("off", "0", "false")
+
+# Provider name -> search function, in display order (see api/providers.py)
+PROVIDERS = PROVIDER_SEARCHES
+# Provider name -> coroutine search function, for the *_async entry points
+PROVIDERS_ASYNC = PROVIDER_SEARCHES_ASYNC
+
+# Tasks still running after their stream was closed, kept alive so they can finish filling the cache
+_background_tasks = set()
+
+def result_key(provider):
+    """Key holding the result list for a provider ('claims' for Fact Check, 'articles' otherwise)"""
+    return spec_result_key(provider)
+
+def result_status(provider, result):
+    """'error', 'found' or 'not_found' for one provider result"""
+    if result.get('skipped'):
+        return 'skipped'
+    if result.get('error'):
+        return 'error'
+    return 'found' if result.get(result_key(provider)) else 'not_found'
+
+def to_api_results(results):
+    """Turn raw provider results into the `api_results` shape used for scoring"""
+    return {
+        name: {
+            result_key(name): result.get(result_key(name), []),
+            'status': result_status(name, result),
+            'error': result.get('error'),
+        }
+        for name, result in results.items()
+    }
+
+def skipped_result(provider):
+    """Result reported for a provider left unread because the verdict was already decided"""
+    return {"error": None, result_key(provider): [], "skipped": True}
+
+def partial_api_results(results, providers):
+    """`api_results` for the providers that answered, with the rest marked 'pending'"""
+    api_results = to_api_results(results)
+    for name in providers:
+        if name not in api_results:
+            api_results[name] = {result_key(name): [], 'status': 'pending', 'error': None}
+    return api_results
+
+def timed_out_result(provider):
+    """Result reported for a provider that was still running when the deadline passed"""
+    return {"error": TIMED_OUT_ERROR, result_key(provider): []}
+
+def stream_results(query, providers=None, budget=DEFAULT_BUDGET):
+    """Query every provider at the same time and yield (name, result) in completion order.
+
+    Each result is yielded as soon as its provider answers, so a consumer can
+    render the fastest provider without waiting for the slowest. All providers
+    share one `Deadline` of `budget` seconds: their retries only use the time
+    left, and any provider still running when it expires is cancelled and
+    yielded last as timed out. Closing the generator early cancels whatever
+    has not finished yet.
+    """
+    providers = providers or PROVIDERS
+    deadline = Deadline(budget)
+    done = set()
+
+    pool = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="provider")
+    try:
+        # Searches run in a copy of this context so their spans join the caller's trace
+        futures = {pool.submit(contextvars.copy_context().run, search, query, deadline): name
+                   for name, search in providers.items()}
+
+        try:
+            for future in as_completed(futures, timeout=deadline.remaining()):
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"{name} search failed: {e}")
+                    result = {"error": f"Unexpected error - {e}", result_key(name): []}
+
+                done.add(name)
+                # Stub providers and older cache entries may still hand back raw payloads
+                yield name, normalize_result(name, result)
+        except FuturesTimeoutError:
+            pass
+
+        # Anything still outstanding missed the deadline
+        for future, name in futures.items():
+            if name not in done:
+                future.cancel()
+                print(f"{name} cancelled after {budget}s verification budget")
+                done.add(name)
+                yield name, timed_out_result(name)
+    finally:
+        # Don't block on stragglers - their own request timeouts are capped by the deadline
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def verify_all(query, on_result=None, providers=None, budget=DEFAULT_BUDGET):
+    """Collect every provider's result from stream_results() into a dict.
+
+    `on_result(name, result)` is called from the calling thread as each provider
+    finishes, in completion order. Total latency is bounded by the budget.
+    """
+    results = {}
+    for name, result in stream_results(query, providers, budget):
+        results[name] = result
+        if on_result:
+            on_result(name, result)
+    return results
+
+def verify_until_decided(query, score_inputs, on_result=None, providers=None, budget=DEFAULT_BUDGET):
+    """Like verify_all(), but stop as soon as the outstanding providers cannot change the verdict band.
+
+    `score_inputs(results)` builds the scoring input from the results so far.
+    After every answer, decided_verdict() checks the best and worst outcome of
+    the providers still pending. Once both give the same band, the stream is
+    closed and the rest are reported as skipped. Requests already in flight
+    finish in the background and still fill the provider cache.
+    """
+    providers = providers or PROVIDERS
+    results = {}
+    stream = stream_results(query, providers, budget)
+    try:
+        for name, result in stream:
+            results[name] = result
+            if on_result:
+                on_result(name, result)
+            pending = [name for name in providers if name not in results]
+            if pending and decided_verdict(score_inputs(results), pending):
+                print(f"Verdict decided with {len(pending)} providers still pending - skipping {', '.join(pending)}")
+                break
+    finally:
+        stream.close()
+
+    for name in providers:
+        if name not in results:
+            results[name] = skipped_result(name)
+            if on_result:
+                on_result(name, results[name])
+    return results
+
+async def _call_search(search, query, deadline):
+    """Await a coroutine search, or run a plain one (e.g. a stub) in a worker thread"""
+    if inspect.iscoroutinefunction(search):
+        return await search(query, deadline)
+    return await asyncio.to_thread(search, query, deadline)
+
+async def stream_results_async(query, providers=None, budget=DEFAULT_BUDGET):
+    """Async generator version of stream_results(), with one task per provider on the running loop.
+
+    `providers` may mix coroutine and plain search functions. Closing the
+    stream early leaves in-flight searches running so they still fill the
+    cache; searches still running at the deadline are cancelled.
+    """
+    providers = providers or PROVIDERS_ASYNC
+    deadline = Deadline(budget)
+    tasks = {asyncio.ensure_future(_call_search(search, query, deadline)): name for name, search in providers.items()}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=deadline.remaining(),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                name = tasks[task]
+                try:
+                    result = task.result()
+                except Exception as e:
+                    print(f"{name} search failed: {e}")
+                    result = {"error": f"Unexpected error - {e}", result_key(name): []}
+                yield name, normalize_result(name, result)
+
+        # Anything still outstanding missed the deadline
+        for task in list(pending):
+            task.cancel()
+            pending.discard(task)
+            print(f"{tasks[task]} cancelled after {budget}s verification budget")
+            yield tasks[task], timed_out_result(tasks[task])
+    finally:
+        for task in pending:
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
+async def verify_all_async(query, on_result=None, providers=None, budget=DEFAULT_BUDGET):
+    """verify_all() on the running event loop"""
+    results = {}
+    async for name, result in stream_results_async(query, providers, budget):
+        results[name] = result
+        if on_result:
+            on_result(name, result)
+    return results
+
+async def verify_until_decided_async(query, score_inputs, on_result=None, providers=None, budget=DEFAULT_BUDGET):
+    """verify_until_decided() on the running event loop"""
+    providers = providers or PROVIDERS_ASYNC
+    results = {}
+    stream = stream_results_async(query, providers, budget)
+    try:
+        async for name, result in stream:
+            results[name] = result
+            if on_result:
+                on_result(name, result)
+            pending = [name for name in providers if name not in results]
+            if pending and decided_verdict(score_inputs(results), pending):
+                print(f"Verdict decided with {len(pending)} providers still pending - skipping {', '.join(pending)}")
+                break
+    finally:
+        await stream.aclose()
+
+    for name in providers:
+        if name not in results:
+            results[name] = skipped_result(name)
+            if on_result:
+                on_result(name, results[name])
+    return results
+
+def _elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+def _check_text(text, timings):
+    """Pattern checks and the ML model for a claim: (pattern_results, checks, model_result)"""
+    with span("patterns") as stage:
+        pattern_results = pattern_report(text)
+        checks = {category: entry['status'] for category, entry in pattern_results.items()}
+    timings['patterns_ms'] = stage.ms
+
+    with span("model") as stage:
+        try:
+            model_result = classify(text)
+        except Exception as e:
+            print(f"Model unavailable: {e}")
+            model_result = None
+    timings['model_ms'] = stage.ms
+    return pattern_results, checks, model_result
+
+def check_claims(texts):
+    """_check_text() for many claims, with one batched model call: (pattern_results, checks, model_result, timings) each.
+
+    Runs in worker processes (api/workers.py) to take these CPU-bound stages off the service's GIL.
+    """
+    start = time.perf_counter()
+    pattern_results = [pattern_report(text) for text in texts]
+    patterns_ms = _elapsed_ms(start) / max(1, len(texts))
+    try:
+        model_results = classify_many(texts)
+    except Exception as e:
+        print(f"Model unavailable: {e}")
+        model_results = [None] * len(texts)
+    checked = []
+    for results, model_result in zip(pattern_results, model_results):
+        checks = {category: entry['status'] for category, entry in results.items()}
+        timings = {'patterns_ms': round(patterns_ms, 2),
+                   'model_ms': round(model_result['latency_ms'], 2) if model_result else 0.0}
+        checked.append((results, checks, model_result, timings))
+    return checked
+
+def _build_report(text, pattern_results, checks, model_result, results, providers, timings, start):
+    """Score the provider results and assemble the verify_claim() report"""
+    with span("scoring") as stage:
+        api_results = to_api_results(results)
+        ml_p_real = model_result['p_real'] if model_result else None
+        scoring_input = build_scoring_input(suspicious_count(checks), api_results, ml_p_real, claim=text)
+        scoring = score_credibility(scoring_input)
+        reasons = explain_verdict(scoring_input, scoring)
+    timings['scoring_ms'] = stage.ms
+    timings['total_ms'] = _elapsed_ms(start)
+    count("verifications_total", verdict=scoring['verdict'])
+
+    return {
+        'verdict': scoring['verdict'],
+        'score': round(scoring['score'], 3),
+        'max_score': scoring['max_score'],
+        'percentage': round(scoring['percentage'], 1),
+        'reasons': reasons,
+        'pattern_checks': checks,
+        'pattern_hits': {category: entry['hits'] for category, entry in pattern_results.items() if entry['hits']},
+        'model': model_result,
+        'providers': {
+            name: {
+                'status': api_results[name]['status'],
+                'count': len(api_results[name][result_key(name)]),
+                'error': api_results[name]['error'],
+            }
+            for name in providers
+        },
+        'scoring': scoring,
+        # Providers not waited for because the verdict band was already decided;
+        # the score counts them as having found nothing
+        'skipped_providers': [name for name in providers if api_results[name]['status'] == 'skipped'],
+        'timings': timings,
+        # Set when the provider results were reused from a recently verified near-identical claim
+        'reused': None,
+    }
+
+def reusable_claim(text, providers=None):
+    """A recent near-duplicate of the claim with a stored result for every provider, or None"""
+    providers = providers or PROVIDERS
+    with span("claim_index") as stage:
+        match = find_similar_claim(text)
+        if match is not None and any(name not in match['results'] or transient_failure(match['results'][name])
+                                     for name in providers):
+            match = None
+        stage.set(reused=match is not None)
+    return match
+
+def reused_results(match, providers, score_inputs):
+    """(results, missing) for a claim answered from the index.
+
+    The stored claim's skipped providers were skipped for its own verdict.
+    While they could still change this claim's verdict (scored with
+    `score_inputs`), they are left out of `results` and listed in `missing`
+    to be searched again; otherwise they stay skipped.
+    """
+    results = {name: match['results'][name] for name in providers}
+    skipped = [name for name, result in results.items() if result.get('skipped')]
+    answered = {name: result for name, result in results.items() if not result.get('skipped')}
+    if skipped and decided_verdict(score_inputs(answered), skipped) is None:
+        return answered, skipped
+    return results, []
+
+def _scoring_inputs(text, checks, model_result, providers):
+    """score_inputs(results) for the early verdict: the claim's scoring input with unanswered providers pending"""
+    ml_p_real = model_result['p_real'] if model_result else None
+
+    def score_inputs(results):
+        return build_scoring_input(suspicious_count(checks), partial_api_results(results, providers), ml_p_real,
+                                   claim=text)
+    return score_inputs
+
+def _finish_report(text, match, pattern_results, checks, model_result, results, providers, timings, start):
+    """Build the report; fresh results are indexed, reused ones say where they came from"""
+    report = _build_report(text, pattern_results, checks, model_result, results, providers, timings, start)
+    if match is None:
+        remember_claim(text, report['verdict'], results)
+    else:
+        count("claims_reused_total")
+        report['reused'] = reuse_info(match)
+    return report
+
+def verify_claim(text, budget=DEFAULT_BUDGET, providers=None, reuse=True, checked=None):
+    """Run the whole Analyze pipeline headlessly and return a JSON-serialisable report.
+
+    Stages are pattern checks, the ML model, the provider fan-out and scoring;
+    each one is timed, and every provider reports how long it took to answer.
+    `providers` overrides the provider table (used to run against stubs).
+    A claim close to one verified in the last CLAIM_REUSE_MAX_AGE seconds is
+    scored against that claim's provider results instead of searching again,
+    and its report's `reused` field says which claim and how old they are;
+    only providers the earlier claim skipped and this one's verdict still
+    depends on are searched. Pass reuse=False to always search. `checked` is
+    the claim's check_claims() entry when its pattern checks and model
+    already ran in a worker process.
+    """
+    providers = providers or PROVIDERS
+    timings = {}
+    start = time.perf_counter()
+    with span("verification", budget=budget):
+        if checked is not None:
+            pattern_results, checks, model_result, stage_timings = checked
+            timings.update(stage_timings)
+        else:
+            pattern_results, checks, model_result = _check_text(text, timings)
+        score_inputs = _scoring_inputs(text, checks, model_result, providers)
+        match = reusable_claim(text, providers) if reuse else None
+        results, missing = reused_results(match, providers, score_inputs) if match is not None else ({}, list(providers))
+
+        provider_ms = {}
+
+        def record_time(name, result):
+            # Providers skipped by the early verdict did no work, so they get no timing
+            if not result.get('skipped'):
+                provider_ms.setdefault(name, _elapsed_ms(stage_start))
+
+        def search_inputs(found):
+            # Fresh results are scored together with any reused ones
+            return score_inputs({**results, **found})
+
+        timings['providers_ms'] = 0.0
+        if missing:
+            searches = {name: providers[name] for name in missing}
+            with span("providers") as stage:
+                stage_start = time.perf_counter()
+                if EARLY_VERDICT:
+                    found = verify_until_decided(text, search_inputs, on_result=record_time, providers=searches,
+                                                 budget=budget)
+                else:
+                    found = verify_all(text, on_result=record_time, providers=searches, budget=budget)
+            results.update(found)
+            timings['providers_ms'] = stage.ms
+        timings['provider_ms'] = provider_ms
+        return _finish_report(text, match, pattern_results, checks, model_result, results, providers, timings, start)
+
+async def verify_claim_async(text, budget=DEFAULT_BUDGET, providers=None, reuse=True, checked=None):
+    """verify_claim() on the running event loop, searching providers with the async backend"""
+    providers = providers or PROVIDERS_ASYNC
+    timings = {}
+    start = time.perf_counter()
+    with span("verification", budget=budget):
+        if checked is not None:
+            pattern_results, checks, model_result, stage_timings = checked
+            timings.update(stage_timings)
+        else:
+            pattern_results, checks, model_result = _check_text(text, timings)
+        score_inputs = _scoring_inputs(text, checks, model_result, providers)
+        match = reusable_claim(text, providers) if reuse else None
+        results, missing = reused_results(match, providers, score_inputs) if match is not None else ({}, list(providers))
+
+        provider_ms = {}
+
+        def record_time(name, result):
+            # Providers skipped by the early verdict did no work, so they get no timing
+            if not result.get('skipped'):
+                provider_ms.setdefault(name, _elapsed_ms(stage_start))
+
+        def search_inputs(found):
+            # Fresh results are scored together with any reused ones
+            return score_inputs({**results, **found})
+
+        timings['providers_ms'] = 0.0
+        if missing:
+            searches = {name: providers[name] for name in missing}
+            with span("providers") as stage:
+                stage_start = time.perf_counter()
+                if EARLY_VERDICT:
+                    found = await verify_until_decided_async(text, search_inputs, on_result=record_time,
+                                                             providers=searches, budget=budget)
+                else:
+                    found = await verify_all_async(text, on_result=record_time, providers=searches, budget=budget)
+            results.update(found)
+            timings['providers_ms'] = stage.ms
+        timings['provider_ms'] = provider_ms
+        return _finish_report(text, match, pattern_results, checks, model_result, results, providers, timings, start)
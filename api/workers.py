@@ -0,0 +1,83 @@
+# File: api/workers.py
+"""Process pool for the CPU-bound stages: pattern checks, vectorizing and the model.
+
+    with WorkerPool(4) as pool:
+        for result in pool.map_chunks(score_texts, texts, chunk_size=2000):
+            ...
+
+Each worker process loads the model once, in its initializer; with the
+memory-mapped artefact (api/compact_model.py) that takes milliseconds and
+every worker shares the same pages. Work is shipped in chunks so one round
+trip of pickling covers many texts, only a few chunks per worker are in
+flight at once so memory stays flat on unbounded input, and results come
+back in input order. Provider searches are I/O-bound and stay on threads in
+the parent process.
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Worker processes for batch scoring and the service; 0 runs everything in-process
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "0"))
+# Chunks queued per worker, so the next one is ready as soon as a worker is free
+CHUNKS_PER_WORKER = 2
+
+def default_processes():
+    """One worker per CPU core"""
+    return os.cpu_count() or 1
+
+def _init_worker():
+    from api.model_utils import get_pipeline
+    from api.patterns import get_engine
+
+    get_pipeline()
+    get_engine()
+
+def _chunks(items, chunk_size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+class WorkerPool:
+    """Process pool running module-level `fn(list) -> list` functions over chunks of input"""
+
+    def __init__(self, processes=None):
+        self.processes = processes or default_processes()
+        # Spawned workers start clean instead of inheriting the parent's threads and open connections
+        self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker)
+
+    def map_chunks(self, fn, items, chunk_size=256):
+        """Yield fn's result for every item, in input order; `fn` takes and returns a list"""
+        in_flight = deque()
+        for chunk in _chunks(items, chunk_size):
+            in_flight.append(self._executor.submit(fn, chunk))
+            if len(in_flight) >= self.processes * CHUNKS_PER_WORKER:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+    def run(self, fn, items):
+        """fn(items) in one worker, for a single request's worth of work"""
+        return self._executor.submit(fn, list(items)).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def worker_pool(processes=WORKER_PROCESSES):
+    """WorkerPool with `processes` workers (-1 = one per core), or None to work in-process"""
+    if processes == 0:
+        return None
+    return WorkerPool(None if processes < 0 else processes)
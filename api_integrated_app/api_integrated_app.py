@@ -1,18 +1,43 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from api.api_utils import search_newsapi_articles, search_gnews_articles, search_factcheck, search_mediastack, search_newsdata_io, search_currents_api, search_rapidapi_news
+from api.verifier import EARLY_VERDICT, PROVIDERS, partial_api_results, stream_results, verify_until_decided, result_key, result_status, reusable_claim, reused_results
+from api.providers import PROVIDER_SPECS
+from api.breaker import breaker_status
+from api.cache import cache_stats
+from api.claim_index import format_age, remember_claim
+from api.metrics import metrics_snapshot, new_trace, span
+from api.quota import quota_status
+from api.model_utils import get_pipeline, classify
+from api.patterns import pattern_report, suspicious_count
+from api.scoring import build_scoring_input, score_credibility, explain_verdict
 import streamlit as st
-import pickle
 import time
 
-# Load model
-model_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "model", "fake_news_model.pkl"))
-try:
-    with open(model_path, "rb") as f:
-        model = pickle.load(f)
-except:
-    model = None  # Handle case where model doesn't exist
+# Load model - cached as a resource so it is unpickled once per process, not on every rerun
+@st.cache_resource(show_spinner="Loading fake news model...")
+def load_model():
+    try:
+        return get_pipeline()
+    except Exception as e:
+        print(f"Model unavailable: {e}")
+        return None  # Handle case where model doesn't exist
+
+# Pauses (seconds) shown between steps in Guided mode; Fast mode renders results as soon as they exist
+GUIDED_DELAYS = {
+    "intro": 0.8,
+    "pattern_check": 0.5,
+}
+PRESENTATION_MODES = ["Fast", "Guided"]
+
+# Verdict -> (CSS class, icon); POSSIBLY REAL is shown green rather than red
+VERDICT_STYLES = {
+    "LIKELY REAL": ("verdict-real", "✅"),
+    "POSSIBLY REAL": ("verdict-real", "✅"),
+    "SUSPICIOUS": ("verdict-fake", "⚠️"),
+    "LIKELY FAKE": ("verdict-fake", "❌"),
+}
+DEFAULT_PRESENTATION_MODE = os.getenv("PRESENTATION_MODE", "Fast").title()
 
 st.set_page_config(page_title="\U0001F4F0 Fake News Detector", layout="centered", page_icon="\U0001F9E0")
 
@@ -277,470 +302,236 @@ st.markdown("""
 
 news_text = st.text_area("Enter News Text:", height=120, label_visibility="collapsed")
 
+presentation_mode = st.sidebar.radio(
+    "Presentation mode",
+    PRESENTATION_MODES,
+    index=PRESENTATION_MODES.index(DEFAULT_PRESENTATION_MODE) if DEFAULT_PRESENTATION_MODE in PRESENTATION_MODES else 0,
+    help="Fast shows each result as soon as it is ready. Guided adds short pauses between steps.",
+)
+
+def presentation_pause(step, message):
+    """Show a spinner for a Guided-mode pause and return the seconds spent waiting (0 in Fast mode)"""
+    if presentation_mode != "Guided":
+        return 0.0
+    start = time.perf_counter()
+    with st.spinner(message):
+        time.sleep(GUIDED_DELAYS[step])
+    return time.perf_counter() - start
+
 # --- Analyze Button ---
 if st.button("\U0001F50D Analyze") and news_text.strip():
-    with st.spinner("Analyzing text and running credibility checks..."):
-        time.sleep(0.8)
+    analysis_start = time.perf_counter()
+    new_trace()
+    artificial_wait = presentation_pause("intro", "Analyzing text and running credibility checks...")
 
     st.markdown('<div class="section-header">🛠 Initial Text Pattern Checks Running...</div>', unsafe_allow_html=True)
 
     # Basic pattern checks - Updated for better accuracy with real news
-    checks = {
-        "Sensational phrasing": "suspicious" if any(word in news_text.lower() for word in ["shocking", "unbelievable", "terrifying", "must see", "doctors hate this", "you won't believe"]) else "normal",
-        "Punctuation patterns": "suspicious" if "!!!" in news_text or "???" in news_text or news_text.count("!") > 5 else "normal",
-        "Buzzwords": "suspicious" if any(word in news_text.lower() for word in ["hoax", "conspiracy", "cover-up", "fake news", "mainstream media lies", "wake up sheeple"]) else "normal",
-        "ALL CAPS abuse": "suspicious" if sum(1 for word in news_text.split() if word.isupper() and len(word) > 3) > 3 else "normal"
-    }
+    with span("patterns"):
+        pattern_results = pattern_report(news_text)
+    checks = {category: entry['status'] for category, entry in pattern_results.items()}
 
     for category, status in checks.items():
-        with st.spinner(f"Analyzing {category}..."):
-            time.sleep(0.5)
+        artificial_wait += presentation_pause("pattern_check", f"Analyzing {category}...")
         if status == "suspicious":
-            st.markdown(f'<div class="check-box check-suspicious">❗ <strong>{category}</strong> indicates unusual or fake-like patterns</div>', unsafe_allow_html=True)
+            matched = sorted({hit['phrase'] for hit in pattern_results[category]['hits']})
+            matched_text = f" ({', '.join(matched)})" if matched else ""
+            st.markdown(f'<div class="check-box check-suspicious">❗ <strong>{category}</strong> indicates unusual or fake-like patterns{matched_text}</div>', unsafe_allow_html=True)
         else:
             st.markdown(f'<div class="check-box check-normal">✅ <strong>{category}</strong> appears natural</div>', unsafe_allow_html=True)
 
+    # ML model check on the language of the article itself
+    model_result = None
+    if load_model() is not None:
+        with span("model"):
+            model_result = classify(news_text)
+        if model_result['label'] == 'REAL':
+            st.markdown(f'<div class="check-box check-normal">🤖 <strong>ML model</strong> rates the language as {model_result["p_real"]:.0%} likely real</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="check-box check-suspicious">🤖 <strong>ML model</strong> rates the language as {1 - model_result["p_real"]:.0%} likely fake</div>', unsafe_allow_html=True)
+    else:
+        st.markdown('<div class="check-box api-error">🤖 <strong>ML model</strong> is unavailable - skipping language analysis</div>', unsafe_allow_html=True)
+
     st.markdown("---")
 
     # API Analysis Section
     st.markdown('<div class="section-header">🔍 Cross-Verification with External APIs</div>', unsafe_allow_html=True)
     
-    # Initialize API results for all 7 APIs (including RapidAPI)
+    # One entry per registered provider (the 7 built-in APIs plus any added with register_provider())
     api_results = {
-        'newsapi': {'articles': [], 'status': 'checking', 'error': None},
-        'gnews': {'articles': [], 'status': 'checking', 'error': None},
-        'factcheck': {'claims': [], 'status': 'checking', 'error': None},
-        'mediastack': {'articles': [], 'status': 'checking', 'error': None},
-        'newsdata': {'articles': [], 'status': 'checking', 'error': None},
-        'currents': {'articles': [], 'status': 'checking', 'error': None},
-        'rapidapi': {'articles': [], 'status': 'checking', 'error': None}
+        api_name: {result_key(api_name): [], 'status': 'checking', 'error': None}
+        for api_name in PROVIDERS
     }
-    
-    # Create placeholders for dynamic updates
-    newsapi_placeholder = st.empty()
-    gnews_placeholder = st.empty()
-    factcheck_placeholder = st.empty()
-    mediastack_placeholder = st.empty()
-    newsdata_placeholder = st.empty()
-    currents_placeholder = st.empty()
-    rapidapi_placeholder = st.empty()
-    
-    # 1. NewsAPI Check
-    with st.spinner("🔍 Searching NewsAPI for matching articles..."):
-        newsapi_placeholder.markdown('<div class="api-result-box check-normal">📰 <strong>NewsAPI:</strong> Searching for matching articles...</div>', unsafe_allow_html=True)
-        time.sleep(1)
-        
-        newsapi_result = search_newsapi_articles(news_text)
-        api_results['newsapi']['articles'] = newsapi_result.get('articles', [])
-        api_results['newsapi']['error'] = newsapi_result.get('error')
-        
-        if newsapi_result.get('error'):
-            api_results['newsapi']['status'] = 'error'
-            newsapi_placeholder.markdown(f'<div class="api-result-box api-error">📰 <strong>NewsAPI:</strong> {newsapi_result["error"]} ⚠️</div>', unsafe_allow_html=True)
-        elif newsapi_result.get('articles'):
-            api_results['newsapi']['status'] = 'found'
-            newsapi_placeholder.markdown(f'<div class="api-result-box check-normal">📰 <strong>NewsAPI:</strong> Found {len(newsapi_result["articles"])} matching articles ✅</div>', unsafe_allow_html=True)
-            
-            # Display top articles
-            for i, article in enumerate(newsapi_result['articles'][:3], 1):
-                st.markdown(f"""
-                    <div style="background-color: #f8f9fa; padding: 15px 20px; margin-bottom: 10px; 
-                                border-radius: 8px; border-left: 4px solid #27ae60; 
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
-                        <strong>#{i}: {article.get('title', 'No title')}</strong><br>
-                        <span style="font-size: 14px; color: #6c757d;">Source: {article.get('source', {}).get('name', 'Unknown')}</span><br>
-                        <a href="{article.get('url', '#')}" target="_blank" style="color: #2980b9; font-size: 14px;">Read article →</a>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            api_results['newsapi']['status'] = 'not_found'
-            newsapi_placeholder.markdown('<div class="api-result-box check-suspicious">📰 <strong>NewsAPI:</strong> No matching articles found ❌</div>', unsafe_allow_html=True)
-
-    # 2. GNews Check
-    with st.spinner("🔍 Searching GNews for matching articles..."):
-        gnews_placeholder.markdown('<div class="api-result-box check-normal">🌐 <strong>GNews:</strong> Searching for matching articles...</div>', unsafe_allow_html=True)
-        time.sleep(1)
-        
-        gnews_result = search_gnews_articles(news_text)
-        api_results['gnews']['articles'] = gnews_result.get('articles', [])
-        api_results['gnews']['error'] = gnews_result.get('error')
-        
-        if gnews_result.get('error'):
-            api_results['gnews']['status'] = 'error'
-            gnews_placeholder.markdown(f'<div class="api-result-box api-error">🌐 <strong>GNews:</strong> {gnews_result["error"]} ⚠️</div>', unsafe_allow_html=True)
-        elif gnews_result.get('articles'):
-            api_results['gnews']['status'] = 'found'
-            gnews_placeholder.markdown(f'<div class="api-result-box check-normal">🌐 <strong>GNews:</strong> Found {len(gnews_result["articles"])} matching articles ✅</div>', unsafe_allow_html=True)
-            
-            # Display top articles
-            for i, article in enumerate(gnews_result['articles'][:3], 1):
-                st.markdown(f"""
-                    <div style="background-color: #f8f9fa; padding: 15px 20px; margin-bottom: 10px; 
-                                border-radius: 8px; border-left: 4px solid #27ae60; 
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
-                        <strong>#{i}: {article.get('title', 'No title')}</strong><br>
-                        <span style="font-size: 14px; color: #6c757d;">Source: {article.get('source', {}).get('name', 'Unknown')}</span><br>
-                        <a href="{article.get('url', '#')}" target="_blank" style="color: #2980b9; font-size: 14px;">Read article →</a>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            api_results['gnews']['status'] = 'not_found'
-            gnews_placeholder.markdown('<div class="api-result-box check-suspicious">🌐 <strong>GNews:</strong> No matching articles found ❌</div>', unsafe_allow_html=True)
-
-    # 3. Fact Check API
-    with st.spinner("🔍 Searching Google Fact Check for related claims..."):
-        factcheck_placeholder.markdown('<div class="api-result-box check-normal">🔍 <strong>Fact Check API:</strong> Searching for related claims...</div>', unsafe_allow_html=True)
-        time.sleep(1)
-        
-        factcheck_result = search_factcheck(news_text)
-        api_results['factcheck']['claims'] = factcheck_result.get('claims', [])
-        api_results['factcheck']['error'] = factcheck_result.get('error')
-        
-        if factcheck_result.get('error'):
-            api_results['factcheck']['status'] = 'error'
-            factcheck_placeholder.markdown(f'<div class="api-result-box api-error">🔍 <strong>Fact Check API:</strong> {factcheck_result["error"]} ⚠️</div>', unsafe_allow_html=True)
-        elif factcheck_result.get('claims'):
-            api_results['factcheck']['status'] = 'found'
-            factcheck_placeholder.markdown(f'<div class="api-result-box check-normal">🔍 <strong>Fact Check API:</strong> Found {len(factcheck_result["claims"])} related claims ✅</div>', unsafe_allow_html=True)
-            
-            # Display top claims
-            for i, claim in enumerate(factcheck_result['claims'][:3], 1):
-                claim_text = claim.get('text', 'No claim text available')
-                claimant = claim.get('claimant', 'Unknown claimant')
-                reviews = claim.get('claimReview', [])
-                rating = reviews[0].get('textualRating', 'No rating') if reviews else 'No rating'
-                
-                st.markdown(f"""
-                    <div style="background-color: #fff3cd; padding: 15px 20px; margin-bottom: 10px; 
-                                border-radius: 8px; border-left: 4px solid #ffc107; 
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
-                        <strong>#{i}: {claim_text[:100]}...</strong><br>
-                        <span style="font-size: 14px; color: #6c757d;">Claimant: {claimant}</span><br>
-                        <span style="font-size: 14px; color: #dc3545;">Rating: {rating}</span>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            api_results['factcheck']['status'] = 'not_found'
-            factcheck_placeholder.markdown('<div class="api-result-box check-suspicious">🔍 <strong>Fact Check API:</strong> No related claims found ❌</div>', unsafe_allow_html=True)
-
-    # 4. MediaStack API
-    with st.spinner("🔍 Searching MediaStack for matching articles..."):
-        mediastack_placeholder.markdown('<div class="api-result-box check-normal">📺 <strong>MediaStack:</strong> Searching for matching articles...</div>', unsafe_allow_html=True)
-        time.sleep(1)
-        
-        mediastack_result = search_mediastack(news_text)
-        api_results['mediastack']['articles'] = mediastack_result.get('articles', [])
-        api_results['mediastack']['error'] = mediastack_result.get('error')
-        
-        if mediastack_result.get('error'):
-            api_results['mediastack']['status'] = 'error'
-            mediastack_placeholder.markdown(f'<div class="api-result-box api-error">📺 <strong>MediaStack:</strong> {mediastack_result["error"]} ⚠️</div>', unsafe_allow_html=True)
-        elif mediastack_result.get('articles'):
-            api_results['mediastack']['status'] = 'found'
-            mediastack_placeholder.markdown(f'<div class="api-result-box check-normal">📺 <strong>MediaStack:</strong> Found {len(mediastack_result["articles"])} matching articles ✅</div>', unsafe_allow_html=True)
-            
-            # Display top articles
-            for i, article in enumerate(mediastack_result['articles'][:3], 1):
-                st.markdown(f"""
-                    <div style="background-color: #f8f9fa; padding: 15px 20px; margin-bottom: 10px; 
-                                border-radius: 8px; border-left: 4px solid #27ae60; 
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
-                        <strong>#{i}: {article.get('title', 'No title')}</strong><br>
-                        <span style="font-size: 14px; color: #6c757d;">Source: {article.get('source', 'Unknown')}</span><br>
-                        <a href="{article.get('url', '#')}" target="_blank" style="color: #2980b9; font-size: 14px;">Read article →</a>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            api_results['mediastack']['status'] = 'not_found'
-            mediastack_placeholder.markdown('<div class="api-result-box check-suspicious">📺 <strong>MediaStack:</strong> No matching articles found ❌</div>', unsafe_allow_html=True)
-
-    # 5. NewsData.io API
-    with st.spinner("🔍 Searching NewsData.io for matching articles..."):
-        newsdata_placeholder.markdown('<div class="api-result-box check-normal">📊 <strong>NewsData.io:</strong> Searching for matching articles...</div>', unsafe_allow_html=True)
-        time.sleep(1)
-        
-        newsdata_result = search_newsdata_io(news_text)
-        api_results['newsdata']['articles'] = newsdata_result.get('articles', [])
-        api_results['newsdata']['error'] = newsdata_result.get('error')
-        
-        if newsdata_result.get('error'):
-            api_results['newsdata']['status'] = 'error'
-            newsdata_placeholder.markdown(f'<div class="api-result-box api-error">📊 <strong>NewsData.io:</strong> {newsdata_result["error"]} ⚠️</div>', unsafe_allow_html=True)
-        elif newsdata_result.get('articles'):
-            api_results['newsdata']['status'] = 'found'
-            newsdata_placeholder.markdown(f'<div class="api-result-box check-normal">📊 <strong>NewsData.io:</strong> Found {len(newsdata_result["articles"])} matching articles ✅</div>', unsafe_allow_html=True)
-            
-            # Display top articles
-            for i, article in enumerate(newsdata_result['articles'][:3], 1):
-                st.markdown(f"""
-                    <div style="background-color: #f8f9fa; padding: 15px 20px; margin-bottom: 10px; 
-                                border-radius: 8px; border-left: 4px solid #27ae60; 
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
-                        <strong>#{i}: {article.get('title', 'No title')}</strong><br>
-                        <span style="font-size: 14px; color: #6c757d;">Source: {article.get('source_id', 'Unknown')}</span><br>
-                        <a href="{article.get('link', '#')}" target="_blank" style="color: #2980b9; font-size: 14px;">Read article →</a>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            api_results['newsdata']['status'] = 'not_found'
-            newsdata_placeholder.markdown('<div class="api-result-box check-suspicious">📊 <strong>NewsData.io:</strong> No matching articles found ❌</div>', unsafe_allow_html=True)
-
-    # 6. Currents API
-    with st.spinner("🔍 Searching Currents API for matching articles..."):
-        currents_placeholder.markdown('<div class="api-result-box check-normal">⚡ <strong>Currents API:</strong> Searching for matching articles...</div>', unsafe_allow_html=True)
-        time.sleep(1)
-        
-        currents_result = search_currents_api(news_text)
-        api_results['currents']['articles'] = currents_result.get('articles', [])
-        api_results['currents']['error'] = currents_result.get('error')
-        
-        if currents_result.get('error'):
-            api_results['currents']['status'] = 'error'
-            currents_placeholder.markdown(f'<div class="api-result-box api-error">⚡ <strong>Currents API:</strong> {currents_result["error"]} ⚠️</div>', unsafe_allow_html=True)
-        elif currents_result.get('articles'):
-            api_results['currents']['status'] = 'found'
-            currents_placeholder.markdown(f'<div class="api-result-box check-normal">⚡ <strong>Currents API:</strong> Found {len(currents_result["articles"])} matching articles ✅</div>', unsafe_allow_html=True)
-            
-            # Display top articles
-            for i, article in enumerate(currents_result['articles'][:3], 1):
-                st.markdown(f"""
-                    <div style="background-color: #f8f9fa; padding: 15px 20px; margin-bottom: 10px; 
-                                border-radius: 8px; border-left: 4px solid #27ae60; 
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
-                        <strong>#{i}: {article.get('title', 'No title')}</strong><br>
-                        <span style="font-size: 14px; color: #6c757d;">Source: {article.get('author', 'Unknown')}</span><br>
-                        <a href="{article.get('url', '#')}" target="_blank" style="color: #2980b9; font-size: 14px;">Read article →</a>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            api_results['currents']['status'] = 'not_found'
-            currents_placeholder.markdown('<div class="api-result-box check-suspicious">⚡ <strong>Currents API:</strong> No matching articles found ❌</div>', unsafe_allow_html=True)
-
-    # 7. RapidAPI News Check (NEW)
-    with st.spinner("🔍 Searching RapidAPI News for matching articles..."):
-        rapidapi_placeholder.markdown('<div class="api-result-box check-normal">🚀 <strong>RapidAPI News:</strong> Searching for matching articles...</div>', unsafe_allow_html=True)
-        time.sleep(1)
-        
-        rapidapi_result = search_rapidapi_news(news_text)
-        api_results['rapidapi']['articles'] = rapidapi_result.get('articles', [])
-        api_results['rapidapi']['error'] = rapidapi_result.get('error')
-        
-        if rapidapi_result.get('error'):
-            api_results['rapidapi']['status'] = 'error'
-            rapidapi_placeholder.markdown(f'<div class="api-result-box api-error">🚀 <strong>RapidAPI News:</strong> {rapidapi_result["error"]} ⚠️</div>', unsafe_allow_html=True)
-        elif rapidapi_result.get('articles'):
-            api_results['rapidapi']['status'] = 'found'
-            rapidapi_placeholder.markdown(f'<div class="api-result-box check-normal">🚀 <strong>RapidAPI News:</strong> Found {len(rapidapi_result["articles"])} matching articles ✅</div>', unsafe_allow_html=True)
-            
-            # Display top articles
-            for i, article in enumerate(rapidapi_result['articles'][:3], 1):
-                st.markdown(f"""
-                    <div style="background-color: #f8f9fa; padding: 15px 20px; margin-bottom: 10px; 
-                                border-radius: 8px; border-left: 4px solid #27ae60; 
-                                box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
-                        <strong>#{i}: {article.get('title', 'No title')}</strong><br>
-                        <span style="font-size: 14px; color: #6c757d;">Source: {article.get('source', {}).get('name', 'Unknown')}</span><br>
-                        <a href="{article.get('url', '#')}" target="_blank" style="color: #2980b9; font-size: 14px;">Read article →</a>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            api_results['rapidapi']['status'] = 'not_found'
-            rapidapi_placeholder.markdown('<div class="api-result-box check-suspicious">🚀 <strong>RapidAPI News:</strong> No matching articles found ❌</div>', unsafe_allow_html=True)
 
-    st.markdown("---")
+    # How each API is labelled (articles arrive as normalised Article records);
+    # providers without an entry here use their spec label
+    display_overrides = {
+        'newsapi': {'icon': '📰', 'label': 'NewsAPI'},
+        'gnews': {'icon': '🌐', 'label': 'GNews'},
+        'factcheck': {'icon': '🔍', 'label': 'Fact Check API'},
+        'mediastack': {'icon': '📺', 'label': 'MediaStack'},
+        'newsdata': {'icon': '📊', 'label': 'NewsData.io'},
+        'currents': {'icon': '⚡', 'label': 'Currents API'},
+        'rapidapi': {'icon': '🚀', 'label': 'RapidAPI News'},
+    }
+    api_display = {
+        api_name: display_overrides.get(api_name, {'icon': '📰', 'label': PROVIDER_SPECS[api_name]['label']})
+        for api_name in PROVIDERS
+    }
 
+    # Provisional verdict, refined every time another API answers
+    provisional_placeholder = st.empty()
+
+    # Create placeholders for dynamic updates - all APIs show as searching until their result lands
+    api_placeholders = {}
+    for api_name, display in api_display.items():
+        api_placeholders[api_name] = st.empty()
+        searching = "related claims" if result_key(api_name) == 'claims' else "matching articles"
+        api_placeholders[api_name].markdown(f'<div class="api-result-box check-normal">{display["icon"]} <strong>{display["label"]}:</strong> Searching for {searching}...</div>', unsafe_allow_html=True)
+
+    def render_api_result(api_name, result):
+        """Record one API result and replace its placeholder with the outcome"""
+        display = api_display[api_name]
+        key = result_key(api_name)
+        items = result.get(key, [])
+        api_results[api_name][key] = items
+        api_results[api_name]['error'] = result.get('error')
+        api_results[api_name]['status'] = status = result_status(api_name, result)
+
+        with api_placeholders[api_name].container():
+            if status == 'error':
+                st.markdown(f'<div class="api-result-box api-error">{display["icon"]} <strong>{display["label"]}:</strong> {result["error"]} ⚠️</div>', unsafe_allow_html=True)
+            elif status == 'found' and key == 'claims':
+                st.markdown(f'<div class="api-result-box check-normal">{display["icon"]} <strong>{display["label"]}:</strong> Found {len(items)} related claims ✅</div>', unsafe_allow_html=True)
+
+                # Display top claims
+                for i, claim in enumerate(items[:3], 1):
+                    claim_text = claim.get('text', 'No claim text available')
+                    claimant = claim.get('claimant', 'Unknown claimant')
+                    reviews = claim.get('claimReview', [])
+                    rating = reviews[0].get('textualRating', 'No rating') if reviews else 'No rating'
+
+                    st.markdown(f"""
+                        <div style="background-color: #fff3cd; padding: 15px 20px; margin-bottom: 10px; 
+                                    border-radius: 8px; border-left: 4px solid #ffc107; 
+                                    box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
+                            <strong>#{i}: {claim_text[:100]}...</strong><br>
+                            <span style="font-size: 14px; color: #6c757d;">Claimant: {claimant}</span><br>
+                            <span style="font-size: 14px; color: #dc3545;">Rating: {rating}</span>
+                        </div>
+                    """, unsafe_allow_html=True)
+            elif status == 'found':
+                st.markdown(f'<div class="api-result-box check-normal">{display["icon"]} <strong>{display["label"]}:</strong> Found {len(items)} matching articles ✅</div>', unsafe_allow_html=True)
+
+                # Display top articles
+                for i, article in enumerate(items[:3], 1):
+                    st.markdown(f"""
+                        <div style="background-color: #f8f9fa; padding: 15px 20px; margin-bottom: 10px; 
+                                    border-radius: 8px; border-left: 4px solid #27ae60; 
+                                    box-shadow: 0 4px 8px rgba(0,0,0,0.05);">
+                            <strong>#{i}: {article.title or 'No title'}</strong><br>
+                            <span style="font-size: 14px; color: #6c757d;">Source: {article.source or 'Unknown'}</span><br>
+                            <a href="{article.url or '#'}" target="_blank" style="color: #2980b9; font-size: 14px;">Read article →</a>
+                        </div>
+                    """, unsafe_allow_html=True)
+            elif status == 'skipped':
+                st.markdown(f'<div class="api-result-box check-normal">{display["icon"]} <strong>{display["label"]}:</strong> Skipped - the verdict was already decided ⏭️</div>', unsafe_allow_html=True)
+            else:
+                missing = "No related claims found" if key == 'claims' else "No matching articles found"
+                st.markdown(f'<div class="api-result-box check-suspicious">{display["icon"]} <strong>{display["label"]}:</strong> {missing} ❌</div>', unsafe_allow_html=True)
+
+    # Query all APIs at once and render them in the order they answer
+    ml_p_real = model_result['p_real'] if model_result else None
+
+    results = {}
+
+    def current_scoring_input(results):
+        """Scoring input for the raw results so far, with the APIs still searching counted as pending"""
+        return build_scoring_input(suspicious_count(checks), partial_api_results(results, PROVIDERS), ml_p_real, claim=news_text)
+
+    def show_result(api_name, result):
+        render_api_result(api_name, result)
+        results[api_name] = result
+        answered = len(results)
+        if answered < len(api_results):
+            provisional = score_credibility(current_scoring_input(results))
+            provisional_placeholder.markdown(f'<div class="api-result-box check-normal">⏳ <strong>Provisional verdict</strong> ({answered} of {len(api_results)} APIs answered): {provisional["verdict"]} ({provisional["percentage"]:.0f}%)</div>', unsafe_allow_html=True)
+
+    # A reworded repeat of a recently checked claim reuses that claim's API results
+    reused = reusable_claim(news_text)
+    missing = list(PROVIDERS)
+    if reused:
+        st.markdown(f'<div class="api-result-box check-normal">♻️ <strong>Reused results:</strong> a near-identical claim ({reused["similarity"]:.0%} similar) was checked {format_age(reused["age_seconds"])} ago - showing the APIs\' answers from then</div>', unsafe_allow_html=True)
+        # APIs that claim skipped are searched again if this claim's verdict still depends on them
+        stored, missing = reused_results(reused, PROVIDERS, current_scoring_input)
+        for api_name, result in stored.items():
+            render_api_result(api_name, result)
+            results[api_name] = result
+    if missing:
+        searches = {api_name: PROVIDERS[api_name] for api_name in missing}
+        with st.spinner("🔍 Searching all verification APIs in parallel..."), span("providers"):
+            if EARLY_VERDICT:
+                # Stops once the APIs still searching can no longer change the verdict
+                verify_until_decided(news_text, lambda found: current_scoring_input({**results, **found}),
+                                     on_result=show_result, providers=searches)
+            else:
+                for api_name, result in stream_results(news_text, searches):
+                    show_result(api_name, result)
+    provisional_placeholder.empty()
+
+    st.markdown("---")
     # Calculate Final Verdict Based on All Checks - IMPROVED LOGIC WITH POSITIVE BIAS
     st.markdown('<div class="section-header">\U0001F4E2 Final Verdict</div>', unsafe_allow_html=True)
 
-    # New improved scoring system with positive bias when APIs find results
-    credibility_score = 0
-    max_possible_score = 10
-    
-    # 1. Pattern Analysis (max 2 points deduction)
-    pattern_suspicious_count = sum(1 for status in checks.values() if status == "suspicious")
-    if pattern_suspicious_count == 0:
-        credibility_score += 2  # Good patterns
-    elif pattern_suspicious_count == 1:
-        credibility_score += 1  # Minor concern
-    # else: 0 points (multiple red flags)
-    
-    # 2. API Verification (max 8 points) - UPDATED FOR ALL 7 APIS WITH ERROR HANDLING
-    total_articles_found = 0
-    api_success_count = 0
-    api_error_count = 0
-    news_apis = ['newsapi', 'gnews', 'mediastack', 'newsdata', 'currents', 'rapidapi']
-    
-    # Check all news APIs
-    for api_name in news_apis:
-        if api_results[api_name]['status'] == 'found':
-            articles_count = len(api_results[api_name]['articles'])
-            total_articles_found += articles_count
-            api_success_count += 1
-            
-            # Progressive scoring based on number of articles
-            if articles_count >= 5:
-                credibility_score += 1.5  # Strong verification per API
-            elif articles_count >= 2:
-                credibility_score += 1.2  # Moderate verification per API
-            else:
-                credibility_score += 0.8  # Weak verification per API
-        elif api_results[api_name]['status'] == 'error':
-            api_error_count += 1
-    
-    # Fact-check results (can add or subtract points)
-    if api_results['factcheck']['status'] == 'found':
-        factcheck_claims = api_results['factcheck']['claims']
-        api_success_count += 0.5  # Count as half since it's different type
-        false_claims = 0
-        total_claims = len(factcheck_claims)
-        
-        for claim in factcheck_claims:
-            reviews = claim.get('claimReview', [])
-            if reviews:
-                rating = reviews[0].get('textualRating', '').lower()
-                if any(word in rating for word in ['false', 'fake', 'misleading', 'disputed', 'pants on fire']):
-                    false_claims += 1
-        
-        if false_claims > 0:
-            # Found disputed claims - deduct points but not too harshly
-            credibility_score -= 1.5
-        else:
-            # No disputed claims found - small bonus
-            credibility_score += 0.5
-    elif api_results['factcheck']['status'] == 'error':
-        api_error_count += 0.5
-    else:
-        # No fact-check claims found - neutral to positive
-        credibility_score += 0.3
-    
-    # MAJOR POSITIVE BIAS: If ANY API finds articles, boost credibility significantly
-    if api_success_count >= 1:
-        credibility_score += 2  # Big bonus for any verification
-        
-        if api_success_count >= 2:
-            credibility_score += 1  # Extra bonus for cross-verification
-        
-        if api_success_count >= 3:
-            credibility_score += 0.5  # Additional bonus for multiple sources
-
-    # Adjust scoring if many APIs had errors (don't penalize too much for API issues)
-    if api_error_count >= 3:
-        credibility_score += 1  # Small bonus since APIs being down doesn't mean news is fake
-
-    # Ensure score is within bounds
-    credibility_score = max(0, min(max_possible_score, credibility_score))
-    
-    # Calculate percentage
-    credibility_percentage = (credibility_score / max_possible_score) * 100
-    
-    # Determine verdict based on score - UPDATED THRESHOLDS FOR MORE POSITIVE RESULTS
-    if credibility_percentage >= 55:  # Lowered from 70
-        verdict = "LIKELY REAL"
-        verdict_class = "verdict-real"
-        verdict_icon = "✅"
-    elif credibility_percentage >= 35:  # Lowered from 40
-        verdict = "POSSIBLY REAL"
-        verdict_class = "verdict-real"  # Changed to green instead of red
-        verdict_icon = "✅"
-    elif credibility_percentage >= 20:
-        verdict = "SUSPICIOUS"
-        verdict_class = "verdict-fake"
-        verdict_icon = "⚠️"
-    else:
-        verdict = "LIKELY FAKE"
-        verdict_class = "verdict-fake"
-        verdict_icon = "❌"
+    # Score with the shared credibility engine (pattern checks, ML model, API verification)
+    with span("scoring"):
+        scoring_input = build_scoring_input(suspicious_count(checks), api_results, ml_p_real, claim=news_text)
+        scoring = score_credibility(scoring_input)
+    verdict = scoring['verdict']
+    verdict_class, verdict_icon = VERDICT_STYLES[verdict]
+    if not reused:
+        remember_claim(news_text, verdict, results)
+    credibility_score = scoring['score']
+    max_possible_score = scoring['max_score']
+    credibility_percentage = scoring['percentage']
 
     st.markdown(f'<div class="verdict-box {verdict_class}">{verdict_icon} Verdict: {verdict}</div>', unsafe_allow_html=True)
     st.markdown(f'<div style="text-align: center; font-size: 18px; color: white; margin: 20px 0;">Credibility Score: {credibility_score:.1f}/{max_possible_score} ({credibility_percentage:.1f}%)</div>', unsafe_allow_html=True)
 
     # Detailed reasoning
-    if verdict == "LIKELY FAKE" or verdict == "SUSPICIOUS":
-        reasons = []
-        if pattern_suspicious_count >= 2:
-            reasons.append("🚩 Multiple suspicious text patterns detected")
-        if total_articles_found == 0 and api_error_count < 3:
-            reasons.append("🔍 No matching articles found in credible news sources")
-        elif total_articles_found < 3 and api_error_count < 3:
-            reasons.append("📰 Limited verification from news sources")
-        if api_results['factcheck']['status'] == 'found':
-            false_claims = sum(1 for claim in api_results['factcheck']['claims'] 
-                             for review in claim.get('claimReview', [])
-                             if any(word in review.get('textualRating', '').lower() 
-                                   for word in ['false', 'fake', 'misleading', 'disputed']))
-            if false_claims > 0:
-                reasons.append(f"⚠️ {false_claims} disputed claims found in fact-checking databases")
-        if api_success_count == 0 and api_error_count < 3:
-            reasons.append("❌ No verification from any external sources")
-        if api_error_count >= 3:
-            reasons.append("⚠️ Multiple verification services were unavailable - results may be incomplete")
-        
-        if not reasons:
-            reasons.append("🤔 Mixed signals from various verification checks")
-            
-        st.markdown(f"""
-        <div class="reason-section">
-            <h4>Why this appears to be {verdict.lower()}:</h4>
-            <ul>
-                {"".join(f"<li>{reason}</li>" for reason in reasons)}
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    else:  # LIKELY REAL or POSSIBLY REAL
-        reasons = []
-        if pattern_suspicious_count == 0:
-            reasons.append("✅ Text patterns consistent with legitimate journalism")
-        if total_articles_found >= 10:
-            reasons.append(f"📰 Strong verification with {total_articles_found} matching articles from multiple credible sources")
-        elif total_articles_found >= 5:
-            reasons.append(f"🌐 Good verification with {total_articles_found} matching articles found")
-        elif total_articles_found >= 1:
-            reasons.append(f"📋 Found {total_articles_found} matching articles in credible news sources")
-        if api_success_count >= 3:
-            reasons.append("🔄 Cross-verified by multiple independent news APIs")
-        elif api_success_count >= 2:
-            reasons.append("✓ Verified by multiple news sources")
-        elif api_success_count >= 1:
-            reasons.append("✓ Confirmed by at least one credible news source")
-        if api_results['factcheck']['status'] == 'not_found':
-            reasons.append("🔍 No disputed claims found in fact-checking databases")
-        elif api_results['factcheck']['status'] == 'found':
-            # Check if fact-check claims are not disputed
-            false_claims = sum(1 for claim in api_results['factcheck']['claims'] 
-                             for review in claim.get('claimReview', [])
-                             if any(word in review.get('textualRating', '').lower() 
-                                   for word in ['false', 'fake', 'misleading', 'disputed']))
-            if false_claims == 0:
-                reasons.append("✅ Related claims in fact-check database show no disputes")
-        if api_error_count >= 2:
-            reasons.append("ℹ️ Some verification services were unavailable, but available sources support authenticity")
-            
-        st.markdown(f"""
-        <div class="reason-section">
-            <h4>Why this appears to be legitimate:</h4>
-            <ul>
-                {"".join(f"<li>{reason}</li>" for reason in reasons)}
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
+    reasons = explain_verdict(scoring_input, scoring)
+    reason_title = f"Why this appears to be {verdict.lower()}:" if verdict in ("LIKELY FAKE", "SUSPICIOUS") else "Why this appears to be legitimate:"
+    st.markdown(f"""
+    <div class="reason-section">
+        <h4>{reason_title}</h4>
+        <ul>
+            {"".join(f"<li>{reason}</li>" for reason in reasons)}
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
 
     # Debug info (you can remove this in production)
     with st.expander("🔧 Debug Information"):
+        analysis_time = time.perf_counter() - analysis_start
+        st.write(f"**Timing ({presentation_mode} mode):** {analysis_time:.2f}s total, {artificial_wait:.2f}s of artificial presentation wait")
         st.write(f"**Pattern Checks:** {checks}")
         st.write(f"**API Results Status:**")
-        for api_name in ['newsapi', 'gnews', 'factcheck', 'mediastack', 'newsdata', 'currents', 'rapidapi']:
-            if api_name == 'factcheck':
-                count = len(api_results[api_name]['claims'])
-                st.write(f"- {api_name.title()}: {api_results[api_name]['status']} ({count} claims) - Error: {api_results[api_name]['error']}")
-            else:
-                count = len(api_results[api_name]['articles'])
-                st.write(f"- {api_name.title()}: {api_results[api_name]['status']} ({count} articles) - Error: {api_results[api_name]['error']}")
+        for api_name in api_results:
+            key = result_key(api_name)
+            count = len(api_results[api_name][key])
+            st.write(f"- {api_name.title()}: {api_results[api_name]['status']} ({count} {key}) - Error: {api_results[api_name]['error']}")
         st.write(f"**Scoring Details:**")
-        st.write(f"- Total articles found: {total_articles_found}")
-        st.write(f"- APIs with results: {api_success_count}")
-        st.write(f"- APIs with errors: {api_error_count}")
+        st.write(f"- Distinct stories found: {scoring['total_articles_found']} (from {sum(len(api_results[name]['articles']) for name in api_results if result_key(name) == 'articles')} articles)")
+        st.write(f"- APIs with results: {scoring['api_success_count']}")
+        st.write(f"- APIs with errors: {scoring['api_error_count']}")
         st.write(f"- Credibility Score: {credibility_score:.1f}/{max_possible_score} ({credibility_percentage:.1f}%)")
-        st.write(f"- Pattern suspicious count: {pattern_suspicious_count}")
+        st.write(f"- Pattern suspicious count: {scoring['pattern_suspicious_count']}")
+        if model_result:
+            st.write(f"- ML model v{model_result['model_version']}: {model_result['label']} (P(real) = {model_result['p_real']:.3f}, {model_result['latency_ms']:.1f} ms)")
+        st.write(f"**Provider Cache:** {cache_stats()}")
+        st.write(f"**Remaining API Quota:** {quota_status()}")
+        st.write(f"**Provider Health:** {breaker_status()}")
+        st.write(f"**Metrics:** {metrics_snapshot()}")
 
 else:
     st.markdown("""
@@ -0,0 +1,18 @@
+# File: tests/asgi_client.py
+"""Drive an ASGI app in-process, without a server"""
+import asyncio
+
+def call_app(app, method, path, body=b""):
+    """(status, headers, body) of one request through the ASGI app"""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": method, "path": path}, receive, send))
+    start, response = sent
+    return start["status"], dict(start["headers"]), response["body"]
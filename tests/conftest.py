@@ -0,0 +1,23 @@
+# File: tests/conftest.py
+import pytest
+
+from api.breaker import reset_breakers
+from api.cache import ProviderCache, use_cache
+from api.claim_index import use_index
+from api.metrics import reset_metrics
+from api.quota import use_governor
+
+@pytest.fixture(autouse=True)
+def isolated_state():
+    """Fresh memory cache, breakers and metrics for every test; no quota governor or claim index"""
+    previous_cache = use_cache(ProviderCache(path=""))
+    previous_governor = use_governor(None)
+    previous_index = use_index(None)
+    reset_breakers()
+    reset_metrics()
+    yield
+    use_cache(previous_cache)
+    use_governor(previous_governor)
+    use_index(previous_index)
+    reset_breakers()
+    reset_metrics()
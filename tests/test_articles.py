@@ -0,0 +1,71 @@
+"""Article normalisation and MinHash / canonical-URL story deduplication"""
+from api.articles import SNIPPET_LENGTH, Article, canonical_url, count_stories, group_stories, to_article
+
+def article(title, url=""):
+    return Article(url=url, title=title)
+
+def test_to_article_maps_nested_and_fallback_fields():
+    raw = {
+        "link": "https://example.com/story",
+        "title": "  Rover lands on Mars ",
+        "source": {"name": "Example News"},
+        "pubDate": "2024-05-01",
+        "description": "x" * (SNIPPET_LENGTH + 50),
+    }
+    result = to_article(raw, provider="newsdata")
+    assert result.url == "https://example.com/story"
+    assert result.title == "Rover lands on Mars"
+    assert result.source == "Example News"
+    assert result.published_at == "2024-05-01"
+    assert len(result.snippet) == SNIPPET_LENGTH
+    assert result.provider == "newsdata"
+
+def test_to_article_uses_provider_field_overrides():
+    raw = {"headline": "Override", "description": None, "summary": "Lead paragraph"}
+    result = to_article(raw, fields={"title": "headline", "snippet": ("description", "summary")})
+    assert (result.title, result.snippet) == ("Override", "Lead paragraph")
+    assert to_article(result) is result
+
+def test_article_list_round_trip():
+    original = Article("u", "t", "s", "p", "snippet", "gnews")
+    assert Article.from_list(original.to_list()) == original
+
+def test_canonical_url_drops_presentation_differences():
+    expected = "example.com/news/story?id=7"
+    assert canonical_url("https://www.Example.com/news/story/?utm_source=x&id=7#comments") == expected
+    assert canonical_url("http://example.com/news/story?fbclid=abc&id=7") == expected
+    assert canonical_url("https://example.com/news/story?id=8") != expected
+    assert canonical_url("") == ""
+
+def test_shared_canonical_url_is_one_story():
+    stories = group_stories([
+        article("Completely different headline", "https://www.example.com/a?utm_medium=rss"),
+        article("Another wording altogether", "https://example.com/a/"),
+    ])
+    assert len(stories) == 1 and len(stories[0]) == 2
+
+def test_near_duplicate_titles_are_one_story():
+    articles = [
+        article("Senate passes $1 trillion bipartisan infrastructure bill - Reuters", "https://reuters.com/1"),
+        article("Senate passes $1 trillion bipartisan infrastructure bill | BBC News", "https://bbc.co.uk/2"),
+        article("Senate passes $1tn bipartisan infrastructure bill", "https://example.com/3"),
+        article("NASA confirms water ice in permanently shadowed lunar craters", "https://nasa.gov/4"),
+    ]
+    stories = group_stories(articles)
+    assert [len(story) for story in stories] == [3, 1]
+    assert stories[1][0] is articles[3]
+    assert count_stories(articles) == 2
+
+def test_unrelated_titles_stay_separate():
+    articles = [
+        article("Federal Reserve raises interest rates"),
+        article("Local team wins championship final"),
+        article("Storm closes schools across the region"),
+    ]
+    assert count_stories(articles) == 3
+    assert count_stories(articles[:1]) == 1
+    assert count_stories([]) == 0
+
+def test_untitled_articles_are_grouped_by_url_only():
+    articles = [article("", "https://example.com/x"), article("", "https://example.com/y")]
+    assert count_stories(articles) == 2
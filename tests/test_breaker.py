@@ -0,0 +1,100 @@
+# File: tests/test_breaker.py
+"""Circuit breaker state transitions and adaptive timeouts"""
+import time
+
+import pytest
+
+from api import breaker as breaker_module
+from api.benchmark import StubServer, build_profile, restore_providers
+from api.breaker import CLOSED, HALF_OPEN, OPEN, PROVIDER_UNAVAILABLE_ERROR, CircuitBreaker, get_breaker
+from api.deadline import Deadline
+from api.providers import PROVIDER_SEARCHES
+
+def open_breaker(breaker):
+    for _ in range(breaker_module.FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("stub")
+    for _ in range(breaker_module.FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.status()["short_circuited"] == 1
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("stub")
+    for _ in range(breaker_module.FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+def test_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker("stub")
+    breaker.cooldown = 0.05
+    open_breaker(breaker)
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.cooldown == breaker_module.COOLDOWN
+
+def test_failed_probe_reopens_with_a_longer_cooldown():
+    breaker = CircuitBreaker("stub")
+    breaker.cooldown = 0.05
+    open_breaker(breaker)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.cooldown == pytest.approx(0.1)
+    assert not breaker.allow()
+
+def test_slow_latencies_open_the_breaker():
+    breaker = CircuitBreaker("stub")
+    for _ in range(breaker_module.MIN_SAMPLES):
+        breaker.record_success(breaker_module.SLOW_THRESHOLD + 1)
+    assert breaker.state == OPEN
+    assert not breaker.latencies
+
+def test_timeout_follows_p99_latency_once_known():
+    breaker = CircuitBreaker("stub")
+    assert breaker.timeout(20) == 20
+    for _ in range(breaker_module.MIN_SAMPLES):
+        breaker.record_success(2.0)
+    assert breaker.timeout(20) == pytest.approx(2.0 * breaker_module.TIMEOUT_MULTIPLIER)
+    assert breaker.timeout(3) == 3
+
+    fast = CircuitBreaker("stub")
+    for _ in range(breaker_module.MIN_SAMPLES):
+        fast.record_success(0.01)
+    assert fast.timeout(20) == breaker_module.MIN_TIMEOUT
+
+CLAIMS = [f"Senate passes bipartisan infrastructure bill {word}" for word in ("today", "again", "tonight", "finally")]
+
+@pytest.fixture(scope="module")
+def unavailable_server():
+    """Stub answering every NewsAPI query with 503"""
+    fixtures = {"providers": {"newsapi": [{"query": CLAIMS[0], "status": 503, "body": {"message": "unavailable"}}]}}
+    with StubServer(build_profile(fixtures, latency={"*": "fixed:0.01"})) as stub:
+        original = stub.point_providers()
+        yield stub
+        restore_providers(original)
+
+def test_server_errors_open_the_breaker(unavailable_server):
+    search = PROVIDER_SEARCHES["newsapi"]
+    breaker = get_breaker("newsapi")
+    for claim in CLAIMS[:-1]:
+        if breaker.state == OPEN:
+            break
+        assert search(claim, Deadline(5))["error"] is None
+    assert breaker.state == OPEN
+    # 503 latencies don't count as healthy ones
+    assert not breaker.latencies
+    assert search(CLAIMS[-1], Deadline(5))["error"] == PROVIDER_UNAVAILABLE_ERROR
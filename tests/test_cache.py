@@ -0,0 +1,111 @@
+"""Two-tier provider cache: LRU memory tier, SQLite disk tier and stale-while-revalidate"""
+import time
+
+import pytest
+
+from api import cache as cache_module
+from api.articles import Article
+from api.cache import ProviderCache, cache_key, cached_search, normalize_query, use_cache
+
+ARTICLE = Article(url="https://example.com/a", title="Example story", source="Example",
+                  published_at="2024-01-01", snippet="Body", provider="stub")
+
+def result(n):
+    return {"found": True, "count": n, "articles": [ARTICLE], "error": None}
+
+def counting_search(results):
+    """Search function returning the queued results in turn and recording its calls"""
+    calls = []
+
+    def search(query, deadline=None):
+        calls.append(query)
+        return results[min(len(calls), len(results)) - 1]
+
+    return search, calls
+
+@pytest.fixture
+def cache():
+    cache = ProviderCache(path="")
+    use_cache(cache)
+    return cache
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_normalized_queries_share_a_key():
+    assert normalize_query("  Hello,   World! ") == "hello world"
+    assert cache_key("newsapi", "Hello, World") == cache_key("newsapi", "hello world ")
+    assert cache_key("newsapi", "hello") != cache_key("gnews", "hello")
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ProviderCache(path="", memory_size=2)
+    cache.set("a", "stub", result(1))
+    cache.set("b", "stub", result(2))
+    assert cache.get("a")[2] == "memory"
+    cache.set("c", "stub", result(3))
+    assert cache.get("b") is None
+    assert cache.get("a")[1]["count"] == 1
+    assert cache.get("c")[1]["count"] == 3
+
+def test_disk_tier_serves_evicted_and_persisted_entries(tmp_path):
+    path = str(tmp_path / "provider_cache.sqlite3")
+    cache = ProviderCache(path=path, memory_size=1)
+    cache.set("a", "stub", result(1))
+    cache.set("b", "stub", result(2))
+
+    stored_at, found, tier = cache.get("a")
+    assert tier == "disk"
+    assert found == result(1) and isinstance(found["articles"][0], Article)
+    assert cache.get("a")[2] == "memory"
+
+    reopened = ProviderCache(path=path)
+    assert reopened.get("b")[1:] == (result(2), "disk")
+    reopened.clear()
+    assert ProviderCache(path=path).get("b") is None
+
+def test_fresh_entries_skip_the_search(cache):
+    search, calls = counting_search([result(1)])
+    wrapped = cached_search("stub")(search)
+    assert wrapped("Some claim") == result(1)
+    assert wrapped("some claim!") == result(1)
+    assert calls == ["Some claim"]
+    assert cache.stats["misses"] == 1 and cache.stats["memory_hits"] == 1
+
+def test_cached_results_are_copies(cache):
+    search, _ = counting_search([result(1)])
+    wrapped = cached_search("stub")(search)
+    wrapped("claim")["articles"].clear()
+    assert wrapped("claim")["articles"] == [ARTICLE]
+
+def test_errors_are_not_stored(cache):
+    failed = {"found": False, "count": 0, "articles": [], "error": "HTTP 500"}
+    search, calls = counting_search([failed, result(1)])
+    wrapped = cached_search("stub")(search)
+    assert wrapped("claim") == failed
+    assert wrapped("claim") == result(1)
+    assert len(calls) == 2 and cache.stats["stores"] == 1
+
+def test_expired_entries_are_searched_again(cache, monkeypatch):
+    monkeypatch.setitem(cache_module.PROVIDER_TTLS, "stub", (0.05, 0.05))
+    search, calls = counting_search([result(1), result(2)])
+    wrapped = cached_search("stub")(search)
+    wrapped("claim")
+    time.sleep(0.12)
+    assert wrapped("claim") == result(2)
+    assert len(calls) == 2 and cache.stats["stale_hits"] == 0
+
+def test_stale_entries_are_served_while_refreshed(cache, monkeypatch):
+    monkeypatch.setitem(cache_module.PROVIDER_TTLS, "stub", (0.05, 10))
+    search, calls = counting_search([result(1), result(2)])
+    wrapped = cached_search("stub")(search)
+    wrapped("claim")
+    time.sleep(0.06)
+
+    assert wrapped("claim") == result(1)
+    assert cache.stats["stale_hits"] == 1
+    assert wait_for(lambda: cache.stats["refreshes"] == 1)
+    assert wrapped("claim") == result(2)
+    assert len(calls) == 2
@@ -0,0 +1,124 @@
+# File: tests/test_claim_index.py
+"""Near-duplicate claim reuse, alone and through verify_claim() with the early verdict on"""
+import threading
+import time
+
+import pytest
+
+from api import verifier
+from api.claim_index import ClaimIndex, find_similar_claim, remember_claim, use_index
+from api.deadline import TIMED_OUT_ERROR
+from api.verifier import PROVIDERS, result_key, verify_claim
+
+CLAIM = "Senate passes bipartisan infrastructure bill after months of negotiation"
+REWORDED = "The Senate passes bipartisan infrastructure bill after months of negotiations"
+
+@pytest.fixture
+def index():
+    index = ClaimIndex(path="")
+    previous = use_index(index)
+    yield index
+    use_index(previous)
+
+def not_found(name):
+    return {"error": None, result_key(name): []}
+
+def test_index_finds_near_duplicates(index):
+    index.add(CLAIM, "LIKELY REAL", {"newsapi": not_found("newsapi")})
+    match = index.find(REWORDED)
+    assert match["claim"] == CLAIM
+    assert match["verdict"] == "LIKELY REAL"
+    assert match["similarity"] >= index.similarity
+    assert index.find(CLAIM + " ")["similarity"] == 1.0
+    assert index.find("Local bakery wins award for the best sourdough in the county") is None
+
+def test_index_expires_and_trims_entries():
+    index = ClaimIndex(path="", max_age=0.2, size=2)
+    claims = [f"{CLAIM} number {n}" for n in ("one", "two", "three")]
+    for claim in claims:
+        index.add(claim, "LIKELY REAL", {})
+    # Only the newest `size` rows are kept, in SQLite and in the LSH tables
+    assert index._db.execute("SELECT COUNT(*) FROM claim_index").fetchone()[0] == 2
+    assert index.find(claims[0])["claim"] != claims[0]
+    assert len(index._entries) == 2
+    time.sleep(0.3)
+    assert index.find(claims[2]) is None
+    assert not index._entries
+
+def test_transient_failures_are_not_indexed(index):
+    results = {"newsapi": not_found("newsapi"), "gnews": {"error": TIMED_OUT_ERROR, "articles": []}}
+    remember_claim(CLAIM, "SUSPICIOUS", results)
+    assert find_similar_claim(CLAIM) is None
+
+def test_unanswered_providers_are_stored_as_skipped(index):
+    results = {
+        "newsapi": {"error": None, "articles": [], "skipped": True},
+        "gnews": {"error": "API key not configured", "articles": []},
+        "mediastack": {"error": "Rate limit exceeded - free quota exhausted", "articles": []},
+        "factcheck": not_found("factcheck"),
+    }
+    remember_claim(CLAIM, "SUSPICIOUS", results)
+    stored = find_similar_claim(CLAIM)["results"]
+    assert stored["factcheck"] == not_found("factcheck")
+    for name in ("newsapi", "gnews", "mediastack"):
+        assert stored[name] == {"error": None, "articles": [], "skipped": True}
+
+class StubProviders:
+    """Provider table where `fast` providers find matching articles at once and the rest take `slow_seconds`"""
+
+    def __init__(self, fast, slow_seconds=1.0):
+        self.fast = fast
+        self.slow_seconds = slow_seconds
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def table(self):
+        return {name: self._search(name) for name in PROVIDERS}
+
+    def _search(self, name):
+        def search(query, deadline):
+            with self._lock:
+                self.calls.append(name)
+            if name not in self.fast:
+                time.sleep(self.slow_seconds)
+                return not_found(name)
+            if result_key(name) == "claims":
+                return not_found(name)
+            articles = [{"title": f"{CLAIM} ({outlet})", "url": f"https://{outlet}.example.com/{name}/senate-bill",
+                         "source": {"name": outlet}}
+                        for outlet in ("reuters", "apnews", "bbc", "npr", "pbs", "wsj")]
+            return {"error": None, "articles": articles}
+        return search
+
+def test_reuse_with_early_verdict(index, monkeypatch):
+    monkeypatch.setattr(verifier, "EARLY_VERDICT", True)
+    stubs = StubProviders(fast={"newsapi", "gnews", "mediastack", "factcheck"})
+    providers = stubs.table()
+
+    first = verify_claim(CLAIM, budget=5, providers=providers)
+    assert first["verdict"] == "LIKELY REAL"
+    assert first["skipped_providers"]
+    assert first["reused"] is None
+
+    calls = len(stubs.calls)
+    second = verify_claim(REWORDED, budget=5, providers=providers)
+    assert second["reused"]["claim"] == CLAIM
+    assert second["verdict"] == first["verdict"]
+    assert second["skipped_providers"] == first["skipped_providers"]
+    # Decided without the skipped providers, so nothing is searched again
+    assert len(stubs.calls) == calls
+    assert second["timings"]["providers_ms"] == 0.0
+
+def test_reuse_searches_skipped_providers_the_verdict_depends_on(index, monkeypatch):
+    monkeypatch.setattr(verifier, "EARLY_VERDICT", False)
+    # Stored when every news provider was skipped: this claim's verdict still hangs on them
+    skipped = {name: {"error": None, result_key(name): [], "skipped": True} for name in PROVIDERS}
+    skipped["factcheck"] = not_found("factcheck")
+    index.add(CLAIM, "LIKELY REAL", skipped)
+
+    stubs = StubProviders(fast=set(PROVIDERS), slow_seconds=0)
+    report = verify_claim(REWORDED, budget=5, providers=stubs.table())
+    assert report["reused"]["claim"] == CLAIM
+    assert sorted(stubs.calls) == sorted(name for name in PROVIDERS if name != "factcheck")
+    assert not report["skipped_providers"]
+    assert report["providers"]["newsapi"]["status"] == "found"
@@ -0,0 +1,47 @@
+# File: tests/test_keywords.py
+"""Search keywords chosen for representative claims (ranked with the bundled model's IDF)"""
+import pytest
+
+from api.keywords import extract_keywords, first_query
+from api.providers import PROVIDER_SPECS, query_variants
+
+SENATE = ("WASHINGTON (Reuters) - The U.S. Senate on Tuesday passed a $1 trillion bipartisan infrastructure bill, "
+          "handing President Joe Biden a major legislative victory after months of negotiations, as House Speaker "
+          "Nancy Pelosi said the chamber would take up the measure next month. The bill includes funding for roads, "
+          "bridges, broadband and water systems.")
+NASA = ("NASA said on Thursday that its Lunar Reconnaissance Orbiter had confirmed deposits of water ice in "
+        "permanently shadowed craters near the moon's south pole, a finding that could support future crewed "
+        "missions under the Artemis program and lower the cost of long stays on the lunar surface.")
+FED = ("The Federal Reserve raised its benchmark interest rate by a quarter of a percentage point on Wednesday, "
+       "continuing its campaign to bring down inflation, while Chair Jerome Powell signaled that further increases "
+       "were likely as the labor market remained tight and prices kept rising.")
+HEADLINE = "Senate passes bipartisan infrastructure bill after months of negotiation"
+
+@pytest.mark.parametrize("text, query", [
+    (SENATE, "Senate trillion bipartisan infrastructure Joe Biden legislative"),
+    (NASA, "NASA Lunar Reconnaissance Orbiter deposits permanently craters pole"),
+    (FED, "Federal Reserve benchmark rate quarter percentage inflation"),
+])
+def test_first_query_of_articles(text, query):
+    assert first_query(text) == query
+
+def test_headlines_are_searched_as_they_are():
+    assert first_query(f"  {HEADLINE} ") == HEADLINE
+    assert extract_keywords(HEADLINE, 4) == "passes bipartisan infrastructure negotiation"
+
+def test_datelines_verbs_and_abbreviations():
+    words = first_query(SENATE).split()
+    # The wire dateline is not part of the story
+    assert "WASHINGTON" not in words and "Reuters" not in words
+    # "U.S." doesn't end a sentence, so "Senate" still counts as a name
+    assert "Senate" in words
+    assert "handing" not in extract_keywords(SENATE, 8).split()
+
+def test_names_take_one_slot():
+    assert extract_keywords(FED, 4) == "Reserve benchmark inflation Chair Jerome Powell"
+
+@pytest.mark.parametrize("text", [SENATE, NASA, FED])
+def test_article_query_variants_are_distinct(text):
+    for name in ("newsapi", "gnews"):
+        variants = query_variants(PROVIDER_SPECS[name], text)
+        assert len(set(variants)) == len(variants) == 3
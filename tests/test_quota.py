@@ -0,0 +1,78 @@
+"""SQLite token buckets behind the local quota governor"""
+import multiprocessing
+import sqlite3
+
+import pytest
+
+from api.quota import PERIODS, QuotaGovernor, parse_limit, provider_limit
+
+@pytest.fixture
+def quota_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("QUOTA_STUB", "10/minute")
+    return str(tmp_path / "quota.sqlite3")
+
+def rewind(path, provider, seconds):
+    """Move a bucket's last update into the past, as if `seconds` had passed"""
+    with sqlite3.connect(path) as db:
+        db.execute("UPDATE quota_buckets SET updated_at = updated_at - ? WHERE provider = ?", (seconds, provider))
+
+def acquire_many(path, count):
+    governor = QuotaGovernor(path=path)
+    return sum(governor.acquire("stub") for _ in range(count))
+
+def test_parse_limit():
+    assert parse_limit("500/month") == (500.0, PERIODS["month"])
+    assert parse_limit("none") is None
+    assert parse_limit("") is None
+    with pytest.raises(ValueError):
+        parse_limit("100/fortnight")
+
+def test_environment_overrides_the_default_limit(monkeypatch):
+    monkeypatch.setenv("QUOTA_NEWSAPI", "5/hour")
+    assert provider_limit("newsapi") == (5.0, 3600)
+    monkeypatch.setenv("QUOTA_NEWSAPI", "none")
+    assert provider_limit("newsapi") is None
+
+def test_unlimited_providers_are_never_refused(quota_path):
+    governor = QuotaGovernor(path=quota_path)
+    assert all(governor.acquire("unlisted") for _ in range(50))
+    assert governor.status("unlisted") is None
+    assert not governor.is_low("unlisted")
+
+def test_bucket_refuses_once_spent(quota_path):
+    governor = QuotaGovernor(path=quota_path)
+    assert all(governor.acquire("stub") for _ in range(10))
+    assert not governor.acquire("stub")
+    assert governor.status("stub") == {"remaining": 0, "capacity": 10, "period_seconds": 60, "next_token_in": 6.0}
+
+def test_reserve_is_kept_for_the_first_variant(quota_path):
+    governor = QuotaGovernor(path=quota_path, reserve=0.2)
+    assert all(governor.acquire("stub", priority=1) for _ in range(8))
+    assert governor.is_low("stub")
+    assert not governor.acquire("stub", priority=1)
+    assert governor.acquire("stub", priority=0)
+    assert governor.acquire("stub", priority=0)
+    assert not governor.acquire("stub", priority=0)
+
+def test_bucket_refills_over_time(quota_path):
+    governor = QuotaGovernor(path=quota_path)
+    governor.drain("stub")
+    assert not governor.acquire("stub")
+    rewind(quota_path, "stub", 30)
+    assert governor.status("stub")["remaining"] == 5
+    rewind(quota_path, "stub", 600)
+    assert governor.status("stub")["remaining"] == 10
+
+def test_governors_on_one_file_share_buckets(quota_path):
+    first, second = QuotaGovernor(path=quota_path), QuotaGovernor(path=quota_path)
+    for _ in range(4):
+        first.acquire("stub")
+    assert second.status("stub")["remaining"] == 6
+    second.drain("stub")
+    assert not first.acquire("stub")
+
+def test_processes_never_overspend(quota_path):
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(4) as pool:
+        granted = pool.starmap(acquire_many, [(quota_path, 6)] * 4)
+    assert sum(granted) == 10
@@ -0,0 +1,60 @@
+"""Relevance of provider articles to the claim (scored with the bundled model's TF-IDF vectorizer)"""
+import numpy as np
+import pytest
+
+from api import relevance
+from api.articles import Article
+from api.relevance import FULL_RELEVANCE, RELEVANCE_THRESHOLD, relevance_scores, relevance_weights
+from api.scoring import NEWS_PROVIDERS, build_scoring_input
+
+CLAIM = "NASA confirms water ice deposits in permanently shadowed craters near the lunar south pole"
+RELATED = Article(title="NASA finds water ice in shadowed lunar craters",
+                  snippet="Deposits of ice near the Moon's south pole were confirmed by NASA scientists.")
+UNRELATED = Article(title="Local bakery wins regional bread award",
+                    snippet="The family-run shop was praised for its sourdough.")
+
+def api_results(**articles):
+    results = {name: {"status": "not_found", "articles": []} for name in NEWS_PROVIDERS}
+    for name, found in articles.items():
+        results[name] = {"status": "found", "articles": found}
+    results["factcheck"] = {"status": "not_found", "claims": []}
+    return results
+
+def test_weights_ramp_from_threshold_to_full_relevance():
+    scores = [0.0, RELEVANCE_THRESHOLD - 0.01, RELEVANCE_THRESHOLD, FULL_RELEVANCE * 0.75, FULL_RELEVANCE, 0.9]
+    expected = [0.0, 0.0, RELEVANCE_THRESHOLD / FULL_RELEVANCE, 0.75, 1.0, 1.0]
+    assert relevance_weights(scores) == pytest.approx(expected)
+
+def test_related_articles_score_above_unrelated_ones():
+    scores = relevance_scores(CLAIM, [RELATED, UNRELATED])
+    assert scores.shape == (2,)
+    assert scores[0] >= FULL_RELEVANCE
+    assert scores[1] < RELEVANCE_THRESHOLD
+    assert list(relevance_weights(scores)) == [1.0, 0.0]
+
+def test_no_articles_scores_nothing():
+    assert relevance_scores(CLAIM, []).shape == (0,)
+
+def test_unavailable_model_disables_relevance(monkeypatch):
+    def broken(texts):
+        raise RuntimeError("model missing")
+
+    monkeypatch.setattr(relevance, "vectorize", broken)
+    assert relevance_scores(CLAIM, [RELATED]) is None
+    inputs = build_scoring_input(0, api_results(newsapi=[UNRELATED]), claim=CLAIM)
+    assert inputs["providers"]["newsapi"] == {"status": "found", "count": 1}
+
+def test_provider_with_only_unrelated_articles_found_nothing():
+    inputs = build_scoring_input(0, api_results(newsapi=[RELATED, UNRELATED], gnews=[UNRELATED]), claim=CLAIM)
+    assert inputs["providers"]["newsapi"] == {"status": "found", "count": 1.0}
+    assert inputs["providers"]["gnews"] == {"status": "not_found", "count": 0.0}
+    assert inputs["irrelevant_articles"] == 2
+    assert inputs["distinct_stories"] == 1
+
+def test_without_a_claim_every_article_counts():
+    inputs = build_scoring_input(0, api_results(gnews=[UNRELATED]))
+    assert inputs["providers"]["gnews"] == {"status": "found", "count": 1}
+    assert inputs["irrelevant_articles"] == 0
+
+def test_weights_accept_numpy_input():
+    assert relevance_weights(np.array([FULL_RELEVANCE / 2])) == pytest.approx([0.5])
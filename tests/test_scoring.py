@@ -0,0 +1,96 @@
+# File: tests/test_scoring.py
+"""Early-verdict bounds and the decided/undecided states"""
+import itertools
+import time
+
+import pytest
+
+from api import verifier
+from api.scoring import NEWS_PROVIDERS, decided_verdict, percentage_bounds, score_credibility
+from api.verifier import PROVIDERS, result_key, verify_claim
+
+# Every outcome a provider can have, as (status, count); counts past 5 score like 5
+NEWS_OUTCOMES = [("not_found", 0), ("error", 0)] + [("found", count) for count in (1, 2, 3, 4, 5, 6)]
+FACTCHECK_OUTCOMES = [("not_found", 0), ("error", 0), ("found", 0), ("found", 1)]
+
+def scoring_input(providers=None, factcheck=("not_found", 0), pattern_suspicious_count=0, ml_p_real=0.5):
+    providers = providers or {}
+    return {
+        "pattern_suspicious_count": pattern_suspicious_count,
+        "ml_p_real": ml_p_real,
+        "providers": {name: {"status": providers.get(name, ("not_found", 0))[0],
+                             "count": providers.get(name, ("not_found", 0))[1]} for name in NEWS_PROVIDERS},
+        "factcheck": {"status": factcheck[0], "disputed_claims": factcheck[1], "disputed_reviews": factcheck[1]},
+    }
+
+def brute_force_bounds(inputs, pending):
+    """Score every combination of outcomes of the pending providers"""
+    pending_news = [name for name in NEWS_PROVIDERS if name in pending]
+    factcheck_outcomes = FACTCHECK_OUTCOMES if "factcheck" in pending else [
+        (inputs["factcheck"]["status"], inputs["factcheck"]["disputed_claims"])]
+    percentages = []
+    for outcomes in itertools.product(NEWS_OUTCOMES, repeat=len(pending_news)):
+        for factcheck in factcheck_outcomes:
+            providers = {name: (entry["status"], entry["count"]) for name, entry in inputs["providers"].items()}
+            providers.update(zip(pending_news, outcomes))
+            candidate = scoring_input(providers, factcheck, inputs["pattern_suspicious_count"], inputs["ml_p_real"])
+            percentages.append(score_credibility(candidate)["percentage"])
+    return min(percentages), max(percentages)
+
+@pytest.mark.parametrize("answered, factcheck, pending, suspicious, ml_p_real", [
+    ({}, ("not_found", 0), ["newsapi", "gnews", "factcheck"], 0, 0.5),
+    ({"newsapi": ("found", 3)}, ("not_found", 0), ["gnews", "currents"], 1, 0.9),
+    ({"newsapi": ("error", 0), "gnews": ("error", 0)}, ("found", 1), ["mediastack", "newsdata"], 2, 0.2),
+    ({"newsapi": ("found", 5), "gnews": ("found", 5), "mediastack": ("found", 2)}, ("found", 0), ["rapidapi"], 0, None),
+    ({}, ("error", 0), ["newsapi", "gnews", "mediastack"], 3, 0.05),
+])
+def test_bounds_match_brute_force(answered, factcheck, pending, suspicious, ml_p_real):
+    inputs = scoring_input(answered, factcheck, suspicious, ml_p_real)
+    low, high = percentage_bounds(inputs, pending)
+    assert (low, high) == pytest.approx(brute_force_bounds(inputs, pending))
+
+def test_decided_when_pending_providers_cannot_change_the_band():
+    found = {name: ("found", 5) for name in ("newsapi", "gnews", "mediastack")}
+    inputs = scoring_input(found, ml_p_real=0.9)
+    assert decided_verdict(inputs, ["newsdata", "currents", "rapidapi"]) == "LIKELY REAL"
+
+def test_undecided_while_pending_providers_can_change_the_band():
+    inputs = scoring_input(ml_p_real=0.5)
+    assert decided_verdict(inputs, list(PROVIDERS)) is None
+    low, high = percentage_bounds(inputs, list(PROVIDERS))
+    assert low < 35 <= 55 <= high
+
+def test_decided_without_pending_is_the_score():
+    inputs = scoring_input({"newsapi": ("found", 2)}, pattern_suspicious_count=1)
+    assert decided_verdict(inputs, []) == score_credibility(inputs)["verdict"]
+
+CLAIM = "Senate passes bipartisan infrastructure bill after months of negotiation"
+FAST = {"newsapi", "gnews", "mediastack", "factcheck"}
+
+def stub_search(name, slow_seconds):
+    def search(query, deadline):
+        if name not in FAST:
+            time.sleep(slow_seconds)
+            return {"error": None, result_key(name): []}
+        if result_key(name) == "claims":
+            return {"error": None, "claims": []}
+        return {"error": None, "articles": [
+            {"title": f"{CLAIM} ({outlet})", "url": f"https://{outlet}.example.com/senate-bill", "source": {"name": outlet}}
+            for outlet in ("reuters", "apnews", "bbc", "npr", "pbs")]}
+    return search
+
+def test_report_with_skipped_providers(monkeypatch):
+    monkeypatch.setattr(verifier, "EARLY_VERDICT", True)
+    report = verify_claim(CLAIM, budget=5, providers={name: stub_search(name, 1) for name in PROVIDERS})
+    skipped = set(report["skipped_providers"])
+    # The slow providers can't outweigh three providers with five stories each
+    assert set(PROVIDERS) - FAST <= skipped
+    for name in skipped:
+        assert report["providers"][name] == {"status": "skipped", "count": 0, "error": None}
+    assert set(report["timings"]["provider_ms"]) == set(PROVIDERS) - skipped
+
+    # Waiting for every provider gives the same verdict
+    monkeypatch.setattr(verifier, "EARLY_VERDICT", False)
+    full = verify_claim(CLAIM, budget=5, providers={name: stub_search(name, 0) for name in PROVIDERS})
+    assert not full["skipped_providers"]
+    assert full["verdict"] == report["verdict"]
@@ -0,0 +1,114 @@
+# File: tests/test_service.py
+"""Offline tests of the HTTP service against stub providers"""
+import json
+
+import pytest
+
+from asgi_client import call_app
+from api.service import (MAX_BATCH_ITEMS, MAX_BODY_BYTES, PROMETHEUS_CONTENT_TYPE, RequestError, create_app,
+                         handle_request)
+from api.verifier import PROVIDERS, result_key
+
+CLAIM = "Scientists confirm the city council approved the new budget on Tuesday"
+
+def stub_search(name):
+    def search(query, deadline):
+        return {"error": None, result_key(name): []}
+    return search
+
+STUBS = {name: stub_search(name) for name in PROVIDERS}
+
+def post(path, payload):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    return handle_request("POST", path, body, providers=STUBS)
+
+def error_status(method, path, body=b""):
+    with pytest.raises(RequestError) as error:
+        handle_request(method, path, body, providers=STUBS)
+    return error.value.status
+
+def test_verify_returns_report_with_stage_timings():
+    status, report = post("/verify", {"text": CLAIM, "budget": 2})
+    assert status == 200
+    assert report["verdict"]
+    assert set(report["providers"]) == set(STUBS)
+    timings = report["timings"]
+    for stage in ("patterns_ms", "model_ms", "providers_ms", "scoring_ms", "total_ms"):
+        assert timings[stage] >= 0
+    assert set(timings["provider_ms"]) <= set(STUBS)
+    assert report["reused"] is None
+
+def test_batch_keeps_item_ids_in_order():
+    items = [{"id": "b", "text": CLAIM}, {"id": "a", "text": "Another claim about the weather today"}, "Bare text"]
+    status, payload = post("/verify/batch", {"items": items, "budget": 2})
+    assert status == 200
+    assert [result["id"] for result in payload["results"]] == ["b", "a", 2]
+    assert all("timings" in result for result in payload["results"])
+
+def test_health_and_metrics():
+    status, payload = handle_request("GET", "/health", b"", providers=STUBS)
+    assert status == 200
+    assert payload["status"] == "ok"
+    assert payload["quota"] == {"enabled": False}
+    post("/verify", {"text": CLAIM, "budget": 2})
+    status, text = handle_request("GET", "/metrics/", b"", providers=STUBS)
+    assert status == 200
+    assert "fakenews_" in text
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[1, 2]",
+    json.dumps({"text": CLAIM, "budget": True}).encode(),
+    json.dumps({"text": CLAIM, "budget": -1}).encode(),
+    json.dumps({"text": CLAIM, "budget": "8"}).encode(),
+    json.dumps({"text": "   "}).encode(),
+    json.dumps({"text": CLAIM, "reuse": "yes"}).encode(),
+])
+def test_verify_rejects_bad_requests(body):
+    assert error_status("POST", "/verify", body) == 400
+
+def test_batch_rejects_bad_items():
+    assert error_status("POST", "/verify/batch", json.dumps({"items": []}).encode()) == 400
+    assert error_status("POST", "/verify/batch", json.dumps({"items": [{"id": 1}]}).encode()) == 400
+
+def test_batch_too_large():
+    items = [CLAIM] * (MAX_BATCH_ITEMS + 1)
+    assert error_status("POST", "/verify/batch", json.dumps({"items": items}).encode()) == 413
+
+def test_routing_errors():
+    assert error_status("GET", "/nowhere") == 404
+    assert error_status("GET", "/verify") == 405
+    assert error_status("POST", "/health") == 405
+    assert error_status("POST", "/metrics") == 405
+
+def test_asgi_app():
+    app = create_app(providers=STUBS, processes=0)
+    status, headers, body = call_app(app, "POST", "/verify", json.dumps({"text": CLAIM, "budget": 2}).encode())
+    assert status == 200
+    assert headers[b"content-type"] == b"application/json"
+    assert json.loads(body)["verdict"]
+
+    status, headers, _ = call_app(app, "GET", "/metrics")
+    assert status == 200
+    assert headers[b"content-type"] == PROMETHEUS_CONTENT_TYPE.encode()
+
+    status, _, body = call_app(app, "GET", "/verify")
+    assert status == 405
+    assert json.loads(body) == {"error": "use POST"}
+
+def test_asgi_app_verifies_on_the_event_loop(monkeypatch):
+    def blocking_verify(*args, **kwargs):
+        raise AssertionError("the ASGI app should not use the blocking verify_claim()")
+
+    monkeypatch.setattr("api.service.verify_claim", blocking_verify)
+    app = create_app(providers=STUBS, processes=0)
+    items = [{"id": n, "text": f"{CLAIM} number {n}"} for n in range(5)]
+    status, _, body = call_app(app, "POST", "/verify/batch", json.dumps({"items": items, "budget": 2}).encode())
+    assert status == 200
+    assert [result["id"] for result in json.loads(body)["results"]] == list(range(5))
+
+def test_asgi_app_rejects_large_bodies():
+    app = create_app(providers=STUBS, processes=0)
+    status, _, body = call_app(app, "POST", "/verify", b"x" * (MAX_BODY_BYTES + 1))
+    assert status == 413
+    assert json.loads(body) == {"error": "request body too large"}
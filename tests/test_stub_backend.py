@@ -0,0 +1,208 @@
+# File: tests/test_stub_backend.py
+"""The sync and async provider backends against the benchmark's local stub server"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from asgi_client import call_app
+from api.benchmark import StubServer, build_profile, load_fixtures, restore_providers
+from api.deadline import TIMED_OUT_ERROR, Deadline
+from api.ladder import HEDGE, RACE, run_ladder, run_ladder_async
+from api.metrics import metrics_snapshot
+from api.providers import PROVIDER_SEARCHES, PROVIDER_SEARCHES_ASYNC
+from api.quota import QuotaGovernor, quota_status, use_governor
+from api.service import create_app
+from api.verifier import result_key, verify_all, verify_all_async, verify_claim, verify_claim_async
+
+FIXTURES = load_fixtures()
+CLAIM = FIXTURES["claims"][0]
+REPORT_KEYS = {"verdict", "score", "max_score", "percentage", "reasons", "pattern_checks", "pattern_hits", "model",
+               "providers", "scoring", "skipped_providers", "timings", "reused"}
+
+def stub_server(**options):
+    """Module-scoped fixture running a stub server with build_profile(**options)"""
+    @pytest.fixture(scope="module")
+    def server():
+        with StubServer(build_profile(FIXTURES, **options)) as stub:
+            yield stub
+    return server
+
+fast_server = stub_server(latency={"*": "fixed:0.05"})
+slow_server = stub_server(latency={"*": "fixed:3"})
+rate_limited_server = stub_server(latency={"*": "fixed:0.05"}, rate_limit_rate={"*": 1.0})
+
+@pytest.fixture
+def fast_stub(fast_server):
+    original = fast_server.point_providers()
+    yield fast_server
+    restore_providers(original)
+
+@pytest.fixture
+def slow_stub(slow_server):
+    original = slow_server.point_providers()
+    yield slow_server
+    restore_providers(original)
+
+@pytest.fixture
+def rate_limited_stub(rate_limited_server):
+    original = rate_limited_server.point_providers()
+    yield rate_limited_server
+    restore_providers(original)
+
+def check_report(report):
+    assert set(report) == REPORT_KEYS
+    assert report["verdict"]
+    assert set(report["providers"]) == set(PROVIDER_SEARCHES)
+    for name, provider in report["providers"].items():
+        assert provider["status"] in ("found", "not_found", "skipped"), (name, provider)
+        assert provider["error"] is None
+    # Skipped providers did no work and get no timing
+    assert not set(report["timings"]["provider_ms"]) & set(report["skipped_providers"])
+    assert report["timings"]["total_ms"] >= report["timings"]["providers_ms"]
+
+def test_verify_claim_over_stub(fast_stub):
+    report = verify_claim(CLAIM, budget=5)
+    check_report(report)
+    assert any(provider["status"] == "found" for provider in report["providers"].values())
+
+def test_verify_claim_async_over_stub(fast_stub):
+    report = asyncio.run(verify_claim_async(CLAIM, budget=5))
+    check_report(report)
+    assert any(provider["status"] == "found" for provider in report["providers"].values())
+
+def test_backends_agree(fast_stub):
+    sync_results = verify_all(CLAIM, budget=5)
+    async_results = asyncio.run(verify_all_async(CLAIM, budget=5))
+    assert set(sync_results) == set(async_results) == set(PROVIDER_SEARCHES)
+    for name in PROVIDER_SEARCHES:
+        key = result_key(name)
+        assert sync_results[name]["error"] is None
+        assert len(sync_results[name][key]) == len(async_results[name][key]), name
+
+def test_asgi_service_over_stub(fast_stub):
+    app = create_app(processes=0)
+    items = [{"id": n, "text": claim} for n, claim in enumerate(FIXTURES["claims"][:3])]
+    status, _, body = call_app(app, "POST", "/verify/batch", json.dumps({"items": items, "budget": 5}).encode())
+    assert status == 200
+    results = json.loads(body)["results"]
+    assert [result["id"] for result in results] == [0, 1, 2]
+    for result in results:
+        result.pop("id")
+        check_report(result)
+
+def test_deadline_expiry(slow_stub):
+    start = time.monotonic()
+    results = verify_all(CLAIM, budget=0.5)
+    assert time.monotonic() - start < 2
+    assert all(result["error"] == TIMED_OUT_ERROR for result in results.values())
+
+def test_deadline_expiry_async(slow_stub):
+    start = time.monotonic()
+    results = asyncio.run(verify_all_async(CLAIM, budget=0.5))
+    assert time.monotonic() - start < 2
+    assert all(result["error"] == TIMED_OUT_ERROR for result in results.values())
+
+def rate_limited_outcomes():
+    counters = metrics_snapshot()["counters"]
+    return [series for series in counters if "provider_requests_total" in series and 'outcome="rate_limited"' in series]
+
+@pytest.mark.parametrize("name", ["newsapi", "gnews", "mediastack", "currents"])
+def test_rate_limit_drains_quota(rate_limited_stub, tmp_path, name):
+    governor = QuotaGovernor(path=str(tmp_path / "quota.sqlite3"))
+    use_governor(governor)
+    result = PROVIDER_SEARCHES[name](CLAIM, Deadline(5))
+    assert result["error"].startswith("Rate limit exceeded")
+    assert result[result_key(name)] == []
+    assert rate_limited_outcomes()
+    # A 429 means the real quota is gone, so the local one is treated as used up
+    assert quota_status([name])[name]["remaining"] < 1
+
+def test_rate_limit_async(rate_limited_stub):
+    result = asyncio.run(PROVIDER_SEARCHES_ASYNC["newsapi"](CLAIM, Deadline(5)))
+    assert result["error"].startswith("Rate limit exceeded")
+    assert rate_limited_outcomes()
+
+def test_race_over_stub(fast_stub, monkeypatch):
+    monkeypatch.setenv("LADDER_STRATEGY_NEWSAPI", RACE)
+    result = PROVIDER_SEARCHES["newsapi"](CLAIM, Deadline(5))
+    assert result["error"] is None
+    assert result["articles"]
+
+def test_race_over_stub_async(fast_stub, monkeypatch):
+    monkeypatch.setenv("LADDER_STRATEGY_NEWSAPI", RACE)
+    result = asyncio.run(PROVIDER_SEARCHES_ASYNC["newsapi"](CLAIM, Deadline(5)))
+    assert result["error"] is None
+    assert result["articles"]
+
+# Ladder variant "fast" answers at once; the others would take seconds
+QUERIES = ["fast", "slow one", "slow two"]
+
+def test_race_returns_first_answer():
+    started = []
+
+    def attempt(query, timeout):
+        started.append(query)
+        time.sleep(0.05 if query == "fast" else 2)
+        return {"error": None, "articles": [query]}
+
+    start = time.monotonic()
+    result = run_ladder("stub", "[stub]", QUERIES, attempt, Deadline(5), strategy=RACE)
+    assert result["articles"] == ["fast"]
+    # The slow variants were sent, but the winner doesn't wait for them
+    assert sorted(started) == sorted(QUERIES)
+    assert time.monotonic() - start < 1
+
+def test_hedge_never_starts_later_variants_when_first_answers():
+    started = []
+    lock = threading.Lock()
+
+    def attempt(query, timeout):
+        with lock:
+            started.append(query)
+        return {"error": None, "articles": [query]}
+
+    result = run_ladder("stub", "[stub]", QUERIES, attempt, Deadline(5), strategy=HEDGE)
+    assert result["articles"] == ["fast"]
+    assert started == ["fast"]
+
+def test_hedge_starts_next_variant_when_first_is_empty():
+    def attempt(query, timeout):
+        return {"error": None, "articles": [query]} if query == "slow one" else None
+
+    result = run_ladder("stub", "[stub]", QUERIES, attempt, Deadline(5), strategy=HEDGE)
+    assert result["articles"] == ["slow one"]
+
+@pytest.mark.parametrize("strategy", [RACE, HEDGE])
+def test_async_losers_are_cancelled(strategy, monkeypatch):
+    monkeypatch.setattr("api.ladder.HEDGE_DELAY", 0.01)
+    cancelled = []
+
+    async def attempt(query, timeout):
+        try:
+            await asyncio.sleep(0.2 if query == "fast" else 5)
+        except asyncio.CancelledError:
+            cancelled.append(query)
+            raise
+        return {"error": None, "articles": [query]}
+
+    async def run():
+        result = await run_ladder_async("stub", "[stub]", QUERIES, attempt, Deadline(10), strategy=strategy)
+        # Let the cancelled tasks unwind
+        await asyncio.sleep(0)
+        return result
+
+    start = time.monotonic()
+    result = asyncio.run(run())
+    assert result["articles"] == ["fast"]
+    assert sorted(cancelled) == ["slow one", "slow two"]
+    assert time.monotonic() - start < 1
+
+def test_ladder_deadline():
+    def attempt(query, timeout):
+        time.sleep(0.3)
+
+    result = run_ladder("stub", "[stub]", QUERIES, attempt, Deadline(0.5), strategy=RACE)
+    assert result == {"error": TIMED_OUT_ERROR, "articles": []}